@@ -0,0 +1,39 @@
+"""add_track_neighbors_table
+
+Revision ID: 2c7d9e4f1b85
+Revises: 8e5c2a7f4d13
+Create Date: 2026-10-19 18:04:19.662350
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c7d9e4f1b85"
+down_revision: Union[str, Sequence[str], None] = "8e5c2a7f4d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by scripts/build_track_neighbors.py.
+    op.create_table(
+        "track_neighbors",
+        sa.Column("track_id", sa.Integer(), nullable=False),
+        sa.Column("neighbor_id", sa.Integer(), nullable=False),
+        sa.Column("similarity", sa.Float(), nullable=False),
+        sa.Column("co_ratings", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["neighbor_id"], ["tracks.id"]),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"]),
+        sa.PrimaryKeyConstraint("track_id", "neighbor_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("track_neighbors")
@@ -0,0 +1,54 @@
+"""add_backfill_checkpoints_table
+
+Revision ID: 4b7e2d9c1a3f
+Revises: c02033ae2a24
+Create Date: 2026-10-19 10:12:44.218305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2d9c1a3f"
+down_revision: Union[str, Sequence[str], None] = "c02033ae2a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "backfill_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chart_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("track_count", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_backfill_checkpoints_id"),
+        "backfill_checkpoints",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_backfill_checkpoints_chart_date"),
+        "backfill_checkpoints",
+        ["chart_date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_backfill_checkpoints_chart_date"), table_name="backfill_checkpoints"
+    )
+    op.drop_index(op.f("ix_backfill_checkpoints_id"), table_name="backfill_checkpoints")
+    op.drop_table("backfill_checkpoints")
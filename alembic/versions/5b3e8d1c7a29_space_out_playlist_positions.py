@@ -0,0 +1,90 @@
+"""space_out_playlist_positions
+
+Revision ID: 5b3e8d1c7a29
+Revises: 2c7d9e4f1b85
+Create Date: 2026-10-19 19:12:41.208734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b3e8d1c7a29"
+down_revision: Union[str, Sequence[str], None] = "2c7d9e4f1b85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors app.crud.PLAYLIST_POSITION_GAP, frozen for this revision.
+POSITION_GAP = 1024
+BATCH_SIZE = 500
+
+
+def _renumber_positions(gap: int) -> None:
+    """Rewrites each playlist's positions as 0, gap, 2 * gap, ... in order."""
+    bind = op.get_bind()
+    playlist_tracks = sa.table(
+        "playlist_track_association",
+        sa.column("playlist_id", sa.Integer),
+        sa.column("track_id", sa.Integer),
+        sa.column("position", sa.Integer),
+    )
+    rows = bind.execute(
+        sa.select(playlist_tracks.c.playlist_id, playlist_tracks.c.track_id).order_by(
+            playlist_tracks.c.playlist_id,
+            playlist_tracks.c.position,
+            playlist_tracks.c.track_id,
+        )
+    ).all()
+
+    statement = (
+        sa.update(playlist_tracks)
+        .where(
+            playlist_tracks.c.playlist_id == sa.bindparam("b_playlist_id"),
+            playlist_tracks.c.track_id == sa.bindparam("b_track_id"),
+        )
+        .values(position=sa.bindparam("b_position"))
+    )
+    pending: list[dict] = []
+    current_playlist_id = None
+    index = 0
+    for playlist_id, track_id in rows:
+        if playlist_id != current_playlist_id:
+            current_playlist_id = playlist_id
+            index = 0
+        pending.append(
+            {
+                "b_playlist_id": playlist_id,
+                "b_track_id": track_id,
+                "b_position": index * gap,
+            }
+        )
+        index += 1
+        if len(pending) >= BATCH_SIZE:
+            bind.execute(statement, pending)
+            pending = []
+    if pending:
+        bind.execute(statement, pending)
+
+
+def upgrade() -> None:
+    """Upgrade schema and migrate data."""
+    _renumber_positions(POSITION_GAP)
+    op.create_index(
+        "ix_playlist_track_association_playlist_id_position",
+        "playlist_track_association",
+        ["playlist_id", "position"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema and migrate data."""
+    op.drop_index(
+        "ix_playlist_track_association_playlist_id_position",
+        table_name="playlist_track_association",
+    )
+    _renumber_positions(1)
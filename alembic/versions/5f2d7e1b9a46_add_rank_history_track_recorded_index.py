@@ -0,0 +1,33 @@
+"""add_rank_history_track_recorded_index
+
+Revision ID: 5f2d7e1b9a46
+Revises: e3a8b6f2c914
+Create Date: 2026-10-19 13:58:12.407731
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2d7e1b9a46"
+down_revision: Union[str, Sequence[str], None] = "e3a8b6f2c914"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_rank_history_track_id_recorded_at",
+        "rank_history",
+        ["track_id", "recorded_at", "rank"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_rank_history_track_id_recorded_at", table_name="rank_history")
@@ -0,0 +1,50 @@
+"""add_active_scrape_job_unique_index
+
+Revision ID: 6a2e9f4c8b17
+Revises: 5b3e8d1c7a29
+Create Date: 2026-10-19 21:04:16.387215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6a2e9f4c8b17"
+down_revision: Union[str, Sequence[str], None] = "5b3e8d1c7a29"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_STATUSES = "status IN ('queued', 'in_progress')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Retire duplicates queued by concurrent callers before enforcing one
+    # active job per kind; the oldest of each kind is kept.
+    op.execute(
+        f"""
+        UPDATE scrape_jobs
+        SET status = 'error', error = 'duplicate'
+        WHERE {ACTIVE_STATUSES}
+          AND id NOT IN (
+            SELECT MIN(id) FROM scrape_jobs WHERE {ACTIVE_STATUSES} GROUP BY kind
+          )
+        """
+    )
+    op.create_index(
+        "uq_scrape_jobs_active_kind",
+        "scrape_jobs",
+        ["kind"],
+        unique=True,
+        postgresql_where=sa.text(ACTIVE_STATUSES),
+        sqlite_where=sa.text(ACTIVE_STATUSES),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_scrape_jobs_active_kind", table_name="scrape_jobs")
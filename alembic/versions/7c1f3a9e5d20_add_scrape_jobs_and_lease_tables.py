@@ -0,0 +1,59 @@
+"""add_scrape_jobs_and_lease_tables
+
+Revision ID: 7c1f3a9e5d20
+Revises: 4b7e2d9c1a3f
+Create Date: 2026-10-19 11:03:27.554910
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1f3a9e5d20"
+down_revision: Union[str, Sequence[str], None] = "4b7e2d9c1a3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scrape_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("phase", sa.String(), nullable=True),
+        sa.Column("page", sa.Integer(), nullable=False),
+        sa.Column("total_pages", sa.Integer(), nullable=False),
+        sa.Column("stats", sa.JSON(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_scrape_jobs_id"), "scrape_jobs", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_scrape_jobs_status"), "scrape_jobs", ["status"], unique=False
+    )
+    op.create_table(
+        "scrape_leases",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("holder", sa.String(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("scrape_leases")
+    op.drop_index(op.f("ix_scrape_jobs_status"), table_name="scrape_jobs")
+    op.drop_index(op.f("ix_scrape_jobs_id"), table_name="scrape_jobs")
+    op.drop_table("scrape_jobs")
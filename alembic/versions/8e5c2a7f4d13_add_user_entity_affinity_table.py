@@ -0,0 +1,82 @@
+"""add_user_entity_affinity_table
+
+Revision ID: 8e5c2a7f4d13
+Revises: d4b19f6e3a72
+Create Date: 2026-10-19 17:11:52.204871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e5c2a7f4d13"
+down_revision: Union[str, Sequence[str], None] = "d4b19f6e3a72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema and migrate data."""
+    op.create_table(
+        "user_entity_affinity",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Float(), nullable=False),
+        sa.Column("rating_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "entity_type", "entity_id"),
+    )
+
+    # --- Data Migration ---
+    # Aggregate existing ratings per user and producer/voicebank.
+    ratings = sa.table(
+        "ratings",
+        sa.column("id", sa.Integer),
+        sa.column("track_id", sa.Integer),
+        sa.column("user_id", sa.Integer),
+        sa.column("rating", sa.Float),
+    )
+    affinity = sa.table(
+        "user_entity_affinity",
+        sa.column("user_id", sa.Integer),
+        sa.column("entity_type", sa.String),
+        sa.column("entity_id", sa.Integer),
+        sa.column("rating_sum", sa.Float),
+        sa.column("rating_count", sa.Integer),
+    )
+    for entity_type, junction_name, entity_column in (
+        ("producer", "track_producers", "producer_id"),
+        ("voicebank", "track_voicebanks", "voicebank_id"),
+    ):
+        junction = sa.table(
+            junction_name,
+            sa.column("track_id", sa.Integer),
+            sa.column(entity_column, sa.Integer),
+        )
+        aggregated = (
+            sa.select(
+                ratings.c.user_id,
+                sa.literal(entity_type),
+                junction.c[entity_column],
+                sa.func.sum(ratings.c.rating),
+                sa.func.count(ratings.c.id),
+            )
+            .join(junction, junction.c.track_id == ratings.c.track_id)
+            .group_by(ratings.c.user_id, junction.c[entity_column])
+        )
+        op.execute(
+            affinity.insert().from_select(
+                ["user_id", "entity_type", "entity_id", "rating_sum", "rating_count"],
+                aggregated,
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_entity_affinity")
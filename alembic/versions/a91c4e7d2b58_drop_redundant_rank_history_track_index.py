@@ -0,0 +1,31 @@
+"""drop_redundant_rank_history_track_index
+
+Revision ID: a91c4e7d2b58
+Revises: 5f2d7e1b9a46
+Create Date: 2026-10-19 15:20:36.118402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a91c4e7d2b58"
+down_revision: Union[str, Sequence[str], None] = "5f2d7e1b9a46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ix_rank_history_track_id_recorded_at leads with track_id and covers it.
+    op.drop_index(op.f("ix_rank_history_track_id"), table_name="rank_history")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_rank_history_track_id"), "rank_history", ["track_id"], unique=False
+    )
@@ -0,0 +1,41 @@
+"""add_track_chart_stats_baseline_table
+
+Revision ID: b8d3f1a6c9e4
+Revises: 6a2e9f4c8b17
+Create Date: 2026-10-19 22:37:51.604118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3f1a6c9e4"
+down_revision: Union[str, Sequence[str], None] = "6a2e9f4c8b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "track_chart_stats_baseline",
+        sa.Column("track_id", sa.Integer(), nullable=False),
+        sa.Column("compacted_before", sa.DateTime(), nullable=False),
+        sa.Column("peak_rank", sa.Integer(), nullable=False),
+        sa.Column("debut_at", sa.DateTime(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("days_on_chart", sa.Integer(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"]),
+        sa.PrimaryKeyConstraint("track_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("track_chart_stats_baseline")
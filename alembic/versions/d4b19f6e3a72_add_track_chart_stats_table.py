@@ -0,0 +1,119 @@
+"""add_track_chart_stats_table
+
+Revision ID: d4b19f6e3a72
+Revises: a91c4e7d2b58
+Create Date: 2026-10-19 16:02:47.530219
+
+"""
+
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b19f6e3a72"
+down_revision: Union[str, Sequence[str], None] = "a91c4e7d2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema and migrate data."""
+    op.create_table(
+        "track_chart_stats",
+        sa.Column("track_id", sa.Integer(), nullable=False),
+        sa.Column("peak_rank", sa.Integer(), nullable=False),
+        sa.Column("debut_at", sa.DateTime(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("days_on_chart", sa.Integer(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["track_id"], ["tracks.id"]),
+        sa.PrimaryKeyConstraint("track_id"),
+    )
+    for column in ("peak_rank", "debut_at", "days_on_chart", "longest_streak"):
+        op.create_index(
+            op.f(f"ix_track_chart_stats_{column}"),
+            "track_chart_stats",
+            [column],
+            unique=False,
+        )
+
+    # --- Data Migration ---
+    # Accumulate statistics from the existing rank history, one track at a time.
+    # Mirrors app.crud.rebuild_track_chart_stats, frozen for this revision.
+    bind = op.get_bind()
+    rank_history = sa.table(
+        "rank_history",
+        sa.column("track_id", sa.Integer),
+        sa.column("rank", sa.Integer),
+        sa.column("recorded_at", sa.DateTime),
+    )
+    track_chart_stats = sa.table(
+        "track_chart_stats",
+        sa.column("track_id", sa.Integer),
+        sa.column("peak_rank", sa.Integer),
+        sa.column("debut_at", sa.DateTime),
+        sa.column("last_seen_at", sa.DateTime),
+        sa.column("days_on_chart", sa.Integer),
+        sa.column("current_streak", sa.Integer),
+        sa.column("longest_streak", sa.Integer),
+    )
+    rows = bind.execute(
+        sa.select(
+            rank_history.c.track_id,
+            rank_history.c.recorded_at,
+            rank_history.c.rank,
+        ).order_by(rank_history.c.track_id, rank_history.c.recorded_at)
+    )
+
+    pending: list[dict] = []
+    stats: dict = {}
+    for track_id, recorded_at, rank in rows:
+        if stats.get("track_id") != track_id:
+            if stats:
+                pending.append(stats)
+            stats = {
+                "track_id": track_id,
+                "peak_rank": rank,
+                "debut_at": recorded_at,
+                "last_seen_at": recorded_at,
+                "days_on_chart": 1,
+                "current_streak": 1,
+                "longest_streak": 1,
+            }
+            if len(pending) >= BATCH_SIZE:
+                bind.execute(track_chart_stats.insert(), pending)
+                pending = []
+            continue
+
+        stats["peak_rank"] = min(stats["peak_rank"], rank)
+        day, last_day = recorded_at.date(), stats["last_seen_at"].date()
+        if day > last_day:
+            stats["days_on_chart"] += 1
+            if day - last_day == timedelta(days=1):
+                stats["current_streak"] += 1
+            else:
+                stats["current_streak"] = 1
+            stats["longest_streak"] = max(
+                stats["longest_streak"], stats["current_streak"]
+            )
+        stats["last_seen_at"] = recorded_at
+    if stats:
+        pending.append(stats)
+    if pending:
+        bind.execute(track_chart_stats.insert(), pending)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("longest_streak", "days_on_chart", "debut_at", "peak_rank"):
+        op.drop_index(
+            op.f(f"ix_track_chart_stats_{column}"), table_name="track_chart_stats"
+        )
+    op.drop_table("track_chart_stats")
@@ -0,0 +1,99 @@
+"""add_rank_snapshots_table
+
+Revision ID: e3a8b6f2c914
+Revises: 7c1f3a9e5d20
+Create Date: 2026-10-19 12:41:05.873126
+
+"""
+
+import struct
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a8b6f2c914"
+down_revision: Union[str, Sequence[str], None] = "7c1f3a9e5d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pack_ranks(ranks: dict[int, int]) -> bytes:
+    # Same layout as app.utils.rank_snapshots.pack_ranks, frozen for this revision.
+    ordered = sorted(ranks.items(), key=lambda pair: pair[1])
+    return struct.pack(
+        f"<{2 * len(ordered)}I", *(value for pair in ordered for value in pair)
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema and migrate data."""
+    op.create_table(
+        "rank_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.Column("track_count", sa.Integer(), nullable=False),
+        sa.Column("ranks", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_rank_snapshots_id"), "rank_snapshots", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_rank_snapshots_recorded_at"),
+        "rank_snapshots",
+        ["recorded_at"],
+        unique=True,
+    )
+
+    # --- Data Migration ---
+    # Pack the existing rank history, one snapshot per recorded_at value.
+    bind = op.get_bind()
+    rank_history = sa.table(
+        "rank_history",
+        sa.column("track_id", sa.Integer),
+        sa.column("rank", sa.Integer),
+        sa.column("recorded_at", sa.DateTime),
+    )
+    rank_snapshots = sa.table(
+        "rank_snapshots",
+        sa.column("recorded_at", sa.DateTime),
+        sa.column("track_count", sa.Integer),
+        sa.column("ranks", sa.LargeBinary),
+    )
+    rows = bind.execute(
+        sa.select(
+            rank_history.c.recorded_at,
+            rank_history.c.track_id,
+            rank_history.c.rank,
+        ).order_by(rank_history.c.recorded_at)
+    )
+
+    def flush(recorded_at, ranks):
+        bind.execute(
+            rank_snapshots.insert().values(
+                recorded_at=recorded_at,
+                track_count=len(ranks),
+                ranks=_pack_ranks(ranks),
+            )
+        )
+
+    current_at = None
+    current_ranks: dict[int, int] = {}
+    for recorded_at, track_id, rank in rows:
+        if recorded_at != current_at:
+            if current_ranks:
+                flush(current_at, current_ranks)
+            current_at, current_ranks = recorded_at, {}
+        current_ranks[track_id] = rank
+    if current_ranks:
+        flush(current_at, current_ranks)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_rank_snapshots_recorded_at"), table_name="rank_snapshots")
+    op.drop_index(op.f("ix_rank_snapshots_id"), table_name="rank_snapshots")
+    op.drop_table("rank_snapshots")
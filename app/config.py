@@ -27,6 +27,18 @@ def get_public_base_url() -> str:
     )
 
 
+def get_vocaloard_base_url() -> str:
+    """Ranking source root; point it at a fixture server for offline runs."""
+    return os.environ.get(
+        "VOCALOARD_BASE_URL", "https://vocaloard.injpok.tokyo"
+    ).rstrip("/")
+
+
+def get_rank_history_retention_days() -> int:
+    """Days of rank history kept at full resolution before weekly downsampling."""
+    return int(os.environ.get("RANK_HISTORY_RETENTION_DAYS", "180"))
+
+
 def is_local_mode() -> bool:
     db_url = get_database_url()
     return not db_url or db_url.strip() == ""
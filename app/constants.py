@@ -1,7 +1,6 @@
-import os
 from pathlib import Path
 
-from app.config import get_data_dir, is_vercel
+from app.config import get_data_dir
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
@@ -10,11 +9,17 @@ DEFAULT_LOCALE = "en"
 DATA_DIR = str(get_data_dir())
 MAX_UPLOAD_SIZE_BYTES = 5 * 1024 * 1024  # 5 MiB
 VALID_PAGE_LIMITS = {"all", "25", "50", "100"}
-
-if is_vercel():
-    SCRAPE_STATUS_FILE = os.path.join("/tmp", "scrape_status.txt")
-else:
-    SCRAPE_STATUS_FILE = os.path.join(DATA_DIR, "scrape_status.txt")
+CHART_PAGE_COUNT = 6
+FULL_CHART_SIZE = 300  # 6 pages of 50 tracks
+HISTORICAL_PAGE_MAX_AGE_SECONDS = 24 * 3600
+RANK_HISTORY_BATCH_LIMIT = FULL_CHART_SIZE
+PLAYLIST_MEMBERSHIP_BATCH_LIMIT = FULL_CHART_SIZE
+TRACK_SEARCH_PAGE_SIZE = 50
+TRACK_SEARCH_MAX_LIMIT = 200
+PUBLIC_PLAYLIST_PAGE_SIZE = 50
+RECOMMENDATION_MODES = ("affinity", "collaborative")
+TRACK_NEIGHBOR_COUNT = 50  # similar tracks stored per track
+TRACK_NEIGHBOR_MIN_CO_RATINGS = 2
 
 RESOURCE_BASE_PATH: Path | None = None
 
@@ -1,41 +1,195 @@
-from datetime import datetime, timedelta, timezone
-from math import exp
-from statistics import median
-from typing import List, Optional
-
-from sqlalchemy import and_, desc, distinct, func, nullslast, or_, select
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+from math import exp, floor
+from time import monotonic
+from typing import Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    distinct,
+    func,
+    insert,
+    literal,
+    null,
+    nullslast,
+    or_,
+    select,
+    true,
+    union,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
 from sqlalchemy.sql.expression import exists
 
 from app import models, schemas
 from app.auth import get_password_hash
+from app.utils.rank_snapshots import pack_ranks, unpack_ranks
+
+# Keeps IN (...) lists well below the bound-parameter limits of SQLite/Postgres.
+IN_CLAUSE_CHUNK_SIZE = 500
+# Playlist positions are spaced out so a track can be placed between two others
+# by writing only its own row; a playlist is renumbered when a gap runs out.
+PLAYLIST_POSITION_GAP = 1024
+SCRAPE_JOB_ACTIVE_STATUSES = ("queued", "in_progress")
+SCRAPE_LEASE_NAME = "scrape"
+SCRAPE_LEASE_TTL_SECONDS = 15 * 60
+SCRAPE_TIMELINE_CACHE_TTL_SECONDS = 900
+_scrape_timeline_cache: tuple[float, list[tuple[datetime, str]]] | None = None
+# Date picker list, paired with the timeline list it was derived from.
+_available_dates_cache: tuple[list, list[str]] | None = None
+HISTORICAL_CHART_CACHE_SIZE = 64
+# Reconstructed charts keyed by rank snapshot id; a snapshot never changes.
+_historical_chart_cache: dict[int, list[dict]] = {}
+RECOMMENDATION_INDEX_TTL_SECONDS = 900
+RATING_STATISTICS_CACHE_TTL_SECONDS = 60
+RATING_STATISTICS_CACHE_SIZE = 1024
+# Rating statistics keyed by (user_id, locale); dropped on that user's writes.
+_rating_statistics_cache: dict[tuple[int, str], tuple[float, dict]] = {}
+PROFILE_VIEW_CACHE_TTL_SECONDS = 300
+PROFILE_VIEW_CACHE_SIZE = 1024
+# Public profile view models keyed by (lowercased username, locale).
+_profile_view_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+USER_PLAYLISTS_CACHE_TTL_SECONDS = 300
+USER_PLAYLISTS_CACHE_SIZE = 1024
+# Each user's playlist ids and names; dropped when a playlist is created,
+# renamed, imported or deleted.
+_user_playlists_cache: dict[int, tuple[float, list[dict]]] = {}
+PUBLIC_PLAYLISTS_CACHE_TTL_SECONDS = 60
+# First page of the public playlist directory, the page guests and crawlers hit.
+_public_playlists_first_page: tuple[float, int, dict] | None = None
+
+
+class _CatalogIndex(NamedTuple):
+    """Track/entity incidence lists used to score recommendations.
+
+    Tracks are addressed by position, newest first; the entity maps are the
+    sparse producer x track and voicebank x track matrices stored by row.
+    ``recency`` holds each track's age decay as of the build, so it never
+    increases with position (undated tracks sort last with 0.0).
+    """
+
+    version: tuple
+    built_at: float
+    track_ids: array
+    recency: array
+    producer_tracks: dict[int, array]
+    voicebank_tracks: dict[int, array]
+    position_by_track_id: dict[int, int]
+
+
+_recommendation_index: _CatalogIndex | None = None
+
+
+def _utcnow() -> datetime:
+    # DateTime columns are timezone-naive and hold UTC.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _execute_dml(db: Session, statement) -> CursorResult:
+    """Runs an INSERT/UPDATE/DELETE and returns its cursor result for ``rowcount``."""
+    result = db.execute(statement)
+    assert isinstance(result, CursorResult)
+    return result
 
 
 def get_track_by_link(db: Session, link: str):
     return db.query(models.Track).filter(models.Track.link == link).first()
 
 
+def get_track_ids_by_links(db: Session, links: list[str]) -> dict[str, int]:
+    """Resolves many track links to IDs using chunked IN queries."""
+    unique_links = list(dict.fromkeys(links))
+    track_ids: dict[str, int] = {}
+    for start in range(0, len(unique_links), IN_CLAUSE_CHUNK_SIZE):
+        chunk = unique_links[start : start + IN_CLAUSE_CHUNK_SIZE]
+        rows = db.query(models.Track.link, models.Track.id).filter(
+            models.Track.link.in_(chunk)
+        )
+        track_ids.update({link: track_id for link, track_id in rows})
+    return track_ids
+
+
+def search_tracks(
+    db: Session, query: str = "", after_id: Optional[int] = None, limit: int = 50
+) -> dict:
+    """Searches the catalog by title or producer for the playlist editor.
+
+    Only the columns the picker renders are loaded. Results are ordered by
+    (title, id), which the title index serves, and paged with a keyset on
+    the last id returned so deep pages cost no more than the first.
+    """
+    search = db.query(
+        models.Track.id,
+        models.Track.link,
+        models.Track.image_url,
+        models.Track.title,
+        models.Track.title_jp,
+        models.Track.producer,
+        models.Track.producer_jp,
+    )
+    query = query.strip()
+    if query:
+        search_term = f"%{query}%"
+        search = search.filter(
+            or_(
+                models.Track.title.ilike(search_term),
+                models.Track.title_jp.ilike(search_term),
+                models.Track.producer.ilike(search_term),
+                models.Track.producer_jp.ilike(search_term),
+            )
+        )
+    if after_id is not None:
+        after_title = (
+            db.query(models.Track.title)
+            .filter(models.Track.id == after_id)
+            .scalar_subquery()
+        )
+        search = search.filter(
+            or_(
+                models.Track.title > after_title,
+                and_(models.Track.title == after_title, models.Track.id > after_id),
+            )
+        )
+
+    rows = search.order_by(models.Track.title, models.Track.id).limit(limit + 1).all()
+    tracks = [dict(row._mapping) for row in rows[:limit]]
+    return {
+        "tracks": tracks,
+        "next_cursor": tracks[-1]["id"] if len(rows) > limit else None,
+    }
+
+
 def _sync_track_relationships(db: Session, db_track: models.Track):
     """Syncs many-to-many relationships for a track based on its producer/voicebank strings."""
+    old_entity_keys = _loaded_entity_keys(db_track)
+
     # Sync Producers
     if db_track.producer:
-        p_en = [p.strip() for p in db_track.producer.split(",")]
-        p_jp = (
-            [p.strip() for p in db_track.producer_jp.split(",")]
-            if db_track.producer_jp
-            else []
-        )
-
         producers = []
-        for i, name in enumerate(p_en):
-            if not name:
-                continue
+        for name, name_jp in _split_entity_names(
+            db_track.producer, db_track.producer_jp
+        ):
             producer = (
                 db.query(models.Producer).filter(models.Producer.name == name).first()
             )
             if not producer:
-                name_jp = p_jp[i] if i < len(p_jp) else None
                 producer = models.Producer(name=name, name_jp=name_jp)
                 db.add(producer)
                 db.flush()
@@ -44,28 +198,76 @@ def _sync_track_relationships(db: Session, db_track: models.Track):
 
     # Sync Voicebanks
     if db_track.voicebank:
-        v_en = [v.strip() for v in db_track.voicebank.split(",")]
-        v_jp = (
-            [v.strip() for v in db_track.voicebank_jp.split(",")]
-            if db_track.voicebank_jp
-            else []
-        )
-
         voicebanks = []
-        for i, name in enumerate(v_en):
-            if not name:
-                continue
+        for name, name_jp in _split_entity_names(
+            db_track.voicebank, db_track.voicebank_jp
+        ):
             voicebank = (
                 db.query(models.Voicebank).filter(models.Voicebank.name == name).first()
             )
             if not voicebank:
-                name_jp = v_jp[i] if i < len(v_jp) else None
                 voicebank = models.Voicebank(name=name, name_jp=name_jp)
                 db.add(voicebank)
                 db.flush()
             voicebanks.append(voicebank)
         db_track.voicebanks = voicebanks
 
+    new_entity_keys = _loaded_entity_keys(db_track)
+    if new_entity_keys != old_entity_keys:
+        # Ratings of this track now count towards different entities.
+        removed = old_entity_keys - new_entity_keys
+        added = new_entity_keys - old_entity_keys
+        for user_id, rating in db.query(
+            models.Rating.user_id, models.Rating.rating
+        ).filter(models.Rating.track_id == db_track.id):
+            _adjust_entity_affinity(db, user_id, removed, -rating, -1)
+            _adjust_entity_affinity(db, user_id, added, rating, 1)
+            invalidate_rating_statistics(user_id)
+
+
+def _split_entity_names(
+    names: str, names_jp: Optional[str]
+) -> list[tuple[str, Optional[str]]]:
+    """Pairs each comma-separated name with its Japanese name by position."""
+    names_en = [name.strip() for name in names.split(",")]
+    names_ja = [name.strip() for name in names_jp.split(",")] if names_jp else []
+    return [
+        (name, names_ja[i] if i < len(names_ja) else None)
+        for i, name in enumerate(names_en)
+        if name
+    ]
+
+
+def _get_or_create_entities(db: Session, model, names: dict[str, Optional[str]]):
+    """Returns ``{name: entity}``, creating missing entities in one flush.
+
+    ``names`` maps each name to the Japanese name used if it is created.
+    """
+    entities = {}
+    unique_names = list(names)
+    for start in range(0, len(unique_names), IN_CLAUSE_CHUNK_SIZE):
+        chunk = unique_names[start : start + IN_CLAUSE_CHUNK_SIZE]
+        entities.update(
+            (entity.name, entity)
+            for entity in db.query(model).filter(model.name.in_(chunk))
+        )
+    missing = [
+        model(name=name, name_jp=name_jp)
+        for name, name_jp in names.items()
+        if name not in entities
+    ]
+    if missing:
+        db.add_all(missing)
+        db.flush()
+        entities.update((entity.name, entity) for entity in missing)
+    return entities
+
+
+def _loaded_entity_keys(db_track: models.Track) -> set[tuple[str, int]]:
+    return {("producer", producer.id) for producer in db_track.producers} | {
+        ("voicebank", voicebank.id) for voicebank in db_track.voicebanks
+    }
+
 
 def create_track(db: Session, track: dict):
     db_track = models.Track(**track)
@@ -73,19 +275,107 @@ def create_track(db: Session, track: dict):
     db.flush()
     _sync_track_relationships(db, db_track)
     db.commit()
+    invalidate_recommendation_index()
     db.refresh(db_track)
     return db_track
 
 
-def update_track(db: Session, db_track: models.Track, track: dict):
+def create_tracks(db: Session, tracks: list[dict]) -> dict[str, int]:
+    """Creates many tracks with their producer/voicebank links. Does not commit.
+
+    Producers and voicebanks are resolved with chunked IN queries and the rows
+    are written in batched inserts. Returns ``{link: track_id}``.
+    """
+    if not tracks:
+        return {}
+    producer_names: dict[str, Optional[str]] = {}
+    voicebank_names: dict[str, Optional[str]] = {}
+    for track in tracks:
+        if track.get("producer"):
+            for name, name_jp in _split_entity_names(
+                track["producer"], track.get("producer_jp")
+            ):
+                producer_names.setdefault(name, name_jp)
+        if track.get("voicebank"):
+            for name, name_jp in _split_entity_names(
+                track["voicebank"], track.get("voicebank_jp")
+            ):
+                voicebank_names.setdefault(name, name_jp)
+    producers = _get_or_create_entities(db, models.Producer, producer_names)
+    voicebanks = _get_or_create_entities(db, models.Voicebank, voicebank_names)
+
+    db_tracks = []
+    for track in tracks:
+        db_track = models.Track(**track)
+        if db_track.producer:
+            db_track.producers = [
+                producers[name]
+                for name, _ in _split_entity_names(
+                    db_track.producer, db_track.producer_jp
+                )
+            ]
+        if db_track.voicebank:
+            db_track.voicebanks = [
+                voicebanks[name]
+                for name, _ in _split_entity_names(
+                    db_track.voicebank, db_track.voicebank_jp
+                )
+            ]
+        db_tracks.append(db_track)
+    db.add_all(db_tracks)
+    db.flush()
+    invalidate_recommendation_index()
+    return {db_track.link: db_track.id for db_track in db_tracks}
+
+
+def apply_track_update(db: Session, db_track: models.Track, track: dict) -> None:
+    """Copies ``track`` onto ``db_track`` and re-links its producers and
+    voicebanks. Does not commit.
+    """
     for key, value in track.items():
         setattr(db_track, key, value)
     _sync_track_relationships(db, db_track)
+    invalidate_recommendation_index()
+
+
+def update_track(db: Session, db_track: models.Track, track: dict):
+    apply_track_update(db, db_track, track)
     db.commit()
+    invalidate_recommendation_index()
     db.refresh(db_track)
     return db_track
 
 
+def get_current_ranks(db: Session) -> dict[int, int]:
+    """Returns ``{track_id: rank}`` for every track on the current chart."""
+    return {
+        track_id: rank
+        for track_id, rank in db.execute(
+            select(models.Track.id, models.Track.rank).where(
+                models.Track.rank.isnot(None)
+            )
+        )
+    }
+
+
+def apply_rank_changes(db: Session, rank_changes: dict[int, Optional[int]]) -> None:
+    """Bulk-updates only the tracks whose rank changed. Does not commit."""
+    if rank_changes:
+        db.execute(
+            update(models.Track),
+            [{"id": track_id, "rank": rank} for track_id, rank in rank_changes.items()],
+        )
+
+
+# Sort keys for get_tracks backed by the precomputed track_chart_stats table.
+CHART_STATS_SORT_COLUMNS = {
+    "peak_rank": models.TrackChartStats.peak_rank,
+    "debut_date": models.TrackChartStats.debut_at,
+    "days_on_chart": models.TrackChartStats.days_on_chart,
+    "longest_streak": models.TrackChartStats.longest_streak,
+}
+
+
 def get_tracks(
     db: Session,
     user_id: Optional[int] = None,
@@ -149,7 +439,9 @@ def get_tracks(
         and_(
             models.Rating.track_id == models.Track.id, models.Rating.user_id == user_id
         ),
-    ).options(contains_eager(models.Track.ratings))
+    ).options(
+        contains_eager(models.Track.ratings), selectinload(models.Track.chart_stats)
+    )
 
     if exact_rating_filter is not None:
         query = query.filter(models.Rating.rating == exact_rating_filter)
@@ -194,6 +486,17 @@ def get_tracks(
                 query = query.order_by(nullslast(rating_column.desc()))
             else:
                 query = query.order_by(nullslast(rating_column.asc()))
+        elif sort_by in CHART_STATS_SORT_COLUMNS:
+            stats_column = CHART_STATS_SORT_COLUMNS[sort_by]
+            query = query.outerjoin(
+                models.TrackChartStats,
+                models.TrackChartStats.track_id == models.Track.id,
+            )
+            if sort_dir == "desc":
+                query = query.order_by(nullslast(stats_column.desc()))
+            else:
+                query = query.order_by(nullslast(stats_column.asc()))
+            query = query.order_by(models.Track.id)
     else:
         if rank_filter == "unranked":
             query = query.order_by(models.Track.published_date.desc())
@@ -319,7 +622,7 @@ def get_recently_added_tracks(
     voicebank_filter: Optional[str] = None,
     locale: str = "en",
 ):
-    query = db.query(models.Track)
+    query = db.query(models.Track).options(selectinload(models.Track.chart_stats))
 
     # Filter for tracks published within the last month
     one_month_ago = datetime.now() - timedelta(days=30)
@@ -361,6 +664,36 @@ def get_recently_added_tracks(
     return query.offset(skip).limit(limit).all()
 
 
+def invalidate_rank_snapshot_caches() -> None:
+    """Drops the cached timeline and charts; call after committing snapshot changes."""
+    global _scrape_timeline_cache
+    _scrape_timeline_cache = None
+    _historical_chart_cache.clear()
+
+
+def get_scrape_timeline(db: Session) -> list[tuple[datetime, str]]:
+    """Returns every snapshot timestamp with its ``YYYY-MM-DD`` label, oldest first.
+
+    Read from the one-row-per-scrape ``rank_snapshots`` table and cached
+    in-process.
+    """
+    global _scrape_timeline_cache
+
+    now = monotonic()
+    if (
+        _scrape_timeline_cache
+        and now - _scrape_timeline_cache[0] < SCRAPE_TIMELINE_CACHE_TTL_SECONDS
+    ):
+        return _scrape_timeline_cache[1]
+
+    timeline = [
+        (recorded_at, recorded_at.strftime("%Y-%m-%d"))
+        for recorded_at in get_rank_snapshot_timestamps(db)
+    ]
+    _scrape_timeline_cache = (now, timeline)
+    return timeline
+
+
 def get_track_rank_history(db: Session, track_id: int) -> list[dict]:
     """Return rank history for a track as a list of {date, rank} dicts, oldest first.
 
@@ -368,33 +701,50 @@ def get_track_rank_history(db: Session, track_id: int) -> list[dict]:
     so the frontend can render unranked periods as gaps in the line.
     """
     # All scrape dates across every track (the global timeline)
-    scrape_dates = [
-        r[0]
-        for r in db.query(models.RankHistory.recorded_at)
-        .distinct()
-        .order_by(models.RankHistory.recorded_at.asc())
-        .all()
-    ]
-    if not scrape_dates:
+    timeline = get_scrape_timeline(db)
+    if not timeline:
         return []
 
-    # This track's rank entries keyed by date
-    rows = (
-        db.query(models.RankHistory)
-        .filter(models.RankHistory.track_id == track_id)
-        .all()
+    # This track's rank entries keyed by date; served by the
+    # (track_id, recorded_at, rank) index alone.
+    rows = db.query(models.RankHistory.recorded_at, models.RankHistory.rank).filter(
+        models.RankHistory.track_id == track_id
     )
-    rank_by_date: dict[str, int] = {}
-    for r in rows:
-        rank_by_date[r.recorded_at.strftime("%Y-%m-%d")] = r.rank
+    rank_by_date: dict[str, int] = {
+        recorded_at.strftime("%Y-%m-%d"): rank for recorded_at, rank in rows
+    }
 
-    return [
-        {
-            "date": d.strftime("%Y-%m-%d"),
-            "rank": rank_by_date.get(d.strftime("%Y-%m-%d")),
-        }
-        for d in scrape_dates
-    ]
+    return [{"date": label, "rank": rank_by_date.get(label)} for _, label in timeline]
+
+
+def get_tracks_rank_history(db: Session, track_ids: list[int]) -> dict:
+    """Returns rank series for many tracks aligned to the shared scrape timeline.
+
+    ``{"dates": [...], "series": {track_id: [rank or None, ...]}}`` — one list
+    per track, parallel to ``dates``. All ranks are read in a single query.
+    """
+    timeline = get_scrape_timeline(db)
+    track_ids = list(dict.fromkeys(track_ids))
+    if not timeline or not track_ids:
+        return {"dates": [label for _, label in timeline], "series": {}}
+
+    rank_by_date: dict[int, dict[str, int]] = {track_id: {} for track_id in track_ids}
+    rows = db.query(
+        models.RankHistory.track_id,
+        models.RankHistory.recorded_at,
+        models.RankHistory.rank,
+    ).filter(models.RankHistory.track_id.in_(track_ids))
+    for track_id, recorded_at, rank in rows:
+        rank_by_date[track_id][recorded_at.strftime("%Y-%m-%d")] = rank
+
+    labels = [label for _, label in timeline]
+    return {
+        "dates": labels,
+        "series": {
+            track_id: [ranks.get(label) for label in labels]
+            for track_id, ranks in rank_by_date.items()
+        },
+    }
 
 
 def create_rating(
@@ -410,15 +760,22 @@ def create_rating(
         )  # Filter by user_id
         .first()
     )
-    if db_rating:
-        db_rating.rating = rating
-        db_rating.notes = notes
-    else:
-        db_rating = models.Rating(
-            track_id=track_id, user_id=user_id, rating=rating
-        )  # Store user_id
-        db.add(db_rating)
+    entity_keys = _track_entity_keys(db, track_id)
     try:
+        # The affinity adjustment flushes, so a concurrent insert of the same
+        # rating can surface here as well as in the commit.
+        if db_rating:
+            _adjust_entity_affinity(
+                db, user_id, entity_keys, rating - db_rating.rating, 0
+            )
+            db_rating.rating = rating
+            db_rating.notes = notes
+        else:
+            db_rating = models.Rating(
+                track_id=track_id, user_id=user_id, rating=rating
+            )  # Store user_id
+            db.add(db_rating)
+            _adjust_entity_affinity(db, user_id, entity_keys, rating, 1)
         db.commit()
     except IntegrityError:
         # Handle rare race condition where duplicate row is created concurrently.
@@ -431,9 +788,13 @@ def create_rating(
             .first()
         )
         if db_rating:
+            _adjust_entity_affinity(
+                db, user_id, entity_keys, rating - db_rating.rating, 0
+            )
             db_rating.rating = rating
             db_rating.notes = notes
             db.commit()
+    invalidate_rating_statistics(user_id)
     db.refresh(db_rating)
     return db_rating
 
@@ -447,15 +808,259 @@ def delete_rating(db: Session, track_id: int, user_id: int):
         .first()
     )
     if db_rating:
+        _adjust_entity_affinity(
+            db, user_id, _track_entity_keys(db, track_id), -db_rating.rating, -1
+        )
         db.delete(db_rating)
         db.commit()
+        invalidate_rating_statistics(user_id)
+
+
+def _upsert_insert(db: Session):
+    """Returns the INSERT construct with ON CONFLICT support for the bound dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def import_ratings(db: Session, user_id: int, data: list[dict]) -> tuple[int, int]:
+    """Restores a ratings backup for one user, creating unknown tracks.
+
+    Links are resolved with chunked IN queries, missing tracks are created in
+    bulk and ratings are upserted with one ON CONFLICT statement per chunk.
+    Everything is committed once, so an invalid rating leaves nothing behind.
+    Returns (tracks created, entries for tracks that already existed).
+    """
+    for item in data:
+        rating = item.get("rating")
+        if rating is not None and (rating < 1 or rating > 10):
+            raise ValueError("Rating must be between 1 and 10.")
+
+    track_ids = get_track_ids_by_links(db, [item["link"] for item in data])
+    new_tracks: dict[str, dict] = {}
+    for item in data:
+        if item["link"] not in track_ids and item["link"] not in new_tracks:
+            new_tracks[item["link"]] = {
+                "link": item["link"],
+                "title": item["title"],
+                "producer": item["producer"],
+                "voicebank": item["voicebank"],
+                "published_date": datetime.fromisoformat(item["published_date"]),
+                "title_jp": item.get("title_jp"),
+                "producer_jp": item.get("producer_jp"),
+                "voicebank_jp": item.get("voicebank_jp"),
+                "image_url": item.get("image_url"),
+                "rank": None,
+            }
+    track_ids.update(create_tracks(db, list(new_tracks.values())))
+
+    # The last entry wins when a backup lists a track twice.
+    ratings = {
+        track_ids[item["link"]]: item for item in data if item.get("rating") is not None
+    }
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "track_id": track_id,
+            "user_id": user_id,
+            "rating": item["rating"],
+            "notes": item.get("notes"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for track_id, item in ratings.items()
+    ]
+    insert_rating = _upsert_insert(db)
+    for start in range(0, len(rows), IN_CLAUSE_CHUNK_SIZE):
+        statement = insert_rating(models.Rating).values(
+            rows[start : start + IN_CLAUSE_CHUNK_SIZE]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["track_id", "user_id"],
+                set_={
+                    "rating": statement.excluded.rating,
+                    "notes": statement.excluded.notes,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+
+    if rows:
+        rebuild_user_entity_affinity(db, [user_id])
+    db.commit()
+    invalidate_rating_statistics(user_id)
+    return len(new_tracks), len(data) - len(new_tracks)
+
+
+# Junction columns that link tracks to each affinity entity type.
+AFFINITY_ENTITY_LINKS = {
+    "producer": (models.track_producers, models.track_producers.c.producer_id),
+    "voicebank": (models.track_voicebanks, models.track_voicebanks.c.voicebank_id),
+}
+
+
+def _track_entity_keys(db: Session, track_id: int) -> set[tuple[str, int]]:
+    keys = set()
+    for entity_type, (junction_table, entity_column) in AFFINITY_ENTITY_LINKS.items():
+        keys.update(
+            (entity_type, entity_id)
+            for (entity_id,) in db.execute(
+                select(entity_column).where(junction_table.c.track_id == track_id)
+            )
+        )
+    return keys
+
+
+def _adjust_entity_affinity(
+    db: Session,
+    user_id: int,
+    entity_keys: set[tuple[str, int]],
+    rating_delta: float,
+    count_delta: int,
+) -> None:
+    """Applies one rating change to the user's affinity rows. Does not commit."""
+    if not entity_keys or (rating_delta == 0 and count_delta == 0):
+        return
+    existing = {
+        (affinity.entity_type, affinity.entity_id): affinity
+        for affinity in db.query(models.UserEntityAffinity).filter(
+            models.UserEntityAffinity.user_id == user_id,
+            models.UserEntityAffinity.entity_id.in_(
+                {entity_id for _, entity_id in entity_keys}
+            ),
+        )
+    }
+    for entity_type, entity_id in entity_keys:
+        affinity = existing.get((entity_type, entity_id))
+        if affinity is None:
+            if count_delta <= 0:
+                continue
+            affinity = models.UserEntityAffinity(
+                user_id=user_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                rating_sum=0.0,
+                rating_count=0,
+            )
+            db.add(affinity)
+        affinity.rating_sum += rating_delta
+        affinity.rating_count += count_delta
+        if affinity.rating_count <= 0:
+            db.delete(affinity)
+    # Sessions do not autoflush; later adjustments must see these rows.
+    db.flush()
+
+
+def get_user_entity_averages(
+    db: Session, user_id: int, entity_type: str
+) -> dict[int, float]:
+    """Returns the user's average rating per producer or voicebank id."""
+    return {
+        entity_id: rating_sum / rating_count
+        for entity_id, rating_sum, rating_count in db.query(
+            models.UserEntityAffinity.entity_id,
+            models.UserEntityAffinity.rating_sum,
+            models.UserEntityAffinity.rating_count,
+        ).filter(
+            models.UserEntityAffinity.user_id == user_id,
+            models.UserEntityAffinity.entity_type == entity_type,
+        )
+    }
+
+
+def rebuild_user_entity_affinity(
+    db: Session, user_ids: Optional[list[int]] = None
+) -> int:
+    """Recomputes affinity rows from ratings for ``user_ids`` (default: everyone).
+
+    Returns the number of rows written. Does not commit.
+    """
+    clear = delete(models.UserEntityAffinity)
+    if user_ids is not None:
+        clear = clear.where(models.UserEntityAffinity.user_id.in_(user_ids))
+    db.execute(clear)
+
+    written = 0
+    for entity_type, (junction_table, entity_column) in AFFINITY_ENTITY_LINKS.items():
+        aggregated = (
+            select(
+                models.Rating.user_id,
+                literal(entity_type),
+                entity_column,
+                func.sum(models.Rating.rating),
+                func.count(models.Rating.id),
+            )
+            .join(junction_table, junction_table.c.track_id == models.Rating.track_id)
+            .group_by(models.Rating.user_id, entity_column)
+        )
+        if user_ids is not None:
+            aggregated = aggregated.where(models.Rating.user_id.in_(user_ids))
+        written += _execute_dml(
+            db,
+            insert(models.UserEntityAffinity).from_select(
+                [
+                    "user_id",
+                    "entity_type",
+                    "entity_id",
+                    "rating_sum",
+                    "rating_count",
+                ],
+                aggregated,
+            ),
+        ).rowcount
+    return written
+
+
+def invalidate_rating_statistics(user_id: Optional[int] = None) -> None:
+    """Drops cached statistics for one user, or for everyone when ``user_id`` is None."""
+    # Profile views embed these statistics.
+    invalidate_profile_view(user_id)
+    if user_id is None:
+        _rating_statistics_cache.clear()
+        return
+    for key in [key for key in _rating_statistics_cache if key[0] == user_id]:
+        del _rating_statistics_cache[key]
+
+
+def _histogram_median(histogram: list[tuple[float, int]]) -> float:
+    """Median of the values described by ascending (value, count) pairs.
+
+    An empty histogram has median 0.0, matching the empty statistics.
+    """
+    cumulative = list(accumulate(count for _, count in histogram))
+    total = cumulative[-1] if cumulative else 0
+    if total == 0:
+        return 0.0
+    # The first pair whose running count passes each middle index.
+    lower: float = histogram[bisect_right(cumulative, (total - 1) // 2)][0]
+    upper: float = histogram[bisect_right(cumulative, total // 2)][0]
+    return (lower + upper) / 2
 
 
 def get_rating_statistics(db: Session, user_id: int, locale: str = "en"):
-    all_ratings_query = (
-        db.query(models.Rating.rating).filter(models.Rating.user_id == user_id).all()
-    )
-    if not all_ratings_query:
+    """Returns totals, average, median, distribution and favourite entities.
+
+    Everything except the favourites derives from one rating histogram
+    query, so the median needs no per-rating rows. Results are cached per user
+    and locale briefly; rating writes in this process invalidate them.
+    """
+    cache_key = (user_id, locale)
+    cached = _rating_statistics_cache.get(cache_key)
+    now = monotonic()
+    if cached and now - cached[0] < RATING_STATISTICS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    histogram = [
+        (float(rating), count)
+        for rating, count in db.query(
+            models.Rating.rating, func.count(models.Rating.id)
+        )
+        .filter(models.Rating.user_id == user_id)
+        .group_by(models.Rating.rating)
+        .order_by(models.Rating.rating.asc())
+    ]
+    if not histogram:
         # Return default structure if no ratings exist
         return {
             "total_ratings": 0,
@@ -466,27 +1071,28 @@ def get_rating_statistics(db: Session, user_id: int, locale: str = "en"):
             "rating_distribution": {},
         }
 
-    all_ratings_values = [r for (r,) in all_ratings_query]
-    total_ratings = len(all_ratings_values)
-    global_avg_rating = sum(all_ratings_values) / total_ratings
+    total_ratings = sum(count for _, count in histogram)
+    global_avg_rating = sum(rating * count for rating, count in histogram) / (
+        total_ratings
+    )
     MINIMUM_RATINGS_FOR_FAVORITE = 3
 
-    def get_top_entities(
-        model_class, junction_table, entity_id_col, name_attr, name_jp_attr
-    ):
+    def get_top_entities(model_class, entity_type, name_attr, name_jp_attr):
         name_col = getattr(model_class, name_jp_attr if locale == "ja" else name_attr)
+        affinity = models.UserEntityAffinity
 
         query = (
             db.query(
                 name_col.label("name"),
-                func.avg(models.Rating.rating).label("avg_rating"),
-                func.count(models.Rating.rating).label("count"),
+                (affinity.rating_sum / affinity.rating_count).label("avg_rating"),
+                affinity.rating_count.label("count"),
+            )
+            .join(model_class, model_class.id == affinity.entity_id)
+            .filter(
+                affinity.user_id == user_id,
+                affinity.entity_type == entity_type,
+                affinity.rating_count >= MINIMUM_RATINGS_FOR_FAVORITE,
             )
-            .join(junction_table, entity_id_col == model_class.id)
-            .join(models.Rating, models.Rating.track_id == junction_table.c.track_id)
-            .filter(models.Rating.user_id == user_id)
-            .group_by(model_class.id, name_col)
-            .having(func.count(models.Rating.rating) >= MINIMUM_RATINGS_FOR_FAVORITE)
         )
 
         results = query.all()
@@ -506,40 +1112,21 @@ def get_rating_statistics(db: Session, user_id: int, locale: str = "en"):
             )
         return sorted(scored, key=lambda x: x["score"], reverse=True)[:10]
 
-    top_producers = get_top_entities(
-        models.Producer,
-        models.track_producers,
-        models.track_producers.c.producer_id,
-        "name",
-        "name_jp",
-    )
-    top_voicebanks = get_top_entities(
-        models.Voicebank,
-        models.track_voicebanks,
-        models.track_voicebanks.c.voicebank_id,
-        "name",
-        "name_jp",
-    )
-
-    median_rating = median(all_ratings_values)
-
-    distribution_query = (
-        db.query(models.Rating.rating, func.count(models.Rating.rating).label("count"))
-        .filter(models.Rating.user_id == user_id)
-        .group_by(models.Rating.rating)
-        .order_by(desc(models.Rating.rating))
-        .all()
-    )
-    rating_distribution = {rating: count for rating, count in distribution_query}
+    top_producers = get_top_entities(models.Producer, "producer", "name", "name_jp")
+    top_voicebanks = get_top_entities(models.Voicebank, "voicebank", "name", "name_jp")
 
-    return {
+    statistics = {
         "total_ratings": total_ratings,
         "average_rating": round(global_avg_rating, 2),
-        "median_rating": median_rating,
+        "median_rating": _histogram_median(histogram),
         "top_producers": top_producers,
         "top_voicebanks": top_voicebanks,
-        "rating_distribution": rating_distribution,
+        "rating_distribution": {rating: count for rating, count in reversed(histogram)},
     }
+    if len(_rating_statistics_cache) >= RATING_STATISTICS_CACHE_SIZE:
+        _rating_statistics_cache.pop(next(iter(_rating_statistics_cache)))
+    _rating_statistics_cache[cache_key] = (now, statistics)
+    return statistics
 
 
 def create_update_log(db: Session):
@@ -556,8 +1143,154 @@ def get_last_update_time(db: Session):
     )
 
 
-def get_playlist(db: Session, playlist_id: int) -> Optional[models.Playlist]:
-    """Gets a single playlist by its ID, eagerly loading the tracks in their correct order."""
+def enqueue_scrape_job(db: Session, kind: str) -> tuple[models.ScrapeJob, bool]:
+    """Queues a scrape job unless one is already queued or running.
+
+    Returns the job and whether it was newly created. Two callers can both
+    pass the check; the unique index on active jobs rejects the second insert,
+    which then returns the first caller's job.
+    """
+    active_job = get_active_scrape_job(db)
+    if active_job:
+        return active_job, False
+    db_job = models.ScrapeJob(kind=kind, status="queued", stats={})
+    db.add(db_job)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        active_job = get_active_scrape_job(db, kind=kind)
+        if active_job is None:
+            raise
+        return active_job, False
+    db.refresh(db_job)
+    return db_job, True
+
+
+def get_active_scrape_job(
+    db: Session, kind: Optional[str] = None
+) -> Optional[models.ScrapeJob]:
+    query = db.query(models.ScrapeJob).filter(
+        models.ScrapeJob.status.in_(SCRAPE_JOB_ACTIVE_STATUSES)
+    )
+    if kind:
+        query = query.filter(models.ScrapeJob.kind == kind)
+    return query.order_by(models.ScrapeJob.id).first()
+
+
+def get_latest_scrape_job(db: Session) -> Optional[models.ScrapeJob]:
+    return db.query(models.ScrapeJob).order_by(models.ScrapeJob.id.desc()).first()
+
+
+def claim_next_scrape_job(db: Session, worker_id: str) -> Optional[models.ScrapeJob]:
+    """Marks the oldest queued job as running. Call only while holding the lease."""
+    now = _utcnow()
+    # A job still marked running belongs to a worker whose lease has lapsed.
+    db.query(models.ScrapeJob).filter(models.ScrapeJob.status == "in_progress").update(
+        {"status": "error", "error": "abandoned", "finished_at": now}
+    )
+    db_job = (
+        db.query(models.ScrapeJob)
+        .filter(models.ScrapeJob.status == "queued")
+        .order_by(models.ScrapeJob.id)
+        .first()
+    )
+    if db_job:
+        db_job.status = "in_progress"
+        db_job.locked_by = worker_id
+        db_job.started_at = now
+        db_job.heartbeat_at = now
+    db.commit()
+    return db_job
+
+
+def update_scrape_job(
+    db: Session, job_id: int, stats: Optional[dict] = None, **fields
+) -> Optional[models.ScrapeJob]:
+    """Records job progress and extends the holder's lease as a heartbeat."""
+    db_job = db.query(models.ScrapeJob).filter(models.ScrapeJob.id == job_id).first()
+    if not db_job:
+        return None
+    now = _utcnow()
+    for key, value in fields.items():
+        setattr(db_job, key, value)
+    if stats:
+        db_job.stats = {**(db_job.stats or {}), **stats}
+    db_job.heartbeat_at = now
+    if db_job.status not in SCRAPE_JOB_ACTIVE_STATUSES and not db_job.finished_at:
+        db_job.finished_at = now
+    if db_job.locked_by:
+        db.query(models.ScrapeLease).filter(
+            models.ScrapeLease.name == SCRAPE_LEASE_NAME,
+            models.ScrapeLease.holder == db_job.locked_by,
+        ).update({"expires_at": now + timedelta(seconds=SCRAPE_LEASE_TTL_SECONDS)})
+    db.commit()
+    return db_job
+
+
+def acquire_scrape_lease(
+    db: Session, holder: str, ttl_seconds: int = SCRAPE_LEASE_TTL_SECONDS
+) -> bool:
+    """Takes or renews the exclusive scrape lease; returns False if someone else holds it."""
+    now = _utcnow()
+    result = _execute_dml(
+        db,
+        update(models.ScrapeLease)
+        .where(
+            models.ScrapeLease.name == SCRAPE_LEASE_NAME,
+            or_(
+                models.ScrapeLease.holder.is_(None),
+                models.ScrapeLease.holder == holder,
+                models.ScrapeLease.expires_at < now,
+            ),
+        )
+        .values(holder=holder, expires_at=now + timedelta(seconds=ttl_seconds)),
+    )
+    if result.rowcount:
+        db.commit()
+        return True
+
+    if db.get(models.ScrapeLease, SCRAPE_LEASE_NAME):
+        db.rollback()
+        return False
+    db.add(
+        models.ScrapeLease(
+            name=SCRAPE_LEASE_NAME,
+            holder=holder,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker created the lease row first.
+        db.rollback()
+        return False
+    return True
+
+
+def release_scrape_lease(db: Session, holder: str) -> None:
+    db.execute(
+        update(models.ScrapeLease)
+        .where(
+            models.ScrapeLease.name == SCRAPE_LEASE_NAME,
+            models.ScrapeLease.holder == holder,
+        )
+        .values(holder=None, expires_at=None)
+    )
+    db.commit()
+
+
+def get_playlist(
+    db: Session, playlist_id: int, with_tracks: bool = True
+) -> Optional[models.Playlist]:
+    """Gets a single playlist by its ID, eagerly loading the tracks in their correct order.
+
+    Pass ``with_tracks=False`` when only the playlist row is needed, e.g. for
+    an access check before a paged track query.
+    """
+    if not with_tracks:
+        return db.get(models.Playlist, playlist_id)
     return (
         db.query(models.Playlist)
         .filter(models.Playlist.id == playlist_id)
@@ -580,6 +1313,81 @@ def get_playlists(db: Session, user_id: int) -> list[models.Playlist]:
     )
 
 
+def invalidate_public_playlists() -> None:
+    """Drops the cached first page of the public playlist directory."""
+    global _public_playlists_first_page
+    _public_playlists_first_page = None
+
+
+def get_public_playlist_page(
+    db: Session, after_id: Optional[int] = None, limit: int = 50
+) -> dict:
+    """Returns a page of public playlists, newest first.
+
+    Each entry carries its owner, track count and a cover image (the first
+    track in the playlist that has one), all from one query with correlated
+    subqueries, so no playlist or track rows are loaded. Pages are keyed by
+    the last playlist id seen. The first page is cached for
+    ``PUBLIC_PLAYLISTS_CACHE_TTL_SECONDS`` and dropped on writes to public
+    playlists; reordering only refreshes covers when it expires.
+    """
+    global _public_playlists_first_page
+    now = monotonic()
+    if after_id is None and _public_playlists_first_page is not None:
+        cached_at, cached_limit, cached_page = _public_playlists_first_page
+        if (
+            cached_limit == limit
+            and now - cached_at < PUBLIC_PLAYLISTS_CACHE_TTL_SECONDS
+        ):
+            return cached_page
+
+    playlist_track = models.PlaylistTrack
+    track_count = (
+        select(func.count(playlist_track.track_id))
+        .where(playlist_track.playlist_id == models.Playlist.id)
+        .correlate(models.Playlist)
+        .scalar_subquery()
+    )
+    cover_image_url = (
+        select(models.Track.image_url)
+        .join(playlist_track, playlist_track.track_id == models.Track.id)
+        .where(
+            playlist_track.playlist_id == models.Playlist.id,
+            models.Track.image_url.isnot(None),
+        )
+        .order_by(playlist_track.position)
+        .limit(1)
+        .correlate(models.Playlist)
+        .scalar_subquery()
+    )
+    query = (
+        db.query(
+            models.Playlist.id,
+            models.Playlist.name,
+            models.Playlist.description,
+            models.Playlist.created_at,
+            models.User.username.label("owner_username"),
+            models.User.is_profile_public.label("owner_profile_public"),
+            track_count.label("track_count"),
+            cover_image_url.label("cover_image_url"),
+        )
+        .join(models.User, models.User.id == models.Playlist.user_id)
+        .filter(models.Playlist.is_public)
+    )
+    if after_id is not None:
+        query = query.filter(models.Playlist.id < after_id)
+    rows = query.order_by(models.Playlist.id.desc()).limit(limit + 1).all()
+
+    playlists = [dict(row._mapping) for row in rows[:limit]]
+    page = {
+        "playlists": playlists,
+        "next_cursor": playlists[-1]["id"] if len(rows) > limit else None,
+    }
+    if after_id is None:
+        _public_playlists_first_page = (now, limit, page)
+    return page
+
+
 def create_playlist(
     db: Session, user_id: int, playlist: schemas.PlaylistCreate
 ) -> models.Playlist:
@@ -592,6 +1400,10 @@ def create_playlist(
     )
     db.add(db_playlist)
     db.commit()
+    invalidate_profile_view(user_id)
+    invalidate_user_playlists(user_id)
+    if db_playlist.is_public:
+        invalidate_public_playlists()
     db.refresh(db_playlist)
     return db_playlist
 
@@ -602,8 +1414,13 @@ def delete_playlist(db: Session, playlist_id: int, user_id: int) -> bool:
         db.query(models.Playlist).filter_by(id=playlist_id, user_id=user_id).first()
     )
     if db_playlist:
+        was_public = db_playlist.is_public
         db.delete(db_playlist)
         db.commit()
+        invalidate_profile_view(user_id)
+        invalidate_user_playlists(user_id)
+        if was_public:
+            invalidate_public_playlists()
         return True
     return False
 
@@ -625,6 +1442,9 @@ def update_playlist(
         db_playlist.description = description
         db_playlist.is_public = is_public
         db.commit()
+        invalidate_profile_view(user_id)
+        invalidate_user_playlists(user_id)
+        invalidate_public_playlists()
         db.refresh(db_playlist)
     return db_playlist
 
@@ -639,28 +1459,35 @@ def add_track_to_playlist(
     if not db_playlist:
         return None
 
+    playlist_track = models.PlaylistTrack
     # Check if the track is already in the playlist
-    for pt in db_playlist.playlist_tracks:
-        if pt.track_id == track_id:
-            return db_playlist  # Already exists, do nothing
-
-    # Find the next position
-    next_position = len(db_playlist.playlist_tracks)
+    if db.get(playlist_track, (playlist_id, track_id)) is not None:
+        return db_playlist  # Already exists, do nothing
 
-    # Create the association
-    playlist_track = models.PlaylistTrack(
-        playlist_id=playlist_id, track_id=track_id, position=next_position
+    last_position = (
+        db.query(func.max(playlist_track.position))
+        .filter(playlist_track.playlist_id == playlist_id)
+        .scalar()
+    )
+    next_position = (
+        0 if last_position is None else last_position + PLAYLIST_POSITION_GAP
+    )
+    db.add(
+        playlist_track(
+            playlist_id=playlist_id, track_id=track_id, position=next_position
+        )
     )
-    db.add(playlist_track)
     db.commit()
-    db.refresh(db_playlist)
+    invalidate_profile_view(user_id)
+    if db_playlist.is_public:
+        invalidate_public_playlists()
     return db_playlist
 
 
 def remove_track_from_playlist(
     db: Session, playlist_id: int, track_id: int, user_id: int
 ):
-    """Removes a track from a playlist and re-orders the remaining tracks."""
+    """Removes a track from a playlist; the other tracks keep their positions."""
     # First, get the playlist to ensure it belongs to the user
     db_playlist = (
         db.query(models.Playlist).filter_by(id=playlist_id, user_id=user_id).first()
@@ -668,42 +1495,163 @@ def remove_track_from_playlist(
     if not db_playlist:
         return  # Playlist not found or not owned by user
 
-    assoc_to_delete = (
-        db.query(models.PlaylistTrack)
-        .filter_by(playlist_id=playlist_id, track_id=track_id)
-        .first()
-    )
+    deleted = _execute_dml(
+        db,
+        delete(models.PlaylistTrack).where(
+            models.PlaylistTrack.playlist_id == playlist_id,
+            models.PlaylistTrack.track_id == track_id,
+        ),
+    ).rowcount
+    if deleted:
+        db.commit()
+        invalidate_profile_view(user_id)
+        if db_playlist.is_public:
+            invalidate_public_playlists()
 
-    if assoc_to_delete:
-        deleted_position = assoc_to_delete.position
-        db.delete(assoc_to_delete)
 
-        # Update positions of subsequent tracks
-        db.query(models.PlaylistTrack).filter(
-            models.PlaylistTrack.playlist_id == playlist_id,
-            models.PlaylistTrack.position > deleted_position,
-        ).update({"position": models.PlaylistTrack.position - 1})
+def _write_playlist_positions(
+    db: Session, playlist_id: int, track_ids: list[int]
+) -> None:
+    """Spaces ``track_ids`` out by ``PLAYLIST_POSITION_GAP`` in one UPDATE.
 
-        db.commit()
+    Joined against a VALUES list on Postgres, or driven by a CASE over the
+    track ids elsewhere. Does not commit.
+    """
+    new_positions = {
+        track_id: index * PLAYLIST_POSITION_GAP
+        for index, track_id in enumerate(track_ids)
+    }
+    playlist_track = models.PlaylistTrack
+    if db.get_bind().dialect.name == "postgresql":
+        new_order = values(
+            column("track_id", Integer),
+            column("position", Integer),
+            name="new_order",
+        ).data(list(new_positions.items()))
+        statement = (
+            update(playlist_track)
+            .where(
+                playlist_track.playlist_id == playlist_id,
+                playlist_track.track_id == new_order.c.track_id,
+            )
+            .values(position=new_order.c.position)
+        )
+    else:
+        statement = (
+            update(playlist_track)
+            .where(playlist_track.playlist_id == playlist_id)
+            .values(
+                position=case(
+                    new_positions,
+                    value=playlist_track.track_id,
+                    else_=playlist_track.position,
+                )
+            )
+        )
+    db.execute(statement.execution_options(synchronize_session=False))
+
+
+def _renumber_playlist_positions(db: Session, playlist_id: int) -> None:
+    """Restores even gaps between a playlist's positions. Does not commit."""
+    track_ids = list(
+        db.scalars(
+            select(models.PlaylistTrack.track_id)
+            .where(models.PlaylistTrack.playlist_id == playlist_id)
+            .order_by(models.PlaylistTrack.position, models.PlaylistTrack.track_id)
+        )
+    )
+    _write_playlist_positions(db, playlist_id, track_ids)
 
 
 def reorder_playlist(db: Session, playlist_id: int, track_ids: list[int], user_id: int):
-    """Re-orders an entire playlist based on a new list of track IDs."""
+    """Re-orders an entire playlist based on a new list of track IDs.
+
+    All positions are written by one UPDATE statement.
+    """
     # First, get the playlist to ensure it belongs to the user
     db_playlist = (
         db.query(models.Playlist).filter_by(id=playlist_id, user_id=user_id).first()
     )
-    if not db_playlist:
+    if not db_playlist or not track_ids:
         return  # Playlist not found or not owned by user
 
-    # This is an efficient way to update all positions at once
-    for index, track_id in enumerate(track_ids):
-        db.query(models.PlaylistTrack).filter_by(
-            playlist_id=playlist_id, track_id=track_id
-        ).update({"position": index})
+    _write_playlist_positions(db, playlist_id, track_ids)
     db.commit()
 
 
+def move_playlist_track(
+    db: Session, playlist_id: int, track_id: int, index: int, user_id: int
+) -> bool:
+    """Moves one track to ``index`` by giving it a position between its new
+    neighbours.
+
+    Only the moved row is written, unless the neighbours have no gap left and
+    the playlist is renumbered first. Returns False when the playlist or the
+    track in it is not found.
+    """
+    db_playlist = (
+        db.query(models.Playlist).filter_by(id=playlist_id, user_id=user_id).first()
+    )
+    if not db_playlist:
+        return False
+    playlist_track = models.PlaylistTrack
+    if db.get(playlist_track, (playlist_id, track_id)) is None:
+        return False
+
+    def neighbour_positions() -> tuple[Optional[int], Optional[int]]:
+        # The positions just before and at ``index`` among the other tracks.
+        offset = max(index - 1, 0)
+        positions = list(
+            db.scalars(
+                select(playlist_track.position)
+                .where(
+                    playlist_track.playlist_id == playlist_id,
+                    playlist_track.track_id != track_id,
+                )
+                .order_by(playlist_track.position, playlist_track.track_id)
+                .offset(offset)
+                .limit(2 if index > 0 else 1)
+            )
+        )
+        if index <= 0:
+            return None, positions[0] if positions else None
+        if not positions:
+            # ``index`` is past the end: append after the last other track.
+            last_position = db.scalar(
+                select(func.max(playlist_track.position)).where(
+                    playlist_track.playlist_id == playlist_id,
+                    playlist_track.track_id != track_id,
+                )
+            )
+            return last_position, None
+        return positions[0], positions[1] if len(positions) > 1 else None
+
+    before, after = neighbour_positions()
+    if before is not None and after is not None and after - before < 2:
+        _renumber_playlist_positions(db, playlist_id)
+        before, after = neighbour_positions()
+
+    if before is not None and after is not None:
+        position = (before + after) // 2
+    elif before is not None:
+        position = before + PLAYLIST_POSITION_GAP
+    elif after is not None:
+        position = after - PLAYLIST_POSITION_GAP
+    else:
+        position = 0
+    db.execute(
+        update(playlist_track)
+        .where(
+            playlist_track.playlist_id == playlist_id,
+            playlist_track.track_id == track_id,
+        )
+        .values(position=position)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return True
+
+
 def export_playlists(db: Session, user_id: int) -> list[dict]:
     """Fetches all playlists for a specific user and formats them for JSON export."""
     playlists_to_export = []
@@ -760,6 +1708,15 @@ def import_playlists(db: Session, user_id: int, data: list[dict]) -> tuple[int,
     """Imports playlists for a specific user from a list of dictionaries, merging with existing data."""
     created_count = 0
     updated_count = 0
+    track_ids = get_track_ids_by_links(
+        db,
+        [
+            link
+            for playlist_data in data
+            if playlist_data.get("name")
+            for link in playlist_data.get("tracks", [])
+        ],
+    )
 
     for playlist_data in data:
         playlist_name = playlist_data.get("name")
@@ -793,46 +1750,86 @@ def import_playlists(db: Session, user_id: int, data: list[dict]) -> tuple[int,
         # Clear existing tracks to ensure order is correct from the import
         db.query(models.PlaylistTrack).filter_by(playlist_id=db_playlist.id).delete()
 
-        # Add tracks from the import file
+        # Add tracks from the import file; unknown links are skipped
         track_links = playlist_data.get("tracks", [])
-        for index, link in enumerate(track_links):
-            # Find the track in the DB by its unique link
-            track = db.query(models.Track).filter_by(link=link).first()
-            if track:
-                assoc = models.PlaylistTrack(
-                    playlist_id=db_playlist.id, track_id=track.id, position=index
-                )
-                db.add(assoc)
+        rows = [
+            {
+                "playlist_id": db_playlist.id,
+                "track_id": track_ids[link],
+                "position": index * PLAYLIST_POSITION_GAP,
+            }
+            for index, link in enumerate(track_links)
+            if link in track_ids
+        ]
+        if rows:
+            db.execute(insert(models.PlaylistTrack), rows)
 
     db.commit()
+    invalidate_profile_view(user_id)
+    invalidate_user_playlists(user_id)
+    invalidate_public_playlists()
     return created_count, updated_count
 
 
-def get_track_playlist_membership(db: Session, track_id: int, user_id: int) -> dict:
-    """Checks which playlists a track belongs to for a specific user."""
+def invalidate_user_playlists(user_id: Optional[int] = None) -> None:
+    """Drops the cached playlist list of one user, or of everyone."""
+    if user_id is None:
+        _user_playlists_cache.clear()
+    else:
+        _user_playlists_cache.pop(user_id, None)
 
-    # 1. Get IDs of playlists the track is in for the current user.
-    member_playlist_ids_query = (
-        db.query(models.PlaylistTrack.playlist_id)
-        .join(models.Playlist)
-        .filter(
-            models.PlaylistTrack.track_id == track_id,
-            models.Playlist.user_id == user_id,
+
+def get_user_playlist_choices(db: Session, user_id: int) -> list[dict]:
+    """Returns the user's playlists as ``{"id", "name"}`` dicts, by name.
+
+    Cached per user; playlist create/rename/import/delete drop the entry.
+    """
+    cached = _user_playlists_cache.get(user_id)
+    now = monotonic()
+    if cached and now - cached[0] < USER_PLAYLISTS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    playlists = [
+        {"id": playlist_id, "name": name}
+        for playlist_id, name in db.query(models.Playlist.id, models.Playlist.name)
+        .filter(models.Playlist.user_id == user_id)
+        .order_by(models.Playlist.name, models.Playlist.id)
+    ]
+    if len(_user_playlists_cache) >= USER_PLAYLISTS_CACHE_SIZE:
+        _user_playlists_cache.pop(next(iter(_user_playlists_cache)))
+    _user_playlists_cache[user_id] = (now, playlists)
+    return playlists
+
+
+def _member_playlist_ids(
+    db: Session, user_id: int, track_ids: list[int]
+) -> dict[int, set[int]]:
+    member_ids: dict[int, set[int]] = {}
+    for start in range(0, len(track_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = track_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+        rows = (
+            db.query(models.PlaylistTrack.track_id, models.PlaylistTrack.playlist_id)
+            .join(models.Playlist)
+            .filter(
+                models.PlaylistTrack.track_id.in_(chunk),
+                models.Playlist.user_id == user_id,
+            )
         )
-    )
-    member_playlist_ids = {id for (id,) in member_playlist_ids_query}
+        for track_id, playlist_id in rows:
+            member_ids.setdefault(track_id, set()).add(playlist_id)
+    return member_ids
 
-    # 2. Get all playlists for the current user.
-    all_playlists = (
-        db.query(models.Playlist).filter(models.Playlist.user_id == user_id).all()
+
+def get_track_playlist_membership(db: Session, track_id: int, user_id: int) -> dict:
+    """Checks which playlists a track belongs to for a specific user."""
+    member_playlist_ids = _member_playlist_ids(db, user_id, [track_id]).get(
+        track_id, set()
     )
 
-    # 3. Separate them into two lists.
     member_of = []
     not_member_of = []
-    for p in all_playlists:
-        playlist_info = {"id": p.id, "name": p.name}
-        if p.id in member_playlist_ids:
+    for playlist_info in get_user_playlist_choices(db, user_id):
+        if playlist_info["id"] in member_playlist_ids:
             member_of.append(playlist_info)
         else:
             not_member_of.append(playlist_info)
@@ -840,6 +1837,30 @@ def get_track_playlist_membership(db: Session, track_id: int, user_id: int) -> d
     return {"member_of": member_of, "not_member_of": not_member_of}
 
 
+def get_playlist_membership_bitmaps(
+    db: Session, user_id: int, track_ids: list[int]
+) -> dict:
+    """Returns which of the user's playlists contain each track, in one payload.
+
+    Bit ``i`` of a track's hex bitmap is set when the track is in
+    ``playlists[i]``. Tracks in none of the playlists are omitted.
+    """
+    playlists = get_user_playlist_choices(db, user_id)
+    bit_by_playlist_id = {
+        playlist["id"]: 1 << index for index, playlist in enumerate(playlists)
+    }
+    membership = {}
+    for track_id, playlist_ids in _member_playlist_ids(
+        db, user_id, list(dict.fromkeys(track_ids))
+    ).items():
+        bitmap = 0
+        for playlist_id in playlist_ids:
+            bitmap |= bit_by_playlist_id.get(playlist_id, 0)
+        if bitmap:
+            membership[str(track_id)] = format(bitmap, "x")
+    return {"playlists": playlists, "membership": membership}
+
+
 def _calculate_snapshot(all_track_ids: List[int], limit: str) -> List[dict]:
     """Helper to calculate page numbers for a list of track IDs."""
     limit_val = len(all_track_ids)
@@ -957,35 +1978,14 @@ def get_playlist_snapshot(
     return _calculate_snapshot(all_track_ids, limit)
 
 
-def get_playlist_tracks_filtered(
-    db: Session,
-    playlist_id: int,
-    user_id: int,
-    skip: int = 0,
-    limit: int = 1000,
-    title_filter: Optional[str] = None,
-    producer_filter: Optional[str] = None,
-    voicebank_filter: Optional[str] = None,
-    sort_by: Optional[str] = None,
-    sort_dir: str = "asc",
-    locale: str = "en",
+def _filter_playlist_tracks(
+    query,
+    title_filter: Optional[str],
+    producer_filter: Optional[str],
+    voicebank_filter: Optional[str],
+    locale: str,
 ):
-    query = (
-        db.query(models.Track)
-        .join(models.PlaylistTrack)
-        .join(models.Playlist)
-        .filter(models.PlaylistTrack.playlist_id == playlist_id)
-        .filter(models.Playlist.user_id == user_id)
-        .outerjoin(
-            models.Rating,
-            and_(
-                models.Rating.track_id == models.Track.id,
-                models.Rating.user_id == user_id,
-            ),
-        )
-        .options(contains_eager(models.Track.ratings))
-    )
-
+    """Applies the playlist page's title/producer/voicebank filters."""
     if title_filter:
         search_term = f"%{title_filter}%"
         query = query.filter(
@@ -1016,7 +2016,11 @@ def get_playlist_tracks_filtered(
             )
         else:
             query = query.filter(models.Track.voicebank.ilike(search_term))
+    return query
 
+
+def _order_playlist_tracks(query, sort_by: Optional[str], sort_dir: str):
+    """Sorts by a track column, or by playlist position when none is given."""
     if sort_by:
         sort_column = getattr(models.Track, sort_by, None)
         if sort_column:
@@ -1027,6 +2031,46 @@ def get_playlist_tracks_filtered(
     else:
         # Default sort for playlists is their manually set position
         query = query.order_by(models.PlaylistTrack.position.asc())
+    return query
+
+
+def get_playlist_tracks_filtered(
+    db: Session,
+    playlist_id: int,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 1000,
+    title_filter: Optional[str] = None,
+    producer_filter: Optional[str] = None,
+    voicebank_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_dir: str = "asc",
+    locale: str = "en",
+):
+    query = (
+        db.query(models.Track)
+        .join(models.PlaylistTrack)
+        .join(models.Playlist)
+        .filter(models.PlaylistTrack.playlist_id == playlist_id)
+        .filter(models.Playlist.user_id == user_id)
+        .outerjoin(
+            models.Rating,
+            and_(
+                models.Rating.track_id == models.Track.id,
+                models.Rating.user_id == user_id,
+            ),
+        )
+        .options(
+            contains_eager(models.Track.ratings),
+            selectinload(models.Track.chart_stats),
+        )
+    )
+
+    query = _filter_playlist_tracks(
+        query, title_filter, producer_filter, voicebank_filter, locale
+    )
+
+    query = _order_playlist_tracks(query, sort_by, sort_dir)
 
     tracks = query.offset(skip).limit(limit).all()
     for track in tracks:
@@ -1051,38 +2095,123 @@ def get_playlist_tracks_count(
         .filter(models.Playlist.user_id == user_id)
     )
 
-    if title_filter:
-        search_term = f"%{title_filter}%"
-        query = query.filter(
-            or_(
-                models.Track.title.ilike(search_term),
-                models.Track.title_jp.ilike(search_term),
-            )
+    query = _filter_playlist_tracks(
+        query, title_filter, producer_filter, voicebank_filter, locale
+    )
+
+    return query.scalar()
+
+
+def get_playlist_track_page(
+    db: Session,
+    playlist_id: int,
+    user_id: int,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    title_filter: Optional[str] = None,
+    producer_filter: Optional[str] = None,
+    voicebank_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_dir: str = "asc",
+    locale: str = "en",
+) -> tuple[list[models.Track], int]:
+    """Returns one page of a playlist's filtered tracks and the filtered total.
+
+    The total rides along as a window count on the page query, so a page
+    costs one round trip; only a page past the end needs a separate count.
+    ``limit=None`` returns every matching track.
+    """
+    query = (
+        db.query(models.Track, func.count().over().label("total"))
+        .join(models.PlaylistTrack)
+        .filter(models.PlaylistTrack.playlist_id == playlist_id)
+        .outerjoin(
+            models.Rating,
+            and_(
+                models.Rating.track_id == models.Track.id,
+                models.Rating.user_id == user_id,
+            ),
         )
-    if producer_filter:
-        search_term = f"%{producer_filter}%"
-        if locale == "ja":
-            query = query.filter(
-                or_(
-                    models.Track.producer.ilike(search_term),
-                    models.Track.producer_jp.ilike(search_term),
-                )
-            )
-        else:
-            query = query.filter(models.Track.producer.ilike(search_term))
-    if voicebank_filter:
-        search_term = f"%{voicebank_filter}%"
+        .options(
+            contains_eager(models.Track.ratings),
+            selectinload(models.Track.chart_stats),
+        )
+    )
+    query = _filter_playlist_tracks(
+        query, title_filter, producer_filter, voicebank_filter, locale
+    )
+    # Position breaks ties so pages never overlap under a column sort.
+    query = _order_playlist_tracks(query, sort_by, sort_dir).order_by(
+        models.PlaylistTrack.position
+    )
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    rows = query.all()
+    tracks = [track for track, _ in rows]
+    for track in tracks:
+        track.is_in_playlist = True
+    if rows:
+        return tracks, rows[0].total
+    if not skip:
+        return tracks, 0
+    return tracks, get_playlist_tracks_count(
+        db,
+        playlist_id,
+        user_id,
+        title_filter=title_filter,
+        producer_filter=producer_filter,
+        voicebank_filter=voicebank_filter,
+        locale=locale,
+    )
+
+
+def get_playlist_facets(
+    db: Session, playlist_id: int, locale: str = "en"
+) -> tuple[list[str], list[str]]:
+    """Returns the distinct producer and voicebank names in a playlist.
+
+    Names come from the producer/voicebank tables in one UNION query rather
+    than from splitting every track's credit strings. Under ``ja`` the
+    Japanese name is used where one is known.
+    """
+    member_track_ids = select(models.PlaylistTrack.track_id).where(
+        models.PlaylistTrack.playlist_id == playlist_id
+    )
+
+    def facet_names(model, junction, key_column, kind):
+        name = model.name
         if locale == "ja":
-            query = query.filter(
-                or_(
-                    models.Track.voicebank.ilike(search_term),
-                    models.Track.voicebank_jp.ilike(search_term),
-                )
-            )
-        else:
-            query = query.filter(models.Track.voicebank.ilike(search_term))
+            name = func.coalesce(func.nullif(model.name_jp, ""), model.name)
+        return (
+            select(literal(kind).label("kind"), name.label("name"))
+            .join(junction, key_column == model.id)
+            .where(junction.c.track_id.in_(member_track_ids))
+        )
 
-    return query.scalar()
+    producers: list[str] = []
+    voicebanks: list[str] = []
+    rows = db.execute(
+        union(
+            facet_names(
+                models.Producer,
+                models.track_producers,
+                models.track_producers.c.producer_id,
+                "producer",
+            ),
+            facet_names(
+                models.Voicebank,
+                models.track_voicebanks,
+                models.track_voicebanks.c.voicebank_id,
+                "voicebank",
+            ),
+        )
+    )
+    for kind, name in rows:
+        (producers if kind == "producer" else voicebanks).append(name)
+    return sorted(producers), sorted(voicebanks)
 
 
 def get_playlist_snapshot_for_playlist(
@@ -1101,7 +2230,6 @@ def get_playlist_snapshot_for_playlist(
     Gets a sorted list of all track IDs for a specific playlist,
     annotated with the page number they would appear on.
     """
-    # --- 1. Build the query, starting with the playlist join ---
     query = (
         db.query(models.Track.id)
         .join(models.PlaylistTrack)
@@ -1111,49 +2239,11 @@ def get_playlist_snapshot_for_playlist(
             models.Playlist.user_id == user_id,
         )
     )
-    # --- 2. Apply filters ---
-    if title_filter:
-        search_term = f"%{title_filter}%"
-        query = query.filter(
-            or_(
-                models.Track.title.ilike(search_term),
-                models.Track.title_jp.ilike(search_term),
-            )
-        )
-    if producer_filter:
-        search_term = f"%{producer_filter}%"
-        if locale == "ja":
-            query = query.filter(
-                or_(
-                    models.Track.producer.ilike(search_term),
-                    models.Track.producer_jp.ilike(search_term),
-                )
-            )
-        else:
-            query = query.filter(models.Track.producer.ilike(search_term))
-    if voicebank_filter:
-        search_term = f"%{voicebank_filter}%"
-        if locale == "ja":
-            query = query.filter(
-                or_(
-                    models.Track.voicebank.ilike(search_term),
-                    models.Track.voicebank_jp.ilike(search_term),
-                )
-            )
-        else:
-            query = query.filter(models.Track.voicebank.ilike(search_term))
+    query = _filter_playlist_tracks(
+        query, title_filter, producer_filter, voicebank_filter, locale
+    )
 
-    # --- 3. Apply sorting ---
-    if sort_by:
-        sort_column = getattr(models.Track, sort_by, None)
-        if sort_column:
-            order_expression = (
-                sort_column.desc() if sort_dir == "desc" else sort_column.asc()
-            )
-            query = query.order_by(order_expression)
-    else:
-        # Default sort for playlists is their manually set position
-        query = query.order_by(models.PlaylistTrack.position.asc())
+    query = _order_playlist_tracks(query, sort_by, sort_dir)
 
     all_track_ids_tuples = query.all()
     all_track_ids = [id_tuple[0] for id_tuple in all_track_ids_tuples]
@@ -1234,94 +2324,286 @@ def get_recommended_tracks(
     MINIMUM_SCORE_THRESHOLD = 0.3
     bias_weights = {"off": 0.0, "light": 0.35, "strong": 0.75}
     recency_weight = bias_weights.get(recent_bias, 0.0)
-    now_utc = datetime.now(timezone.utc)
 
-    # 1. Get average ratings for producers and voicebanks from the normalized tables
-    def get_avg_ratings(model_class, junction_table, entity_id_col):
-        results = (
-            db.query(model_class.id, func.avg(models.Rating.rating).label("avg_rating"))
-            .join(junction_table, entity_id_col == model_class.id)
-            .join(models.Rating, models.Rating.track_id == junction_table.c.track_id)
-            .filter(models.Rating.user_id == user_id)
-            .group_by(model_class.id)
-            .all()
-        )
-        return {row.id: float(row.avg_rating) for row in results}
+    # 1. Per-producer and per-voicebank averages from the maintained affinity rows
+    producer_avg_ratings = get_user_entity_averages(db, user_id, "producer")
+    voicebank_avg_ratings = get_user_entity_averages(db, user_id, "voicebank")
 
-    producer_avg_ratings = get_avg_ratings(
-        models.Producer, models.track_producers, models.track_producers.c.producer_id
-    )
-    voicebank_avg_ratings = get_avg_ratings(
-        models.Voicebank,
-        models.track_voicebanks,
-        models.track_voicebanks.c.voicebank_id,
+    global_avg_rating = (
+        db.query(func.avg(models.Rating.rating))
+        .filter(models.Rating.user_id == user_id)
+        .scalar()
     )
+    if global_avg_rating is None:
+        return []
+    global_avg_rating = float(global_avg_rating)
+
+    # 2. Score the track positions reachable from a rated producer/voicebank
+    # in the cached sparse catalog index: each entity adds its deviation to
+    # the tracks it links.
+    index = get_recommendation_index(db)
+    scores: dict[int, float] = {}
+    producer_weight = 3
+    voicebank_weight = 1
 
-    all_ratings_query = (
-        db.query(models.Rating.rating).filter(models.Rating.user_id == user_id).all()
+    def add_mean_deviations(entity_tracks, avg_ratings, weight):
+        sums: dict[int, float] = {}
+        counts: dict[int, int] = {}
+        for entity_id, avg_rating in avg_ratings.items():
+            deviation = avg_rating - global_avg_rating
+            for position in entity_tracks.get(entity_id, ()):
+                sums[position] = sums.get(position, 0.0) + deviation
+                counts[position] = counts.get(position, 0) + 1
+        for position, total in sums.items():
+            scores[position] = scores.get(position, 0.0) + weight * (
+                total / counts[position]
+            )
+
+    add_mean_deviations(index.producer_tracks, producer_avg_ratings, producer_weight)
+    add_mean_deviations(index.voicebank_tracks, voicebank_avg_ratings, voicebank_weight)
+
+    rated_positions = {
+        index.position_by_track_id.get(track_id)
+        for (track_id,) in db.query(models.Rating.track_id).filter(
+            models.Rating.user_id == user_id
+        )
+    }
+
+    # 3. Recency boost from the precomputed decay. Unreached tracks score on
+    # recency alone, which never increases with position, so only the first
+    # ``limit`` of them (plus ties) can make the top-K.
+    if recency_weight > 0:
+        for position in scores:
+            scores[position] += recency_weight * index.recency[position]
+        recency_only = 0
+        last_boost = 0.0
+        for position, recency in enumerate(index.recency):
+            boost = recency_weight * recency
+            if boost <= MINIMUM_SCORE_THRESHOLD or (
+                recency_only >= limit and boost < last_boost
+            ):
+                break
+            if position in scores or position in rated_positions:
+                continue
+            scores[position] = boost
+            recency_only += 1
+            last_boost = boost
+
+    # 4. Top-K over the unrated candidates, then load only those tracks.
+    top_positions = heapq.nlargest(
+        limit,
+        (
+            position
+            for position, score in scores.items()
+            if score > MINIMUM_SCORE_THRESHOLD and position not in rated_positions
+        ),
+        key=lambda position: (scores[position], -index.track_ids[position]),
     )
-    if not all_ratings_query:
+    top_ids = [index.track_ids[position] for position in top_positions]
+    if not top_ids:
         return []
 
-    all_ratings_values = [r for (r,) in all_ratings_query]
-    global_avg_rating = sum(all_ratings_values) / len(all_ratings_values)
-
-    # 2. Get unrated tracks with their producers and voicebanks
-    unrated_tracks = (
-        db.query(models.Track)
+    tracks_by_id = {
+        track.id: track
+        for track in db.query(models.Track)
         .options(
-            joinedload(models.Track.producers), joinedload(models.Track.voicebanks)
+            selectinload(models.Track.producers),
+            selectinload(models.Track.voicebanks),
+            selectinload(models.Track.chart_stats),
         )
-        .filter(
-            ~exists().where(
-                and_(
-                    models.Rating.track_id == models.Track.id,
-                    models.Rating.user_id == user_id,
-                )
-            )
+        .filter(models.Track.id.in_(top_ids))
+    }
+    return [tracks_by_id[track_id] for track_id in top_ids if track_id in tracks_by_id]
+
+
+def get_ratings_by_user(db: Session) -> dict[int, list[tuple[int, float]]]:
+    """Returns every rating grouped by user as (track_id, rating) pairs."""
+    ratings_by_user: dict[int, list[tuple[int, float]]] = {}
+    rows = db.execute(
+        select(models.Rating.user_id, models.Rating.track_id, models.Rating.rating)
+        .order_by(models.Rating.user_id)
+        .execution_options(yield_per=IN_CLAUSE_CHUNK_SIZE * 10)
+    )
+    for user_id, track_id, rating in rows:
+        ratings_by_user.setdefault(user_id, []).append((track_id, float(rating)))
+    return ratings_by_user
+
+
+def replace_track_neighbors(
+    db: Session, neighbors: list[tuple[int, int, float, int]]
+) -> int:
+    """Replaces every stored neighbour list. Does not commit.
+
+    Rows are (track_id, neighbor_id, similarity, co_ratings) tuples.
+    """
+    db.execute(delete(models.TrackNeighbor))
+    for start in range(0, len(neighbors), IN_CLAUSE_CHUNK_SIZE):
+        db.execute(
+            insert(models.TrackNeighbor),
+            [
+                {
+                    "track_id": track_id,
+                    "neighbor_id": neighbor_id,
+                    "similarity": similarity,
+                    "co_ratings": co_ratings,
+                }
+                for track_id, neighbor_id, similarity, co_ratings in neighbors[
+                    start : start + IN_CLAUSE_CHUNK_SIZE
+                ]
+            ],
         )
-        .all()
+    return len(neighbors)
+
+
+def get_collaborative_recommendations(
+    db: Session, user_id: int, limit: int = 25
+) -> List[models.Track]:
+    """Recommends unrated tracks from the precomputed item-item neighbours.
+
+    Each rated track votes for its neighbours with the user's mean-centred
+    rating times the similarity; the vote total is shrunk towards zero so a
+    single weak neighbour cannot outrank broad agreement.
+    """
+    SIMILARITY_SHRINKAGE = 1.0
+
+    ratings = {
+        track_id: rating
+        for track_id, rating in db.query(
+            models.Rating.track_id, models.Rating.rating
+        ).filter(models.Rating.user_id == user_id)
+    }
+    if not ratings:
+        return []
+    mean_rating = sum(ratings.values()) / len(ratings)
+
+    weighted: dict[int, float] = {}
+    similarity_totals: dict[int, float] = {}
+    rated_ids = list(ratings)
+    for start in range(0, len(rated_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = rated_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+        rows = db.query(
+            models.TrackNeighbor.track_id,
+            models.TrackNeighbor.neighbor_id,
+            models.TrackNeighbor.similarity,
+        ).filter(models.TrackNeighbor.track_id.in_(chunk))
+        for track_id, neighbor_id, similarity in rows:
+            if neighbor_id in ratings:
+                continue
+            deviation = ratings[track_id] - mean_rating
+            weighted[neighbor_id] = (
+                weighted.get(neighbor_id, 0.0) + similarity * deviation
+            )
+            similarity_totals[neighbor_id] = (
+                similarity_totals.get(neighbor_id, 0.0) + similarity
+            )
+
+    scores = {
+        track_id: weighted[track_id]
+        / (similarity_totals[track_id] + SIMILARITY_SHRINKAGE)
+        for track_id in weighted
+    }
+    top_ids = heapq.nlargest(
+        limit,
+        (track_id for track_id, score in scores.items() if score > 0),
+        key=lambda track_id: (scores[track_id], -track_id),
     )
+    if not top_ids:
+        return []
 
-    # 3. Calculate recommendation score for each unrated track
-    track_scores = []
-    producer_weight = 3
-    voicebank_weight = 1
+    tracks_by_id = {
+        track.id: track
+        for track in db.query(models.Track)
+        .options(
+            selectinload(models.Track.producers),
+            selectinload(models.Track.voicebanks),
+            selectinload(models.Track.chart_stats),
+        )
+        .filter(models.Track.id.in_(top_ids))
+    }
+    return [tracks_by_id[track_id] for track_id in top_ids if track_id in tracks_by_id]
 
-    for track in unrated_tracks:
-        score = 0.0
 
-        # Score from producers
-        p_scores = [
-            producer_avg_ratings[p.id] - global_avg_rating
-            for p in track.producers
-            if p.id in producer_avg_ratings
-        ]
-        if p_scores:
-            score += producer_weight * (sum(p_scores) / len(p_scores))
-
-        # Score from voicebanks
-        v_scores = [
-            voicebank_avg_ratings[v.id] - global_avg_rating
-            for v in track.voicebanks
-            if v.id in voicebank_avg_ratings
-        ]
-        if v_scores:
-            score += voicebank_weight * (sum(v_scores) / len(v_scores))
+def invalidate_recommendation_index() -> None:
+    global _recommendation_index
+    _recommendation_index = None
 
-        if recency_weight > 0 and track.published_date:
-            published_dt = track.published_date
-            if published_dt.tzinfo is None:
-                published_dt = published_dt.replace(tzinfo=timezone.utc)
-            age_days = max((now_utc - published_dt).days, 0)
-            recency_score = exp(-age_days / 730)
-            score += recency_weight * recency_score
 
-        if score > MINIMUM_SCORE_THRESHOLD:
-            track_scores.append((track, score))
+def _catalog_version(db: Session) -> tuple:
+    """Newest track id and update log id, both read from primary key indexes.
+
+    New tracks bump the first; every scrape, which is what relinks existing
+    tracks, writes an update log and bumps the second.
+    """
+    return tuple(
+        db.execute(
+            select(
+                select(func.max(models.Track.id)).scalar_subquery(),
+                select(func.max(models.UpdateLog.id)).scalar_subquery(),
+            )
+        ).one()
+    )
 
-    track_scores.sort(key=lambda x: x[1], reverse=True)
-    return [track for track, _ in track_scores[:limit]]
+
+def get_recommendation_index(db: Session) -> _CatalogIndex:
+    """Returns the catalog index, rebuilt when the catalog version changes.
+
+    Edits in this process invalidate it directly; the version check and TTL
+    pick up writes made by other processes.
+    """
+    global _recommendation_index
+
+    version = _catalog_version(db)
+    now = monotonic()
+    cached = _recommendation_index
+    if (
+        cached is not None
+        and cached.version == version
+        and now - cached.built_at < RECOMMENDATION_INDEX_TTL_SECONDS
+    ):
+        return cached
+
+    track_ids = array("q")
+    recency = array("d")
+    position_by_track_id: dict[int, int] = {}
+    now_ts = datetime.now(timezone.utc).timestamp()
+    rows = db.query(models.Track.id, models.Track.published_date).order_by(
+        nullslast(models.Track.published_date.desc()), models.Track.id
+    )
+    for track_id, published_date in rows:
+        position_by_track_id[track_id] = len(track_ids)
+        track_ids.append(track_id)
+        if published_date is None:
+            recency.append(0.0)
+        else:
+            if published_date.tzinfo is None:
+                published_date = published_date.replace(tzinfo=timezone.utc)
+            age_days = max(floor((now_ts - published_date.timestamp()) / 86400), 0)
+            recency.append(exp(-age_days / 730))
+
+    def incidence(junction_table, entity_column):
+        entity_tracks: dict[int, array] = {}
+        for track_id, entity_id in db.execute(
+            select(junction_table.c.track_id, entity_column)
+        ):
+            position = position_by_track_id.get(track_id)
+            if position is not None:
+                entity_tracks.setdefault(entity_id, array("l")).append(position)
+        return entity_tracks
+
+    _recommendation_index = _CatalogIndex(
+        version=version,
+        built_at=now,
+        track_ids=track_ids,
+        recency=recency,
+        producer_tracks=incidence(
+            models.track_producers, models.track_producers.c.producer_id
+        ),
+        voicebank_tracks=incidence(
+            models.track_voicebanks, models.track_voicebanks.c.voicebank_id
+        ),
+        position_by_track_id=position_by_track_id,
+    )
+    return _recommendation_index
 
 
 # User CRUD operations
@@ -1375,9 +2657,118 @@ def update_user_profile(
     db_user.username = username
     db_user.is_profile_public = is_profile_public
     db.commit()
+    invalidate_profile_view(db_user.id)
+    # The directory shows owner names and profile links.
+    invalidate_public_playlists()
     return db_user
 
 
+def invalidate_profile_view(user_id: Optional[int] = None) -> None:
+    """Drops cached profile views for one user, or for everyone when ``user_id`` is None."""
+    if user_id is None:
+        _profile_view_cache.clear()
+        return
+    for key in [
+        key
+        for key, (_, view) in _profile_view_cache.items()
+        if view["user"]["id"] == user_id
+    ]:
+        del _profile_view_cache[key]
+
+
+def get_cached_profile_view(db: Session, username: str, locale: str) -> Optional[dict]:
+    """Returns the cached view model for a public profile, if still fresh.
+
+    Other workers cannot invalidate this cache, so the profile's privacy flag
+    and username are re-read by primary key before a cached view is served.
+    """
+    key = (username.lower(), locale)
+    cached = _profile_view_cache.get(key)
+    if not cached or monotonic() - cached[0] >= PROFILE_VIEW_CACHE_TTL_SECONDS:
+        return None
+    current = db.execute(
+        select(models.User.username, models.User.is_profile_public).where(
+            models.User.id == cached[1]["user"]["id"]
+        )
+    ).first()
+    if (
+        current is None
+        or not current.is_profile_public
+        or (current.username or "").lower() != key[0]
+    ):
+        _profile_view_cache.pop(key, None)
+        return None
+    return cached[1]
+
+
+def build_profile_view(db: Session, user: models.User, locale: str = "en") -> dict:
+    """Builds the plain-data view model rendered on a user's profile page.
+
+    Public profiles are cached per username and locale until that user's next
+    rating, playlist or profile write. ``version`` fingerprints the content so
+    the page can be served with an ETag.
+    """
+    playlists = [
+        {
+            "id": playlist_id,
+            "name": name,
+            "description": description,
+            "track_count": track_count,
+            "created_date": created_at.strftime("%Y-%m-%d") if created_at else "",
+        }
+        for playlist_id, name, description, created_at, track_count in db.query(
+            models.Playlist.id,
+            models.Playlist.name,
+            models.Playlist.description,
+            models.Playlist.created_at,
+            func.count(models.PlaylistTrack.track_id),
+        )
+        .outerjoin(models.PlaylistTrack)
+        .filter(models.Playlist.user_id == user.id, models.Playlist.is_public)
+        .group_by(models.Playlist.id)
+        .order_by(models.Playlist.id)
+    ]
+    tracks = [
+        {
+            "title": title,
+            "link": link,
+            "producer": producer,
+            "voicebank": voicebank,
+            "rating": rating,
+        }
+        for title, link, producer, voicebank, rating in db.query(
+            models.Track.title,
+            models.Track.link,
+            models.Track.producer,
+            models.Track.voicebank,
+            models.Rating.rating,
+        )
+        .join(models.Rating)
+        .filter(models.Rating.user_id == user.id, models.Rating.rating >= 8)
+        .order_by(models.Rating.rating.desc(), models.Rating.updated_at.desc())
+        .limit(20)
+    ]
+    view = {
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "is_profile_public": user.is_profile_public,
+        },
+        "stats": get_rating_statistics(db, user_id=user.id, locale=locale),
+        "playlists": playlists,
+        "tracks": tracks,
+    }
+    view["version"] = hashlib.sha1(
+        json.dumps(view, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+    if user.is_profile_public and user.username:
+        if len(_profile_view_cache) >= PROFILE_VIEW_CACHE_SIZE:
+            _profile_view_cache.pop(next(iter(_profile_view_cache)))
+        _profile_view_cache[(user.username.lower(), locale)] = (monotonic(), view)
+    return view
+
+
 def get_users(db: Session) -> list[models.User]:
     """Gets a list of all users."""
     return db.query(models.User).all()
@@ -1392,8 +2783,16 @@ def delete_user(db: Session, user_id: int) -> bool:
     """Deletes a user by ID."""
     db_user = db.query(models.User).filter(models.User.id == user_id).first()
     if db_user:
+        db.execute(
+            delete(models.UserEntityAffinity).where(
+                models.UserEntityAffinity.user_id == user_id
+            )
+        )
         db.delete(db_user)
         db.commit()
+        invalidate_rating_statistics(user_id)
+        invalidate_user_playlists(user_id)
+        invalidate_public_playlists()
         return True
     return False
 
@@ -1410,62 +2809,632 @@ def update_user_admin_status(
     return db_user
 
 
-def get_tracks_as_of(db: Session, target_date: datetime) -> list[models.Track]:
-    """Get track rankings as of a specific date from rank_history.
+def get_rank_snapshot_id_at(db: Session, at: datetime) -> Optional[int]:
+    """Returns the id of the latest rank snapshot recorded at or before ``at``."""
+    return (
+        db.query(models.RankSnapshot.id)
+        .filter(models.RankSnapshot.recorded_at <= at)
+        .order_by(models.RankSnapshot.recorded_at.desc())
+        .limit(1)
+        .scalar()
+    )
+
+
+def get_rank_diff_rows(
+    db: Session, since: datetime, until: Optional[datetime] = None
+) -> tuple[Optional[datetime], Optional[datetime], list[dict]]:
+    """Compares two charts in one GROUP BY over a UNION ALL of both sides.
+
+    ``since``/``until`` resolve to the latest rank snapshot at or before each
+    time inside the same statement; ``until=None`` compares against the
+    current chart on ``tracks.rank``. Returns ``(old_at, new_at, rows)`` with
+    the resolved timestamps (``None`` where no snapshot exists; then no rows).
+    Each row is a dict of the track columns, ``old_rank``, ``new_rank`` and a ``status`` of
+    ``entered``, ``dropped``, ``up``, ``down`` or ``same``, ordered by the new
+    chart.
+    """
+
+    def snapshot_time_at(at: datetime):
+        return (
+            select(models.RankSnapshot.recorded_at)
+            .where(models.RankSnapshot.recorded_at <= at)
+            .order_by(models.RankSnapshot.recorded_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    old_at = snapshot_time_at(since)
+    new_at = snapshot_time_at(until) if until is not None else None
+    no_rank = cast(null(), Integer)
+    old_side = select(
+        models.RankHistory.track_id.label("track_id"),
+        models.RankHistory.rank.label("old_rank"),
+        no_rank.label("new_rank"),
+    ).where(models.RankHistory.recorded_at == old_at)
+    if new_at is None:
+        new_side = select(
+            models.Track.id.label("track_id"),
+            no_rank.label("old_rank"),
+            models.Track.rank.label("new_rank"),
+        ).where(models.Track.rank.isnot(None))
+    else:
+        new_side = select(
+            models.RankHistory.track_id.label("track_id"),
+            no_rank.label("old_rank"),
+            models.RankHistory.rank.label("new_rank"),
+        ).where(models.RankHistory.recorded_at == new_at)
+    sides = union_all(old_side, new_side).subquery()
+
+    old_rank = func.max(sides.c.old_rank)
+    new_rank = func.max(sides.c.new_rank)
+    status = case(
+        (old_rank.is_(None), "entered"),
+        (new_rank.is_(None), "dropped"),
+        (new_rank < old_rank, "up"),
+        (new_rank > old_rank, "down"),
+        else_="same",
+    )
+    diff = (
+        select(
+            models.Track.id.label("track_id"),
+            models.Track.title,
+            models.Track.title_jp,
+            models.Track.producer,
+            models.Track.link,
+            old_rank.label("old_rank"),
+            new_rank.label("new_rank"),
+            status.label("status"),
+        )
+        .join(models.Track, models.Track.id == sides.c.track_id)
+        .group_by(models.Track.id)
+        .subquery()
+    )
+    # The outer join keeps one row carrying the resolved times even when the
+    # diff is empty.
+    bound_columns = [old_at.label("old_at")]
+    if new_at is not None:
+        bound_columns.append(new_at.label("new_at"))
+    bounds = select(*bound_columns).subquery()
+    query = (
+        select(bounds, diff)
+        .select_from(bounds.outerjoin(diff, true()))
+        .order_by(nullslast(diff.c.new_rank.asc()), diff.c.old_rank.asc())
+    )
+    result = db.execute(query).mappings().all()
+    resolved_old_at = result[0]["old_at"]
+    resolved_new_at = result[0]["new_at"] if new_at is not None else None
+    if resolved_old_at is None or (new_at is not None and resolved_new_at is None):
+        return resolved_old_at, resolved_new_at, []
+    rows = [
+        {key: row[key] for key in diff.c.keys()}
+        for row in result
+        if row["track_id"] is not None
+    ]
+    return resolved_old_at, resolved_new_at, rows
+
+
+def get_tracks_as_of(db: Session, target_date: datetime) -> list[dict]:
+    """Get the chart as of a specific date from the rank snapshot index.
 
     Args:
         db: Database session
         target_date: The date to view rankings for
 
     Returns:
-        List of tracks with their historical ranks
+        Plain track dicts with their historical ``rank``, ordered by rank.
+        Charts are cached per snapshot, so repeat views skip the database.
     """
-    from sqlalchemy import func, and_
+    snapshot_id = get_rank_snapshot_id_at(db, target_date)
+    if snapshot_id is None:
+        return []
+    cached = _historical_chart_cache.get(snapshot_id)
+    if cached is not None:
+        return cached
+
+    blob = (
+        db.query(models.RankSnapshot.ranks)
+        .filter(models.RankSnapshot.id == snapshot_id)
+        .scalar()
+    )
+    ranks = unpack_ranks(blob or b"")
+    columns = (
+        models.Track.id,
+        models.Track.title,
+        models.Track.title_jp,
+        models.Track.producer,
+        models.Track.voicebank,
+        models.Track.link,
+        models.Track.image_url,
+    )
+    track_ids = [track_id for track_id, _ in ranks]
+    rows_by_id = {}
+    for start in range(0, len(track_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = track_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+        for row in db.query(*columns).filter(models.Track.id.in_(chunk)):
+            rows_by_id[row.id] = row._asdict()
+
+    chart = [
+        {**rows_by_id[track_id], "rank": rank}
+        for track_id, rank in ranks
+        if track_id in rows_by_id
+    ]
+    if len(_historical_chart_cache) >= HISTORICAL_CHART_CACHE_SIZE:
+        _historical_chart_cache.pop(next(iter(_historical_chart_cache)))
+    _historical_chart_cache[snapshot_id] = chart
+    return chart
 
-    # Get the latest rank entry for each track before or on target_date
-    subquery = (
-        db.query(
+
+def get_available_dates(db: Session) -> list[str]:
+    """Get the ``YYYY-MM-DD`` dates that have ranking snapshots, newest first.
+
+    Derived from the cached scrape timeline, so it is rebuilt only when a
+    snapshot write invalidates that cache.
+    """
+    global _available_dates_cache
+
+    timeline = get_scrape_timeline(db)
+    if _available_dates_cache is None or _available_dates_cache[0] is not timeline:
+        dates = list(dict.fromkeys(label for _, label in reversed(timeline)))
+        _available_dates_cache = (timeline, dates)
+    return _available_dates_cache[1]
+
+
+def count_rank_history_on_date(db: Session, chart_date: date) -> int:
+    """Counts rank history rows recorded on a calendar day."""
+    day_start = datetime.combine(chart_date, datetime.min.time())
+    return (
+        db.query(func.count(models.RankHistory.id))
+        .filter(
+            models.RankHistory.recorded_at >= day_start,
+            models.RankHistory.recorded_at < day_start + timedelta(days=1),
+        )
+        .scalar()
+        or 0
+    )
+
+
+def replace_rank_history_for_date(
+    db: Session, chart_date: date, ranks: list[tuple[int, int]]
+) -> int:
+    """Replaces the backfilled rank rows and snapshot of a calendar day in bulk.
+
+    ``ranks`` is a list of ``(track_id, rank)`` pairs; rows are recorded at
+    midnight of ``chart_date``. Only rows at that midnight are replaced, so
+    live scrapes recorded later the same day are kept. Does not commit.
+    """
+    day_start = datetime.combine(chart_date, datetime.min.time())
+    replaced_track_ids = [
+        track_id
+        for (track_id,) in db.query(models.RankHistory.track_id)
+        .filter(models.RankHistory.recorded_at == day_start)
+        .distinct()
+    ]
+    db.execute(
+        delete(models.RankHistory).where(models.RankHistory.recorded_at == day_start)
+    )
+    db.execute(
+        delete(models.RankSnapshot).where(models.RankSnapshot.recorded_at == day_start)
+    )
+    if ranks:
+        db.execute(
+            insert(models.RankHistory),
+            [
+                {"track_id": track_id, "rank": rank, "recorded_at": day_start}
+                for track_id, rank in ranks
+            ],
+        )
+        save_rank_snapshot(db, day_start, ranks)
+    if replaced_track_ids:
+        # Re-fetching a stored day can remove appearances, so recount.
+        rebuild_track_chart_stats(
+            db, replaced_track_ids + [track_id for track_id, _ in ranks]
+        )
+    elif ranks:
+        update_track_chart_stats(db, day_start, ranks)
+    return len(ranks)
+
+
+def save_rank_snapshot(
+    db: Session, recorded_at: datetime, ranks: list[tuple[int, int]]
+) -> models.RankSnapshot:
+    """Stores the packed chart for ``recorded_at``, replacing any earlier one.
+
+    Does not commit.
+    """
+    snapshot = (
+        db.query(models.RankSnapshot)
+        .filter(models.RankSnapshot.recorded_at == recorded_at)
+        .first()
+    )
+    if not snapshot:
+        snapshot = models.RankSnapshot(recorded_at=recorded_at)
+        db.add(snapshot)
+    snapshot.track_count = len(ranks)
+    snapshot.ranks = pack_ranks(ranks)
+    return snapshot
+
+
+def snapshot_current_ranks(db: Session, recorded_at: Optional[datetime] = None) -> int:
+    """Copies every ranked track into rank history with one INSERT ... SELECT.
+
+    Also stores the same chart as a compact snapshot row. Returns the number
+    of ranks recorded. Does not commit.
+    """
+    recorded_at = recorded_at or _utcnow()
+    ranked = select(models.Track.id, models.Track.rank).where(
+        models.Track.rank.isnot(None)
+    )
+    db.execute(
+        insert(models.RankHistory).from_select(
+            ["track_id", "rank", "recorded_at"],
+            ranked.add_columns(literal(recorded_at, type_=DateTime)),
+        )
+    )
+    ranks = [(track_id, rank) for track_id, rank in db.execute(ranked)]
+    if ranks:
+        save_rank_snapshot(db, recorded_at, ranks)
+        update_track_chart_stats(db, recorded_at, ranks)
+    return len(ranks)
+
+
+def _apply_chart_appearance(
+    stats: models.TrackChartStats, recorded_at: datetime, rank: int
+) -> bool:
+    """Folds one snapshot appearance into ``stats``.
+
+    Returns False when the appearance predates ``stats.last_seen_at`` by a
+    day or more; such tracks need a rebuild from rank history instead.
+    """
+    day = recorded_at.date()
+    if stats.last_seen_at is None:
+        stats.peak_rank = rank
+        stats.debut_at = recorded_at
+        stats.last_seen_at = recorded_at
+        stats.days_on_chart = 1
+        stats.current_streak = 1
+        stats.longest_streak = 1
+        return True
+
+    last_day = stats.last_seen_at.date()
+    if day < last_day:
+        return False
+    stats.peak_rank = min(stats.peak_rank, rank)
+    if day > last_day:
+        stats.days_on_chart += 1
+        if day - last_day == timedelta(days=1):
+            stats.current_streak += 1
+        else:
+            stats.current_streak = 1
+        stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+    stats.last_seen_at = max(stats.last_seen_at, recorded_at)
+    return True
+
+
+def update_track_chart_stats(
+    db: Session, recorded_at: datetime, ranks: list[tuple[int, int]]
+) -> None:
+    """Updates chart statistics for the tracks in one new snapshot.
+
+    Only tracks present in the snapshot are touched. Snapshots older than a
+    track's latest appearance (e.g. backfilled dates) rebuild that track from
+    rank history. Does not commit.
+    """
+    track_ids = [track_id for track_id, _ in ranks]
+    existing: dict[int, models.TrackChartStats] = {}
+    for start in range(0, len(track_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = track_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+        for stats in db.query(models.TrackChartStats).filter(
+            models.TrackChartStats.track_id.in_(chunk)
+        ):
+            existing[stats.track_id] = stats
+
+    out_of_order = []
+    for track_id, rank in ranks:
+        stats = existing.get(track_id)
+        if stats is None:
+            stats = models.TrackChartStats(track_id=track_id)
+            db.add(stats)
+            existing[track_id] = stats
+        if not _apply_chart_appearance(stats, recorded_at, rank):
+            out_of_order.append(track_id)
+    db.flush()
+    if out_of_order:
+        rebuild_track_chart_stats(db, out_of_order)
+
+
+CHART_STATS_COLUMNS = (
+    "peak_rank",
+    "debut_at",
+    "last_seen_at",
+    "days_on_chart",
+    "current_streak",
+    "longest_streak",
+)
+
+
+def _replay_chart_history(
+    db: Session,
+    history: Select,
+    baselines: dict[int, models.TrackChartStatsBaseline],
+) -> Iterator[models.TrackChartStats]:
+    """Yields new statistics per track: its baseline plus the history after it.
+
+    ``history`` must be ordered by (track_id, recorded_at). Rows recorded
+    before a track's ``compacted_before`` are already in its baseline and are
+    skipped. Tracks with a baseline but no history are yielded as-is.
+    """
+    pending = dict(baselines)
+    stats = None
+    compacted_before = None
+    for track_id, recorded_at, rank in db.execute(
+        history.execution_options(yield_per=IN_CLAUSE_CHUNK_SIZE)
+    ):
+        if stats is None or stats.track_id != track_id:
+            if stats is not None:
+                yield stats
+            baseline = pending.pop(track_id, None)
+            stats = _chart_stats_from_baseline(track_id, baseline)
+            compacted_before = baseline.compacted_before if baseline else None
+        if compacted_before is None or recorded_at >= compacted_before:
+            _apply_chart_appearance(stats, recorded_at, rank)
+    if stats is not None:
+        yield stats
+    for track_id, baseline in pending.items():
+        yield _chart_stats_from_baseline(track_id, baseline)
+
+
+def _chart_stats_from_baseline(
+    track_id: int, baseline: Optional[models.TrackChartStatsBaseline]
+) -> models.TrackChartStats:
+    stats = models.TrackChartStats(track_id=track_id)
+    if baseline is not None:
+        for name in CHART_STATS_COLUMNS:
+            setattr(stats, name, getattr(baseline, name))
+    return stats
+
+
+def rebuild_track_chart_stats(
+    db: Session, track_ids: Optional[list[int]] = None
+) -> int:
+    """Recomputes chart statistics from rank history.
+
+    Rebuilds every track when ``track_ids`` is None. History removed by
+    retention compaction is counted through ``track_chart_stats_baseline``,
+    so a rebuild after compaction leaves the statistics unchanged. Returns
+    the number of tracks with statistics. Does not commit.
+    """
+    history = select(
+        models.RankHistory.track_id,
+        models.RankHistory.recorded_at,
+        models.RankHistory.rank,
+    ).order_by(models.RankHistory.track_id, models.RankHistory.recorded_at)
+    baselines = db.query(models.TrackChartStatsBaseline)
+
+    # Rows are replaced wholesale below; drop any loaded copies first.
+    rebuilt_ids = None if track_ids is None else set(track_ids)
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, models.TrackChartStats) and (
+            rebuilt_ids is None or db.identity_key(instance=obj)[1][0] in rebuilt_ids
+        ):
+            db.expunge(obj)
+
+    if track_ids is None:
+        db.execute(delete(models.TrackChartStats))
+        batches = [(history, baselines)]
+    else:
+        track_ids = list(dict.fromkeys(track_ids))
+        batches = []
+        for start in range(0, len(track_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = track_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+            db.execute(
+                delete(models.TrackChartStats).where(
+                    models.TrackChartStats.track_id.in_(chunk)
+                )
+            )
+            batches.append(
+                (
+                    history.where(models.RankHistory.track_id.in_(chunk)),
+                    baselines.filter(
+                        models.TrackChartStatsBaseline.track_id.in_(chunk)
+                    ),
+                )
+            )
+
+    rebuilt = 0
+    for batch, batch_baselines in batches:
+        for stats in _replay_chart_history(
+            db, batch, {baseline.track_id: baseline for baseline in batch_baselines}
+        ):
+            db.add(stats)
+            rebuilt += 1
+        db.flush()
+    return rebuilt
+
+
+def fold_chart_stats_baseline(db: Session, before: datetime) -> int:
+    """Folds the chart statistics of history recorded before ``before``.
+
+    Run before retention compaction deletes that history, so rebuilds keep
+    counting it. Returns the number of baselines written. Does not commit.
+    """
+    existing = {
+        baseline.track_id: baseline
+        for baseline in db.query(models.TrackChartStatsBaseline)
+    }
+    # Never move a boundary back: history before it is already downsampled.
+    compacted_before = max(
+        [before, *(baseline.compacted_before for baseline in existing.values())]
+    )
+    history = (
+        select(
             models.RankHistory.track_id,
-            func.max(models.RankHistory.recorded_at).label("latest_date"),
+            models.RankHistory.recorded_at,
+            models.RankHistory.rank,
         )
-        .filter(models.RankHistory.recorded_at <= target_date)
-        .group_by(models.RankHistory.track_id)
-        .subquery()
+        .where(models.RankHistory.recorded_at < compacted_before)
+        .order_by(models.RankHistory.track_id, models.RankHistory.recorded_at)
     )
 
-    # Join with rank_history to get the actual rank values
-    tracks_with_ranks = (
-        db.query(models.Track, models.RankHistory.rank)
-        .join(subquery, models.Track.id == subquery.c.track_id)
-        .join(
-            models.RankHistory,
-            and_(
-                models.RankHistory.track_id == subquery.c.track_id,
-                models.RankHistory.recorded_at == subquery.c.latest_date,
+    folded = 0
+    for stats in _replay_chart_history(db, history, existing):
+        baseline = existing.get(stats.track_id)
+        if baseline is None:
+            baseline = models.TrackChartStatsBaseline(track_id=stats.track_id)
+            db.add(baseline)
+        baseline.compacted_before = compacted_before
+        for name in CHART_STATS_COLUMNS:
+            setattr(baseline, name, getattr(stats, name))
+        folded += 1
+    db.flush()
+    return folded
+
+
+def get_rank_snapshot_timestamps(db: Session) -> list[datetime]:
+    return [
+        recorded_at
+        for (recorded_at,) in db.query(models.RankSnapshot.recorded_at).order_by(
+            models.RankSnapshot.recorded_at.asc()
+        )
+    ]
+
+
+def count_rank_history_at(db: Session, timestamps: list[datetime]) -> int:
+    """Counts rank history rows recorded at exactly the given timestamps."""
+    total = 0
+    for start in range(0, len(timestamps), IN_CLAUSE_CHUNK_SIZE):
+        chunk = timestamps[start : start + IN_CLAUSE_CHUNK_SIZE]
+        total += (
+            db.query(func.count(models.RankHistory.id))
+            .filter(models.RankHistory.recorded_at.in_(chunk))
+            .scalar()
+            or 0
+        )
+    return total
+
+
+def delete_rank_snapshots(db: Session, timestamps: list[datetime]) -> dict:
+    """Deletes the snapshots and rank rows recorded at ``timestamps``.
+
+    Returns the number of snapshots and rank rows removed. Does not commit.
+    """
+    summary = {"snapshots_removed": 0, "rows_removed": 0}
+    for start in range(0, len(timestamps), IN_CLAUSE_CHUNK_SIZE):
+        chunk = timestamps[start : start + IN_CLAUSE_CHUNK_SIZE]
+        summary["rows_removed"] += _execute_dml(
+            db,
+            delete(models.RankHistory).where(models.RankHistory.recorded_at.in_(chunk)),
+        ).rowcount
+        summary["snapshots_removed"] += _execute_dml(
+            db,
+            delete(models.RankSnapshot).where(
+                models.RankSnapshot.recorded_at.in_(chunk)
             ),
+        ).rowcount
+    return summary
+
+
+def iter_rank_history_batches(
+    db: Session, since: Optional[datetime] = None, batch_size: int = 10000
+) -> Iterator[list[tuple[int, int, datetime]]]:
+    """Streams (track_id, rank, recorded_at) rows recorded after ``since``.
+
+    Rows arrive in recorded_at order in lists of at most ``batch_size``, so a
+    consumer holds one batch at a time.
+    """
+    query = select(
+        models.RankHistory.track_id,
+        models.RankHistory.rank,
+        models.RankHistory.recorded_at,
+    ).order_by(models.RankHistory.recorded_at, models.RankHistory.id)
+    if since is not None:
+        query = query.where(models.RankHistory.recorded_at > since)
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def iter_track_export_batches(
+    db: Session, batch_size: int = 10000
+) -> Iterator[list[tuple]]:
+    """Streams track rows for export, ordered by id.
+
+    Each row is (id, title, title_jp, producer, voicebank, published_date,
+    link, rank, peak_rank, days_on_chart).
+    """
+    query = (
+        select(
+            models.Track.id,
+            models.Track.title,
+            models.Track.title_jp,
+            models.Track.producer,
+            models.Track.voicebank,
+            models.Track.published_date,
+            models.Track.link,
+            models.Track.rank,
+            models.TrackChartStats.peak_rank,
+            models.TrackChartStats.days_on_chart,
         )
-        .filter(models.RankHistory.recorded_at <= target_date)
-        .order_by(models.RankHistory.rank)
-        .all()
+        .outerjoin(
+            models.TrackChartStats, models.TrackChartStats.track_id == models.Track.id
+        )
+        .order_by(models.Track.id)
     )
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
 
-    # Return tracks with historical rank set
-    result = []
-    for track, historical_rank in tracks_with_ranks:
-        track.rank = historical_rank  # Temporarily set rank for display
-        result.append(track)
 
-    return result
+def iter_rating_summary_batches(
+    db: Session, batch_size: int = 10000
+) -> Iterator[list[tuple]]:
+    """Streams per-track rating aggregates without exposing individual users.
+
+    Each row is (track_id, rating_count, average_rating, min_rating,
+    max_rating), ordered by track_id.
+    """
+    query = (
+        select(
+            models.Rating.track_id,
+            func.count(models.Rating.id),
+            func.avg(models.Rating.rating),
+            func.min(models.Rating.rating),
+            func.max(models.Rating.rating),
+        )
+        .group_by(models.Rating.track_id)
+        .order_by(models.Rating.track_id)
+    )
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
 
 
-def get_available_dates(db: Session) -> list[datetime]:
-    """Get list of dates that have historical ranking data."""
-    from sqlalchemy import func
+def get_backfill_checkpoints(
+    db: Session, start_date: date, end_date: date
+) -> dict[date, models.BackfillCheckpoint]:
+    checkpoints = db.query(models.BackfillCheckpoint).filter(
+        models.BackfillCheckpoint.chart_date >= start_date,
+        models.BackfillCheckpoint.chart_date <= end_date,
+    )
+    return {checkpoint.chart_date: checkpoint for checkpoint in checkpoints}
 
-    dates = (
-        db.query(func.date(models.RankHistory.recorded_at).label("date"))
-        .distinct()
-        .order_by(func.date(models.RankHistory.recorded_at).desc())
-        .all()
+
+def save_backfill_checkpoint(
+    db: Session,
+    chart_date: date,
+    status: str,
+    track_count: int = 0,
+    error: Optional[str] = None,
+) -> models.BackfillCheckpoint:
+    """Records the backfill outcome for a date. Does not commit."""
+    checkpoint = (
+        db.query(models.BackfillCheckpoint)
+        .filter(models.BackfillCheckpoint.chart_date == chart_date)
+        .first()
     )
-    return [d[0] for d in dates]
+    if not checkpoint:
+        checkpoint = models.BackfillCheckpoint(chart_date=chart_date)
+        db.add(checkpoint)
+    checkpoint.status = status
+    checkpoint.track_count = track_count
+    checkpoint.error = error
+    return checkpoint
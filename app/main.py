@@ -16,6 +16,7 @@ from app import crud, models
 from app.auth import authenticate_user, get_current_user, get_optional_current_user
 from app.config import (
     is_local_auth_mode,
+    is_vercel,
     should_run_migrations_on_startup,
     should_use_secure_cookies,
 )
@@ -23,11 +24,8 @@ from app.constants import BASE_DIR, STATIC_DIR, set_resource_base_path
 from app.database import SessionLocal
 from app.dependencies import get_db, templates
 from app.routers import auth, pages, playlists, scraping, tracks, vocadb, sitemap
-from app.services.scraping import (
-    initial_scrape_task,
-    set_initial_scrape_in_progress,
-    write_scrape_status,
-)
+from app.services.scrape_worker import start_scrape_worker, stop_scrape_worker
+from app.services.scraping import enqueue_initial_scrape
 from app.utils.view_helpers import time_ago_filter
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
@@ -66,11 +64,12 @@ async def app_lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
         db.close()
 
     if track_count == 0:
-        logging.info("Database is empty. Starting initial scrape.")
-        set_initial_scrape_in_progress(True)
-        write_scrape_status("in_progress")
-        scrape_thread = threading.Thread(target=initial_scrape_task)
-        scrape_thread.start()
+        logging.info("Database is empty. Queueing initial scrape.")
+        enqueue_initial_scrape()
+
+    # Serverless functions cannot keep a thread alive between requests.
+    if not is_vercel():
+        start_scrape_worker()
 
     if getattr(sys, "frozen", False):
         threading.Timer(1.5, lambda: webbrowser.open("http://localhost:8000")).start()
@@ -78,6 +77,7 @@ async def app_lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     print("--- Application startup complete. ---")
     yield
     print("--- Application shutting down. ---")
+    stop_scrape_worker()
 
 
 app = FastAPI(lifespan=app_lifespan)
@@ -3,13 +3,18 @@ import datetime
 from sqlalchemy import (
     Boolean,
     Column,
+    Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
+    LargeBinary,
     String,
     Table,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -57,9 +62,13 @@ class Track(Base):
     voicebanks: Mapped[list["Voicebank"]] = relationship(
         "Voicebank", secondary=track_voicebanks, back_populates="tracks"
     )
+    chart_stats: Mapped["TrackChartStats | None"] = relationship(
+        "TrackChartStats", uselist=False, viewonly=True
+    )
 
     def to_dict(self) -> dict:
         """Returns a dictionary representation of the track for JSON serialization."""
+        stats = self.chart_stats
         return {
             "id": str(self.id),  # Ensure ID is a string for JS consistency
             "title": self.title,
@@ -72,6 +81,10 @@ class Track(Base):
             "imageUrl": self.image_url,
             "rank": self.rank,
             "rank_change": getattr(self, "rank_change", 0),
+            "peak_rank": stats.peak_rank if stats else None,
+            "debut_date": stats.debut_at.strftime("%Y-%m-%d") if stats else None,
+            "days_on_chart": stats.days_on_chart if stats else 0,
+            "longest_streak": stats.longest_streak if stats else 0,
         }
 
 
@@ -97,6 +110,38 @@ class Rating(Base):
     user: Mapped["User"] = relationship("User")  # New
 
 
+class UserEntityAffinity(Base):
+    """Running sum and count of one user's ratings per producer or voicebank.
+
+    Kept in step with ``ratings`` by the rating CRUD functions so statistics
+    and recommendations can read per-entity averages without a join.
+    """
+
+    __tablename__ = "user_entity_affinity"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    entity_type: Mapped[str] = mapped_column(
+        String, primary_key=True
+    )  # "producer" or "voicebank"
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rating_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TrackNeighbor(Base):
+    """Precomputed item-item similarity: the top co-rated neighbours of a track.
+
+    Rebuilt wholesale by the offline job in ``app.services.track_neighbors``.
+    """
+
+    __tablename__ = "track_neighbors"
+
+    track_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"), primary_key=True)
+    neighbor_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"), primary_key=True)
+    similarity: Mapped[float] = mapped_column(Float)
+    co_ratings: Mapped[int] = mapped_column(Integer)
+
+
 class UpdateLog(Base):
     __tablename__ = "update_logs"
 
@@ -106,23 +151,173 @@ class UpdateLog(Base):
     )
 
 
+class ScrapeJob(Base):
+    __tablename__ = "scrape_jobs"
+    __table_args__ = (
+        # At most one active job per kind, even when two callers enqueue at once.
+        Index(
+            "uq_scrape_jobs_active_kind",
+            "kind",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'in_progress')"),
+            sqlite_where=text("status IN ('queued', 'in_progress')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String)  # "initial" or "update"
+    # "queued", "in_progress", "completed", "no_changes" or "error"
+    status: Mapped[str] = mapped_column(String, index=True, default="queued")
+    phase: Mapped[str | None] = mapped_column(String, nullable=True)
+    page: Mapped[int] = mapped_column(Integer, default=0)
+    total_pages: Mapped[int] = mapped_column(Integer, default=6)
+    stats: Mapped[dict] = mapped_column(JSON, default=dict)  # counts and timings
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    started_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+    heartbeat_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+
+    def to_dict(self) -> dict:
+        """Returns a JSON-safe representation of the job and its progress."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "phase": self.phase,
+            "page": self.page,
+            "total_pages": self.total_pages,
+            "stats": self.stats or {},
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ScrapeLease(Base):
+    """A named exclusive lease; only the holder may run scrape jobs."""
+
+    __tablename__ = "scrape_leases"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    holder: Mapped[str | None] = mapped_column(String, nullable=True)
+    expires_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+
+
 class RankHistory(Base):
     __tablename__ = "rank_history"
+    __table_args__ = (
+        # Covers per-track history reads without touching the table.
+        Index(
+            "ix_rank_history_track_id_recorded_at", "track_id", "recorded_at", "rank"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    track_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"), index=True)
+    # Indexed through ix_rank_history_track_id_recorded_at.
+    track_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"))
     rank: Mapped[int] = mapped_column(Integer, index=True)
     recorded_at: Mapped[datetime.datetime] = mapped_column(
         DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
         index=True,
     )
 
     track: Mapped["Track"] = relationship("Track")
 
 
+class RankSnapshot(Base):
+    """One row per chart snapshot with every (track_id, rank) pair packed together.
+
+    See ``app.utils.rank_snapshots`` for the blob format.
+    """
+
+    __tablename__ = "rank_snapshots"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    recorded_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, unique=True, index=True
+    )
+    track_count: Mapped[int] = mapped_column(Integer, default=0)
+    ranks: Mapped[bytes] = mapped_column(LargeBinary)
+
+
+class TrackChartStats(Base):
+    """Per-track chart statistics, updated incrementally as snapshots arrive.
+
+    Streaks count consecutive calendar days with the track in a snapshot.
+    """
+
+    __tablename__ = "track_chart_stats"
+
+    track_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"), primary_key=True)
+    peak_rank: Mapped[int] = mapped_column(Integer, index=True)
+    debut_at: Mapped[datetime.datetime] = mapped_column(DateTime, index=True)
+    last_seen_at: Mapped[datetime.datetime] = mapped_column(DateTime)
+    days_on_chart: Mapped[int] = mapped_column(Integer, default=1, index=True)
+    # Streak that ends at last_seen_at; kept so the next snapshot can extend it.
+    current_streak: Mapped[int] = mapped_column(Integer, default=1)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=1, index=True)
+
+
+class TrackChartStatsBaseline(Base):
+    """Chart statistics for rank history folded away by retention compaction.
+
+    Rebuilds start from this row and replay only history recorded at or after
+    ``compacted_before``; the weekly snapshots kept before it are already
+    counted here.
+    """
+
+    __tablename__ = "track_chart_stats_baseline"
+
+    track_id: Mapped[int] = mapped_column(ForeignKey("tracks.id"), primary_key=True)
+    compacted_before: Mapped[datetime.datetime] = mapped_column(DateTime)
+    peak_rank: Mapped[int] = mapped_column(Integer)
+    debut_at: Mapped[datetime.datetime] = mapped_column(DateTime)
+    last_seen_at: Mapped[datetime.datetime] = mapped_column(DateTime)
+    days_on_chart: Mapped[int] = mapped_column(Integer)
+    current_streak: Mapped[int] = mapped_column(Integer)
+    longest_streak: Mapped[int] = mapped_column(Integer)
+
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    chart_date: Mapped[datetime.date] = mapped_column(Date, unique=True, index=True)
+    status: Mapped[str] = mapped_column(String)  # "completed", "partial", "error"
+    track_count: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        onupdate=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
 class PlaylistTrack(Base):
     __tablename__ = "playlist_track_association"
+    __table_args__ = (
+        # Ordered playlist reads, last-position lookups and neighbour lookups
+        # when moving a track.
+        Index(
+            "ix_playlist_track_association_playlist_id_position",
+            "playlist_id",
+            "position",
+        ),
+    )
 
     playlist_id: Mapped[int] = mapped_column(
         ForeignKey("playlists.id"), primary_key=True
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from babel.support import Translations
@@ -10,17 +10,23 @@ from sqlalchemy.orm import Session
 from app import crud, models
 from app.auth import get_optional_current_user
 from app.config import get_public_base_url
-from app.constants import VALID_PAGE_LIMITS
+from app.constants import (
+    HISTORICAL_PAGE_MAX_AGE_SECONDS,
+    PUBLIC_PLAYLIST_PAGE_SIZE,
+    RECOMMENDATION_MODES,
+    VALID_PAGE_LIMITS,
+)
 from app.dependencies import (
     get_db,
     get_slim_mode,
     get_translations,
     locale_template_response,
 )
+from app.services.charts import chart_diff
+from app.services.playlist_view import playlist_view
 from app.services.scraping import is_initial_scrape_in_progress
 from app.utils.view_helpers import (
     build_limit_offset,
-    collect_producers_and_voicebanks,
     get_user_filter_options,
     serialize_tracks,
 )
@@ -185,18 +191,24 @@ async def view_playlists_page(
     db: Session = Depends(get_db),
     current_user: Optional[models.User] = Depends(get_optional_current_user),
     translations: Translations = Depends(get_translations),
+    after: Optional[int] = None,
 ):
+    directory = None
     if current_user:
         playlists = crud.get_playlists(db, user_id=current_user.id)
     else:
-        # Show all public playlists for guests
-        playlists = db.query(models.Playlist).filter(models.Playlist.is_public).all()
+        # Guests browse the public playlist directory, one page at a time.
+        directory = crud.get_public_playlist_page(
+            db, after_id=after, limit=PUBLIC_PLAYLIST_PAGE_SIZE
+        )
+        playlists = directory["playlists"]
 
     context = {
         "request": request,
         "current_user": current_user,
         "_": translations.gettext,
         "playlists": playlists,
+        "directory": directory,
     }
     return await _render_page("playlists.html", request, translations, context)
 
@@ -217,7 +229,7 @@ async def view_playlist_detail_page(
     translations: Translations = Depends(get_translations),
 ):
     locale = _get_locale(translations)
-    db_playlist = crud.get_playlist(db, playlist_id)
+    db_playlist = crud.get_playlist(db, playlist_id, with_tracks=False)
     if not db_playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
 
@@ -228,36 +240,17 @@ async def view_playlist_detail_page(
             status_code=403, detail="Not authorized to view this playlist"
         )
 
-    filters = {
-        "title_filter": title_filter,
-        "producer_filter": producer_filter,
-        "voicebank_filter": voicebank_filter,
-    }
-
-    total_tracks = crud.get_playlist_tracks_count(
-        db,
-        playlist_id=playlist_id,
-        user_id=db_playlist.user_id,
-        locale=locale,
-        **filters,
-    )
-    limit_val, total_pages, skip = build_limit_offset(limit, total_tracks, page)
-
-    tracks_in_playlist = crud.get_playlist_tracks_filtered(
+    view = playlist_view(
         db,
-        playlist_id=playlist_id,
-        user_id=db_playlist.user_id,
-        skip=skip,
-        limit=limit_val,
+        db_playlist,
+        page=page,
+        limit=limit,
+        title_filter=title_filter,
+        producer_filter=producer_filter,
+        voicebank_filter=voicebank_filter,
         sort_by=sort_by,
         sort_dir=sort_dir,
         locale=locale,
-        **filters,
-    )
-
-    all_playlist_tracks = [pt.track for pt in db_playlist.playlist_tracks if pt.track]
-    all_producers, all_voicebanks = collect_producers_and_voicebanks(
-        all_playlist_tracks, locale
     )
 
     context = {
@@ -265,17 +258,12 @@ async def view_playlist_detail_page(
         "current_user": current_user,
         "_": translations.gettext,
         "playlist": db_playlist,
-        "tracks": tracks_in_playlist,
-        "tracks_json": serialize_tracks(tracks_in_playlist),
-        "all_producers": all_producers,
-        "all_voicebanks": all_voicebanks,
-        "filters": filters,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "total_tracks": total_tracks,
-        },
+        "tracks": view["tracks"],
+        "tracks_json": serialize_tracks(view["tracks"]),
+        "all_producers": view["all_producers"],
+        "all_voicebanks": view["all_voicebanks"],
+        "filters": view["filters"],
+        "pagination": view["pagination"],
     }
 
     return await _render_page("playlist_view.html", request, translations, context)
@@ -299,14 +287,13 @@ async def edit_playlist_page(
             status_code=403, detail="Not authorized to edit this playlist"
         )
 
-    all_tracks = crud.get_tracks(db, limit=10000, sort_by="title", rank_filter="all")
+    # The "Available Tracks" picker pages through /api/tracks/search, so only
+    # the playlist's own tracks are rendered here.
     context = {
         "request": request,
         "current_user": user,
         "_": translations.gettext,
         "playlist": db_playlist,
-        "all_tracks": all_tracks,
-        "tracks_json": serialize_tracks(all_tracks),
     }
 
     return await _render_page("playlist_edit.html", request, translations, context)
@@ -379,7 +366,7 @@ async def read_root(
 ):
     user_id = current_user.id if current_user else None
     locale = _get_locale(translations)
-    if is_initial_scrape_in_progress():
+    if is_initial_scrape_in_progress(db):
         return await _render_page(
             "scraping.html",
             request,
@@ -540,6 +527,7 @@ async def read_recommendations(
     db: Session = Depends(get_db),
     current_user: Optional[models.User] = Depends(get_optional_current_user),
     recent_bias: str = "off",
+    mode: str = "affinity",
     translations: Translations = Depends(get_translations),
 ):
     if current_user is None:
@@ -549,15 +537,21 @@ async def read_recommendations(
     recent_bias = recent_bias.lower()
     if recent_bias not in {"off", "light", "strong"}:
         recent_bias = "off"
+    mode = mode.lower()
+    if mode not in RECOMMENDATION_MODES:
+        mode = RECOMMENDATION_MODES[0]
 
     locale = _get_locale(translations)
     stats = crud.get_rating_statistics(db, user_id=user.id, locale=locale)
-    recommended_tracks = crud.get_recommended_tracks(
-        db,
-        user_id=user.id,
-        locale=locale,
-        recent_bias=recent_bias,
-    )
+    if mode == "collaborative":
+        recommended_tracks = crud.get_collaborative_recommendations(db, user.id)
+    else:
+        recommended_tracks = crud.get_recommended_tracks(
+            db,
+            user_id=user.id,
+            locale=locale,
+            recent_bias=recent_bias,
+        )
 
     context = {
         "request": request,
@@ -567,6 +561,7 @@ async def read_recommendations(
         "recommended_tracks": recommended_tracks,
         "tracks_json": serialize_tracks(recommended_tracks),
         "recent_bias": recent_bias,
+        "mode": mode,
     }
 
     return await _render_page("recommendations.html", request, translations, context)
@@ -791,53 +786,52 @@ async def view_user_profile(
     _ = translations.gettext
     locale = _get_locale(translations)
 
-    user = db.query(models.User).filter(models.User.username.ilike(username)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if not user.is_profile_public:
-        # If user profile is private, allow access ONLY if the logged-in user is the owner
-        if current_user is None or current_user.id != user.id:
-            raise HTTPException(status_code=403, detail="This profile is private")
-
-    # Get stats
-    stats = crud.get_rating_statistics(db, user_id=user.id, locale=locale)
-
-    # Get public playlists
-    playlists = (
-        db.query(models.Playlist)
-        .filter(models.Playlist.user_id == user.id, models.Playlist.is_public)
-        .all()
-    )
-
-    # Get top rated tracks (rating >= 8)
-    top_tracks = (
-        db.query(models.Track)
-        .join(models.Rating)
-        .filter(models.Rating.user_id == user.id, models.Rating.rating >= 8)
-        .order_by(models.Rating.rating.desc(), models.Rating.updated_at.desc())
-        .limit(20)
-        .all()
-    )
+    view = crud.get_cached_profile_view(db, username, locale)
+    if view is None:
+        user = crud.get_user_by_username(db, username)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        if not user.is_profile_public:
+            # If user profile is private, allow access ONLY if the logged-in user is the owner
+            if current_user is None or current_user.id != user.id:
+                raise HTTPException(status_code=403, detail="This profile is private")
+
+        view = crud.build_profile_view(db, user, locale=locale)
+
+    # The page embeds the viewer's menu, so the tag covers viewer and locale too.
+    viewer_id = current_user.id if current_user else 0
+    etag = f'W/"{view["version"]}-{locale}-{viewer_id}"'
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"{'private' if current_user else 'public'}, no-cache",
+        "Vary": "Cookie, Accept-Language",
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cache_headers)
 
+    profile_user = view["user"]
     context = {
         "request": request,
         "current_user": current_user,
         "_": _,
-        "profile_user": user,
-        "stats": stats,
-        "playlists": playlists,
-        "tracks": top_tracks,
-        "title": _("%(username)s's Vocaloid Profile") % {"username": user.username},
+        "profile_user": profile_user,
+        "stats": view["stats"],
+        "playlists": view["playlists"],
+        "tracks": view["tracks"],
+        "title": _("%(username)s's Vocaloid Profile")
+        % {"username": profile_user["username"]},
         "meta_title": _("%(username)s's Vocaloid Profile - Vocaloid Rate")
-        % {"username": user.username},
+        % {"username": profile_user["username"]},
         "meta_description": _(
             "Explore %(username)s's favorite Vocaloid producers, voicebanks, ratings, and public playlists on Vocaloid Rate."
         )
-        % {"username": user.username},
+        % {"username": profile_user["username"]},
     }
 
-    return await _render_page("user_profile.html", request, translations, context)
+    response = await _render_page("user_profile.html", request, translations, context)
+    response.headers.update(cache_headers)
+    return response
 
 
 @router.get("/history/{date}")
@@ -849,8 +843,6 @@ async def view_historical_ranking(
     translations: Translations = Depends(get_translations),
 ):
     """View historical ranking for a specific date."""
-    from datetime import datetime
-
     _ = translations.gettext
 
     try:
@@ -860,8 +852,26 @@ async def view_historical_ranking(
             status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
         )
 
-    # Get tracks as of that date
+    # Get tracks as of that date, labelled with their move since the day before
     tracks = crud.get_tracks_as_of(db, target_date)
+    diff = chart_diff(
+        db, target_date - timedelta(days=1), target_date, include_unchanged=True
+    )
+    if diff:
+        changes = {item["track_id"]: ("new", 0) for item in diff["entered"]}
+        changes.update(
+            (item["track_id"], ("up" if item["change"] > 0 else "down", item["change"]))
+            for item in diff["moved"]
+        )
+        changes.update((item["track_id"], ("same", 0)) for item in diff["unchanged"])
+        tracks = [
+            {
+                **track,
+                "rank_change_label": changes.get(track["id"], ("", 0))[0],
+                "rank_change": changes.get(track["id"], ("", 0))[1],
+            }
+            for track in tracks
+        ]
 
     # Get available dates for the date picker
     available_dates = crud.get_available_dates(db)
@@ -877,4 +887,13 @@ async def view_historical_ranking(
         "is_historical": True,
     }
 
-    return await _render_page("historical.html", request, translations, context)
+    response = await _render_page("historical.html", request, translations, context)
+    if target_date.date() < datetime.now(timezone.utc).date():
+        # Past charts no longer change. The page embeds the user menu, so only
+        # guest responses may be stored by shared caches.
+        visibility = "private" if current_user else "public"
+        response.headers["Cache-Control"] = (
+            f"{visibility}, max-age={HISTORICAL_PAGE_MAX_AGE_SECONDS}"
+        )
+        response.headers["Vary"] = "Cookie, Accept-Language"
+    return response
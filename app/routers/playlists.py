@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.auth import get_current_user
+from app.constants import PUBLIC_PLAYLIST_PAGE_SIZE
 from app.dependencies import get_db
 from app.utils.uploads import read_upload_with_size_limit
 
@@ -27,6 +28,18 @@ def get_user_playlists(
     return crud.get_playlists(db, user_id=current_user.id)
 
 
+@router.get("/api/playlists/public")
+def get_public_playlists(after: Optional[int] = None, db: Session = Depends(get_db)):
+    """Page through public playlists, newest first (``?after=<last id>``).
+
+    Each entry includes its owner, track count and cover image; pass the
+    returned ``next_cursor`` as ``after`` for the following page.
+    """
+    return crud.get_public_playlist_page(
+        db, after_id=after, limit=PUBLIC_PLAYLIST_PAGE_SIZE
+    )
+
+
 @router.post("/api/playlists", response_model=schemas.PlaylistSimple)
 def create_new_playlist(
     playlist: schemas.PlaylistCreate,
@@ -69,13 +82,27 @@ def remove_track_from_a_playlist(
 @router.post("/api/playlists/{playlist_id}/reorder")
 def reorder_a_playlist(
     playlist_id: int,
-    track_ids: list[int],
+    order: list[int] | schemas.PlaylistTrackMove,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    crud.reorder_playlist(
-        db, playlist_id=playlist_id, track_ids=track_ids, user_id=current_user.id
-    )
+    """Accepts the full track id order, or a single {track_id, index} move."""
+    if isinstance(order, schemas.PlaylistTrackMove):
+        moved = crud.move_playlist_track(
+            db,
+            playlist_id=playlist_id,
+            track_id=order.track_id,
+            index=order.index,
+            user_id=current_user.id,
+        )
+        if not moved:
+            raise HTTPException(
+                status_code=404, detail="Playlist or track not found or not owned"
+            )
+    else:
+        crud.reorder_playlist(
+            db, playlist_id=playlist_id, track_ids=order, user_id=current_user.id
+        )
     return Response(status_code=200, content="Playlist reordered successfully")
 
 
@@ -5,14 +5,14 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 
 load_dotenv()
 
-from app import models  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud, models  # noqa: E402
 from app.auth import get_current_user  # noqa: E402
 from app.config import is_local_mode  # noqa: E402
-from app.services.scraping import (  # noqa: E402
-    read_scrape_status,
-    scrape_and_populate_task,
-    write_scrape_status,
-)
+from app.dependencies import get_db  # noqa: E402
+from app.services.scrape_worker import dispatch_scrape_jobs  # noqa: E402
+from app.services.scraping import read_scrape_status  # noqa: E402
 from scripts.bot_daily_top import run_bsky_bot  # noqa: E402
 
 router = APIRouter(tags=["Scraping"])
@@ -21,6 +21,7 @@ router = APIRouter(tags=["Scraping"])
 @router.post("/scrape")
 def scrape_and_populate(
     background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if not (current_user.is_admin or is_local_mode()):
@@ -28,13 +29,19 @@ def scrape_and_populate(
             status_code=403, detail="Only admins can trigger scraping in cloud mode."
         )
 
-    write_scrape_status("idle")
-    background_tasks.add_task(scrape_and_populate_task)
-    return {"message": "Scraping has been started in the background."}
+    job, created = crud.enqueue_scrape_job(db, "update")
+    dispatch_scrape_jobs(background_tasks)
+    if not created:
+        return {"message": "A scrape is already in progress.", "job_id": job.id}
+    return {"message": "Scraping has been started in the background.", "job_id": job.id}
 
 
 @router.get("/api/cron/scrape")
-def cron_scrape(request: Request, background_tasks: BackgroundTasks):
+def cron_scrape(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     auth_header = request.headers.get("Authorization")
     cron_secret = os.environ.get("CRON_SECRET")
 
@@ -47,8 +54,9 @@ def cron_scrape(request: Request, background_tasks: BackgroundTasks):
     if auth_header != f"Bearer {cron_secret}":
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    background_tasks.add_task(scrape_and_populate_task)
-    return {"message": "Scraping task has been queued."}
+    job, _ = crud.enqueue_scrape_job(db, "update")
+    dispatch_scrape_jobs(background_tasks)
+    return {"message": "Scraping task has been queued.", "job_id": job.id}
 
 
 @router.get("/api/cron/bot-bsky")
@@ -70,5 +78,5 @@ def cron_bot_bsky(request: Request, background_tasks: BackgroundTasks):
 
 
 @router.get("/api/scrape-status")
-def get_scrape_status():
-    return {"status": read_scrape_status()}
+def get_scrape_status(db: Session = Depends(get_db)):
+    return read_scrape_status(db)
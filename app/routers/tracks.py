@@ -10,6 +10,7 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
     Request,
     Response,
     UploadFile,
@@ -20,8 +21,16 @@ from sqlalchemy.orm import Session, contains_eager
 
 from app import crud, models
 from app.auth import get_current_user, get_optional_current_user
-from app.constants import get_resource_base_path
+from app.constants import (
+    PLAYLIST_MEMBERSHIP_BATCH_LIMIT,
+    RANK_HISTORY_BATCH_LIMIT,
+    TRACK_SEARCH_MAX_LIMIT,
+    TRACK_SEARCH_PAGE_SIZE,
+    get_resource_base_path,
+)
 from app.dependencies import get_db, get_locale, get_translations
+from app.services.charts import chart_diff
+from app.services.playlist_view import playlist_view
 from app.utils.uploads import read_upload_with_size_limit
 from app.utils.view_helpers import (
     build_limit_offset,
@@ -160,7 +169,7 @@ def get_playlist_tracks_partial(
     sort_dir: str = "asc",
     translations: Translations = Depends(get_translations),
 ):
-    db_playlist = crud.get_playlist(db, playlist_id)
+    db_playlist = crud.get_playlist(db, playlist_id, with_tracks=False)
     if not db_playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
 
@@ -172,42 +181,25 @@ def get_playlist_tracks_partial(
         )
 
     locale = translations.info()["language"]
-    total_tracks = crud.get_playlist_tracks_count(
+    view = playlist_view(
         db,
-        playlist_id=playlist_id,
-        user_id=db_playlist.user_id,
-        title_filter=title_filter,
-        producer_filter=producer_filter,
-        voicebank_filter=voicebank_filter,
-        locale=locale,
-    )
-
-    limit_val, total_pages, skip = build_limit_offset(limit, total_tracks, page)
-
-    tracks = crud.get_playlist_tracks_filtered(
-        db,
-        playlist_id=playlist_id,
-        user_id=db_playlist.user_id,
-        skip=skip,
-        limit=limit_val,
+        db_playlist,
+        page=page,
+        limit=limit,
         title_filter=title_filter,
         producer_filter=producer_filter,
         voicebank_filter=voicebank_filter,
         sort_by=sort_by,
         sort_dir=sort_dir,
         locale=locale,
+        include_facets=False,
     )
     return build_tracks_partial_response(
         request=request,
         translations=translations,
-        tracks=tracks,
+        tracks=view["tracks"],
         locale=locale,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "total_tracks": total_tracks,
-        },
+        pagination=view["pagination"],
         current_user=current_user,
     )
 
@@ -298,40 +290,12 @@ async def restore_ratings(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON file.")
 
-    created_count = 0
-    updated_count = 0
-
-    for item in backup_data:
-        track = crud.get_track_by_link(db, item["link"])
-        if not track:
-            track_data = {
-                "link": item["link"],
-                "title": item["title"],
-                "producer": item["producer"],
-                "voicebank": item["voicebank"],
-                "published_date": datetime.fromisoformat(item["published_date"]),
-                "title_jp": item.get("title_jp"),
-                "producer_jp": item.get("producer_jp"),
-                "voicebank_jp": item.get("voicebank_jp"),
-                "image_url": item.get("image_url"),
-                "rank": None,
-            }
-            track = crud.create_track(db, track_data)
-            created_count += 1
-        else:
-            updated_count += 1
-
-        if item.get("rating") is not None:
-            try:
-                crud.create_rating(
-                    db,
-                    track.id,
-                    user_id=current_user.id,
-                    rating=item["rating"],
-                    notes=item.get("notes"),
-                )
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        created_count, updated_count = crud.import_ratings(
+            db, user_id=current_user.id, data=backup_data
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
     return {"created": created_count, "updated": updated_count}
 
@@ -377,6 +341,68 @@ def rate_track(
     return Response(status_code=204)
 
 
+@router.get("/api/tracks/rank-history", tags=["Data"])
+def get_tracks_rank_history(ids: str, db: Session = Depends(get_db)):
+    """Return rank series for several tracks (``?ids=1,2,3``) in one response.
+
+    Series are columnar and aligned to one shared ``dates`` list so a whole
+    chart page of sparklines can render from a single request.
+    """
+    try:
+        track_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers.")
+    if len(track_ids) > RANK_HISTORY_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {RANK_HISTORY_BATCH_LIMIT} track ids are allowed.",
+        )
+    return crud.get_tracks_rank_history(db, track_ids)
+
+
+@router.get("/api/charts/diff", tags=["Data"])
+def get_chart_diff(
+    since: str = Query(alias="from"),
+    until: Optional[str] = Query(default=None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """Compare two charts (``?from=YYYY-MM-DD&to=YYYY-MM-DD``).
+
+    Without ``to`` the chart is compared against the current ranking.
+    """
+    try:
+        since_date = datetime.strptime(since, "%Y-%m-%d")
+        until_date = datetime.strptime(until, "%Y-%m-%d") if until else None
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
+        )
+    diff = chart_diff(db, since_date, until_date)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="No chart recorded for that date")
+    return diff
+
+
+@router.get("/api/tracks/search", tags=["Data"])
+def search_tracks(
+    q: str = "",
+    after: Optional[int] = None,
+    limit: int = TRACK_SEARCH_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    """Search tracks by title or producer (``?q=miku&after=123``).
+
+    Feeds the playlist editor's track picker one page at a time; pass the
+    returned ``next_cursor`` as ``after`` to fetch the following page.
+    """
+    if not 1 <= limit <= TRACK_SEARCH_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be between 1 and {TRACK_SEARCH_MAX_LIMIT}.",
+        )
+    return crud.search_tracks(db, q, after_id=after, limit=limit)
+
+
 @router.get("/api/tracks/{track_id}/rank-history", tags=["Data"])
 def get_track_rank_history(
     track_id: int,
@@ -396,6 +422,29 @@ def get_track_rank_history(
     }
 
 
+@router.get("/api/tracks/playlist-membership", tags=["Data"])
+def get_tracks_playlist_membership(
+    ids: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Return playlist membership for several tracks (``?ids=1,2,3``) at once.
+
+    ``playlists`` lists the user's playlists; ``membership`` maps each track
+    id to a hex bitmap whose bit ``i`` marks membership of ``playlists[i]``.
+    """
+    try:
+        track_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers.")
+    if len(track_ids) > PLAYLIST_MEMBERSHIP_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {PLAYLIST_MEMBERSHIP_BATCH_LIMIT} track ids are allowed.",
+        )
+    return crud.get_playlist_membership_bitmaps(db, current_user.id, track_ids)
+
+
 @router.get("/api/tracks/{track_id}/playlist-status", tags=["Data"])
 def get_track_playlist_status(
     track_id: int,
@@ -463,7 +512,7 @@ def get_playlist_snapshot_for_playlist_endpoint(
     sort_dir: str = "asc",
     translations: Translations = Depends(get_translations),
 ):
-    db_playlist = crud.get_playlist(db, playlist_id)
+    db_playlist = crud.get_playlist(db, playlist_id, with_tracks=False)
     if not db_playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
 
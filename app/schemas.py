@@ -47,6 +47,13 @@ class PlaylistSimple(PlaylistBase):
     id: int
 
 
+class PlaylistTrackMove(BaseModel):
+    """Moves one playlist track to a new zero-based index."""
+
+    track_id: int
+    index: int
+
+
 class PlaylistTrackDetail(Track):
     position: int
 
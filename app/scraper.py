@@ -7,10 +7,15 @@ import requests
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from app.config import get_vocaloard_base_url
+
 logger = logging.getLogger(__name__)
 
-BASE_URL_EN = "https://vocaloard.injpok.tokyo/en/"
-BASE_URL_JP = "https://vocaloard.injpok.tokyo/"
+
+def get_base_urls() -> tuple[str, str]:
+    """Returns the English and Japanese ranking URLs for the configured source."""
+    base_url = get_vocaloard_base_url()
+    return f"{base_url}/en/", f"{base_url}/"
 
 
 def _fetch_page(url: str) -> requests.Response:
@@ -29,16 +34,17 @@ def _scrape_single_page(page_num: int, date: Optional[str] = None) -> list[dict]
         date: Optional date string (YYYY-MM-DD) to fetch historical data
     """
     tracks_on_page = []
+    base_url_en, base_url_jp = get_base_urls()
 
     # Build URL with optional date parameter
     if date:
         # Historical data URL format - use &g= for page number
-        url_en = f"{BASE_URL_EN}?d={date}&g={page_num}"
-        url_jp = f"{BASE_URL_JP}?d={date}&g={page_num}"
+        url_en = f"{base_url_en}?d={date}&g={page_num}"
+        url_jp = f"{base_url_jp}?d={date}&g={page_num}"
     else:
         # Current ranking URL format
-        url_en = f"{BASE_URL_EN}?g={page_num}"
-        url_jp = f"{BASE_URL_JP}?g={page_num}"
+        url_en = f"{base_url_en}?g={page_num}"
+        url_jp = f"{base_url_jp}?g={page_num}"
 
     logger.info(f"Fetching page {page_num} in parallel.")
     try:
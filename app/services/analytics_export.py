@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import SessionLocal
+
+EXPORT_BATCH_SIZE = 10000
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+MANIFEST_NAME = "manifest.json"
+
+
+def _get_db_session() -> Session:
+    return SessionLocal()
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "Analytics export needs pyarrow; install the `analytics` dependency "
+            "group with `uv sync --group analytics`."
+        ) from exc
+    return pyarrow
+
+
+def _schemas(pa) -> dict:
+    return {
+        "rank_history": pa.schema(
+            [
+                ("track_id", pa.int64()),
+                ("rank", pa.int32()),
+                ("recorded_at", pa.timestamp("us")),
+            ]
+        ),
+        "tracks": pa.schema(
+            [
+                ("id", pa.int64()),
+                ("title", pa.string()),
+                ("title_jp", pa.string()),
+                ("producer", pa.string()),
+                ("voicebank", pa.string()),
+                ("published_date", pa.timestamp("us")),
+                ("link", pa.string()),
+                ("rank", pa.int32()),
+                ("peak_rank", pa.int32()),
+                ("days_on_chart", pa.int32()),
+            ]
+        ),
+        "rating_summary": pa.schema(
+            [
+                ("track_id", pa.int64()),
+                ("rating_count", pa.int64()),
+                ("average_rating", pa.float64()),
+                ("min_rating", pa.float64()),
+                ("max_rating", pa.float64()),
+            ]
+        ),
+    }
+
+
+def read_manifest(output_dir: Path) -> dict:
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(output_dir: Path, manifest: dict) -> None:
+    path = Path(output_dir) / MANIFEST_NAME
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _write_batches(
+    pa, path: Path, schema, batches: Iterator[list[tuple]], fmt: str
+) -> tuple[int, Optional[tuple]]:
+    """Writes row batches to ``path`` one record batch at a time.
+
+    Nothing is written when there are no rows. Returns the row count and the
+    last row written, which incremental exports use as their watermark.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    writer = None
+    rows = 0
+    last_row = None
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            columns = [list(column) for column in zip(*batch)]
+            record_batch = pa.record_batch(columns, schema=schema)
+            if writer is None:
+                if fmt == "parquet":
+                    writer = pa.parquet.ParquetWriter(tmp_path, schema)
+                else:
+                    writer = pa.ipc.new_file(tmp_path, schema)
+            if fmt == "parquet":
+                writer.write_batch(record_batch)
+            else:
+                writer.write(record_batch)
+            rows += len(batch)
+            last_row = batch[-1]
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if writer is not None:
+        writer.close()
+        os.replace(tmp_path, path)
+    return rows, last_row
+
+
+def export_analytics(
+    output_dir: Path,
+    fmt: str = "parquet",
+    since: Optional[datetime] = None,
+    full: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> dict:
+    """Exports rank history, tracks and rating aggregates as columnar files.
+
+    Rank history is appended as a new ``rank_history/part-*.<ext>`` file with
+    only the rows recorded after the watermark in ``manifest.json`` (or
+    ``since``); ``full`` ignores the watermark and replaces earlier parts.
+    Backfilled dates older than the watermark need a full export. Tracks and
+    rating aggregates are small and replaced on every run. Rows are streamed
+    in ``batch_size`` chunks.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    pa = _require_pyarrow()
+    extension = EXPORT_FORMATS[fmt]
+    schemas = _schemas(pa)
+
+    output_dir = Path(output_dir)
+    history_dir = output_dir / "rank_history"
+    history_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(output_dir)
+    if since is None and not full and manifest.get("rank_history_watermark"):
+        since = datetime.fromisoformat(manifest["rank_history_watermark"])
+
+    db = _get_db_session()
+    try:
+        part_name = f"part-{crud._utcnow():%Y%m%dT%H%M%S}{extension}"
+        history_rows, last_row = _write_batches(
+            pa,
+            history_dir / part_name,
+            schemas["rank_history"],
+            crud.iter_rank_history_batches(db, since, batch_size),
+            fmt,
+        )
+        track_rows, _ = _write_batches(
+            pa,
+            output_dir / f"tracks{extension}",
+            schemas["tracks"],
+            crud.iter_track_export_batches(db, batch_size),
+            fmt,
+        )
+        rating_rows, _ = _write_batches(
+            pa,
+            output_dir / f"rating_summary{extension}",
+            schemas["rating_summary"],
+            crud.iter_rating_summary_batches(db, batch_size),
+            fmt,
+        )
+    finally:
+        db.close()
+
+    if full:
+        # A full export supersedes every earlier part.
+        for old_part in history_dir.glob(f"part-*{extension}"):
+            if old_part.name != part_name:
+                old_part.unlink()
+    if last_row is not None:
+        manifest["rank_history_watermark"] = last_row[2].isoformat()
+    elif full:
+        manifest.pop("rank_history_watermark", None)
+    manifest["format"] = fmt
+    manifest["exported_at"] = crud._utcnow().isoformat()
+    _write_manifest(output_dir, manifest)
+
+    summary = {
+        "rank_history_rows": history_rows,
+        "rank_history_file": part_name if history_rows else None,
+        "tracks": track_rows,
+        "rating_summaries": rating_rows,
+        "watermark": manifest.get("rank_history_watermark"),
+    }
+    logging.info(
+        "Analytics export: %s rank rows, %s tracks, %s rating summaries.",
+        history_rows,
+        track_rows,
+        rating_rows,
+    )
+    return summary
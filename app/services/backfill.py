@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, scraper
+from app.constants import CHART_PAGE_COUNT, FULL_CHART_SIZE
+from app.database import SessionLocal
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_REQUEST_INTERVAL_SECONDS = 1.0
+
+
+class RateLimiter:
+    """Spaces out calls across threads by at least ``min_interval`` seconds."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _get_db_session() -> Session:
+    return SessionLocal()
+
+
+def _date_range(start_date: date, end_date: date) -> list[date]:
+    return [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+
+
+def _fetch_chart(chart_date: date, limiter: RateLimiter) -> list[dict]:
+    """Fetches every ranking page for a historical date."""
+    tracks: list[dict] = []
+    for page in range(1, CHART_PAGE_COUNT + 1):
+        limiter.wait()
+        page_tracks = scraper._scrape_single_page(page, date=chart_date.isoformat())
+        if not page_tracks:
+            break
+        tracks.extend(page_tracks)
+    return tracks
+
+
+def _store_chart(db: Session, chart_date: date, tracks: list[dict]) -> int:
+    """Writes one historical chart, creating tracks the database has not seen yet."""
+    track_ids = crud.get_track_ids_by_links(db, [t["link"] for t in tracks])
+    # Historical-only tracks are not on the current chart. They are flushed,
+    # not committed, so a failed chart write leaves none of them behind.
+    new_tracks = {
+        t["link"]: {**t, "rank": None} for t in tracks if t["link"] not in track_ids
+    }
+    track_ids.update(crud.create_tracks(db, list(new_tracks.values())))
+
+    ranks = {track_ids[t["link"]]: t["rank"] for t in tracks}
+    return crud.replace_rank_history_for_date(db, chart_date, list(ranks.items()))
+
+
+def _is_complete(db: Session, chart_date: date, checkpoint) -> bool:
+    if checkpoint is not None and checkpoint.status == "completed":
+        return True
+    return crud.count_rank_history_on_date(db, chart_date) >= FULL_CHART_SIZE
+
+
+def run_backfill(
+    start_date: date,
+    end_date: date,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    request_interval: float = DEFAULT_REQUEST_INTERVAL_SECONDS,
+    force: bool = False,
+) -> dict:
+    """Backfills rank history for every date in ``[start_date, end_date]``.
+
+    Dates are fetched concurrently but written one at a time from the calling
+    thread. Each finished date is checkpointed, so an interrupted run resumes
+    where it stopped. Dates with a complete snapshot are skipped unless
+    ``force`` is set.
+    """
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date.")
+
+    summary = {"completed": 0, "partial": 0, "failed": 0, "skipped": 0}
+    db = _get_db_session()
+    try:
+        checkpoints = crud.get_backfill_checkpoints(db, start_date, end_date)
+        pending = []
+        for chart_date in _date_range(start_date, end_date):
+            if not force and _is_complete(db, chart_date, checkpoints.get(chart_date)):
+                summary["skipped"] += 1
+                continue
+            pending.append(chart_date)
+
+        logging.info(
+            "Backfill: %s dates to fetch, %s already complete.",
+            len(pending),
+            summary["skipped"],
+        )
+
+        limiter = RateLimiter(request_interval)
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            futures = {
+                executor.submit(_fetch_chart, chart_date, limiter): chart_date
+                for chart_date in pending
+            }
+            for future in as_completed(futures):
+                chart_date = futures[future]
+                try:
+                    tracks = future.result()
+                    if not tracks:
+                        raise ValueError("No ranking data returned.")
+                    stored = _store_chart(db, chart_date, tracks)
+                    status = "completed" if stored >= FULL_CHART_SIZE else "partial"
+                    crud.save_backfill_checkpoint(db, chart_date, status, stored)
+                    db.commit()
+                    crud.invalidate_rank_snapshot_caches()
+                    summary[status] += 1
+                    logging.info("Backfill: %s stored %s ranks.", chart_date, stored)
+                except Exception as exc:
+                    db.rollback()
+                    crud.save_backfill_checkpoint(
+                        db, chart_date, "error", error=str(exc)
+                    )
+                    db.commit()
+                    summary["failed"] += 1
+                    logging.error("Backfill: %s failed: %s", chart_date, exc)
+    finally:
+        db.close()
+
+    logging.info("Backfill finished: %s", summary)
+    return summary
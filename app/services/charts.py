@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+
+
+def chart_diff(
+    db: Session,
+    since: datetime,
+    until: Optional[datetime] = None,
+    include_unchanged: bool = False,
+) -> Optional[dict]:
+    """Compares the chart as of ``since`` with the chart as of ``until``.
+
+    Both sides resolve to the latest snapshot at or before the given time;
+    ``until=None`` compares against the current chart. Returns ``None`` when
+    no snapshot exists for ``since`` (or ``until``). The snapshot lookups,
+    entries, dropouts and movers all come from a single query; movers are
+    ordered by the size of the move. Unchanged tracks are always counted in
+    ``unchanged_count`` and listed in ``unchanged`` only with
+    ``include_unchanged``.
+    """
+    old_at, new_at, rows = crud.get_rank_diff_rows(db, since, until)
+    if old_at is None or (until is not None and new_at is None):
+        return None
+
+    entered: list[dict] = []
+    dropped: list[dict] = []
+    moved: list[dict] = []
+    unchanged: list[dict] = []
+    unchanged_count = 0
+    for item in rows:
+        if item["status"] == "entered":
+            entered.append(item)
+        elif item["status"] == "dropped":
+            dropped.append(item)
+        elif item["status"] == "same":
+            unchanged_count += 1
+            if include_unchanged:
+                unchanged.append(item)
+        else:
+            item["change"] = item["old_rank"] - item["new_rank"]
+            moved.append(item)
+    moved.sort(key=lambda item: (-abs(item["change"]), item["new_rank"]))
+
+    diff = {
+        "from": old_at.isoformat(),
+        "to": new_at.isoformat() if new_at else None,
+        "entered": entered,
+        "dropped": dropped,
+        "moved": moved,
+        "unchanged_count": unchanged_count,
+    }
+    if include_unchanged:
+        diff["unchanged"] = unchanged
+    return diff
@@ -0,0 +1,81 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.utils.view_helpers import build_limit_offset
+
+
+def playlist_view(
+    db: Session,
+    playlist: models.Playlist,
+    page: int = 1,
+    limit: str = "all",
+    title_filter: Optional[str] = None,
+    producer_filter: Optional[str] = None,
+    voicebank_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_dir: str = "asc",
+    locale: str = "en",
+    include_facets: bool = True,
+) -> dict:
+    """Builds one page of a playlist view: tracks, pagination and facets.
+
+    The page and its filtered total come from a single query; the producer
+    and voicebank filter options are aggregated in SQL over the whole
+    playlist. Neither loads the full track list, so a large public playlist
+    costs the same as a small one per request. ``include_facets=False``
+    skips the facet query for callers that only re-render the table.
+    """
+    if limit == "all":
+        tracks, total_tracks = crud.get_playlist_track_page(
+            db,
+            playlist.id,
+            playlist.user_id,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            locale=locale,
+            title_filter=title_filter,
+            producer_filter=producer_filter,
+            voicebank_filter=voicebank_filter,
+        )
+        _, total_pages, skip = build_limit_offset(limit, total_tracks, page)
+        # Matches the table partials: with "all" only page 1 has tracks.
+        if skip:
+            tracks = []
+    else:
+        page_size = int(limit)
+        tracks, total_tracks = crud.get_playlist_track_page(
+            db,
+            playlist.id,
+            playlist.user_id,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            locale=locale,
+            title_filter=title_filter,
+            producer_filter=producer_filter,
+            voicebank_filter=voicebank_filter,
+        )
+        _, total_pages, _ = build_limit_offset(limit, total_tracks, page)
+
+    view = {
+        "tracks": tracks,
+        "filters": {
+            "title_filter": title_filter,
+            "producer_filter": producer_filter,
+            "voicebank_filter": voicebank_filter,
+        },
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages,
+            "total_tracks": total_tracks,
+        },
+    }
+    if include_facets:
+        view["all_producers"], view["all_voicebanks"] = crud.get_playlist_facets(
+            db, playlist.id, locale
+        )
+    return view
@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.config import get_rank_history_retention_days
+from app.database import SessionLocal
+
+
+def _get_db_session() -> Session:
+    return SessionLocal()
+
+
+def _week_key(recorded_at: datetime) -> tuple[int, int]:
+    iso_year, iso_week, _ = recorded_at.isocalendar()
+    return iso_year, iso_week
+
+
+def select_snapshots_to_drop(
+    timestamps: list[datetime], cutoff: datetime
+) -> list[datetime]:
+    """Picks the snapshots older than ``cutoff`` that weekly downsampling removes.
+
+    The first snapshot of each ISO week is kept, so an as-of lookup for any
+    day in a compacted week resolves to that week's opening chart.
+    """
+    kept_per_week: dict[tuple[int, int], datetime] = {}
+    for recorded_at in timestamps:
+        if recorded_at < cutoff:
+            week = _week_key(recorded_at)
+            kept_per_week[week] = min(kept_per_week.get(week, recorded_at), recorded_at)
+    kept = set(kept_per_week.values())
+    return [ts for ts in timestamps if ts < cutoff and ts not in kept]
+
+
+def compact_rank_history(
+    keep_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+) -> dict:
+    """Downsamples rank history older than ``keep_days`` to one snapshot per week.
+
+    Recent history keeps every snapshot. Rank rows and packed snapshots are
+    removed together, so charts and historical lookups resolve to the kept
+    weekly snapshot. Chart statistics for the compacted span are folded into
+    per-track baselines first, so rebuilding them later loses nothing.
+    Returns the number of snapshots and rows reclaimed.
+    """
+    keep_days = get_rank_history_retention_days() if keep_days is None else keep_days
+    if keep_days < 1:
+        raise ValueError("keep_days must be at least 1.")
+    cutoff = (now or crud._utcnow()) - timedelta(days=keep_days)
+
+    db = _get_db_session()
+    try:
+        timestamps = crud.get_rank_snapshot_timestamps(db)
+        to_drop = select_snapshots_to_drop(timestamps, cutoff)
+        if dry_run:
+            removed = {
+                "snapshots_removed": len(to_drop),
+                "rows_removed": crud.count_rank_history_at(db, to_drop),
+            }
+        else:
+            if to_drop:
+                crud.fold_chart_stats_baseline(db, cutoff)
+            removed = crud.delete_rank_snapshots(db, to_drop)
+            db.commit()
+            crud.invalidate_rank_snapshot_caches()
+    finally:
+        db.close()
+
+    summary = {**removed, "cutoff": cutoff.isoformat(), "dry_run": dry_run}
+    logging.info(
+        "Rank history compaction: %s snapshots, %s rows %s.",
+        summary["snapshots_removed"],
+        summary["rows_removed"],
+        "would be removed" if dry_run else "removed",
+    )
+    return summary
@@ -0,0 +1,133 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import SessionLocal
+from app.services import scraping
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+POLL_INTERVAL_SECONDS = 30
+
+
+def _get_db_session() -> Session:
+    return SessionLocal()
+
+
+def _run_job(job_id: int, kind: str) -> None:
+    handlers = {
+        "initial": scraping.initial_scrape_task,
+        "update": scraping.scrape_and_populate_task,
+    }
+    handler = handlers.get(kind)
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown scrape job kind: {kind}")
+        handler(job_id)
+    except Exception as exc:
+        logging.error("Scrape job %s failed: %s", job_id, exc, exc_info=True)
+        scraping.report_scrape_progress(
+            job_id, status="error", phase=None, error=str(exc)
+        )
+
+
+def process_pending_jobs() -> int:
+    """Runs queued scrape jobs while holding the exclusive scrape lease.
+
+    Returns the number of jobs processed; 0 when another worker holds the lease.
+    """
+    db = _get_db_session()
+    processed = 0
+    try:
+        if not crud.acquire_scrape_lease(db, WORKER_ID):
+            logging.info("Scrape worker: lease is held by another worker.")
+            return 0
+        try:
+            while True:
+                job = crud.claim_next_scrape_job(db, WORKER_ID)
+                if job is None:
+                    break
+                logging.info("Scrape worker: running %s job %s.", job.kind, job.id)
+                _run_job(job.id, job.kind)
+                processed += 1
+                if not crud.acquire_scrape_lease(db, WORKER_ID):
+                    # The lease expired during the job and another worker
+                    # took it; leave the remaining jobs to that worker.
+                    logging.warning("Scrape worker: lost the lease; stopping.")
+                    break
+        finally:
+            crud.release_scrape_lease(db, WORKER_ID)
+    finally:
+        db.close()
+    return processed
+
+
+class ScrapeWorker:
+    """Background thread that drains the scrape job queue."""
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.poll_interval = poll_interval
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="scrape-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def wake(self) -> None:
+        self._wake_event.set()
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                process_pending_jobs()
+            except Exception as exc:
+                logging.error("Scrape worker loop error: %s", exc, exc_info=True)
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+
+worker = ScrapeWorker()
+
+
+def start_scrape_worker() -> None:
+    worker.start()
+
+
+def stop_scrape_worker() -> None:
+    worker.stop()
+
+
+def dispatch_scrape_jobs(background_tasks: Optional[BackgroundTasks] = None) -> None:
+    """Hands queued jobs to the resident worker.
+
+    Serverless deployments have no resident worker, so the queue is drained
+    after the response instead; the lease still keeps runs exclusive.
+    """
+    if worker.running:
+        worker.wake()
+    elif background_tasks is not None:
+        background_tasks.add_task(process_pending_jobs)
@@ -1,69 +1,96 @@
 import logging
-import os
+import time
 from datetime import datetime
+from typing import Optional
 
 from sqlalchemy.orm import Session
 from app import crud, models, scraper
-from app.constants import SCRAPE_STATUS_FILE
+from app.constants import CHART_PAGE_COUNT, FULL_CHART_SIZE
 from app.database import SessionLocal
+from app.services.backfill import run_backfill
 
-initial_scrape_in_progress = False
 
+def _get_db_session() -> Session:
+    return SessionLocal()
 
-def is_initial_scrape_in_progress() -> bool:
-    return initial_scrape_in_progress
 
+def report_scrape_progress(job_id: Optional[int], **fields) -> None:
+    """Persists progress for a scrape job; a no-op for runs without a job."""
+    if job_id is None:
+        return
+    db = _get_db_session()
+    try:
+        crud.update_scrape_job(db, job_id, **fields)
+    except Exception as exc:
+        logging.debug("Could not record scrape progress: %s", exc)
+    finally:
+        db.close()
 
-def set_initial_scrape_in_progress(in_progress: bool) -> None:
-    global initial_scrape_in_progress
-    initial_scrape_in_progress = in_progress
 
+def _metadata_changed(db_track: models.Track, track_data: dict) -> bool:
+    """Whether the scraped data differs from the stored track apart from rank."""
+    for key, value in track_data.items():
+        if key == "rank":
+            continue
+        current = getattr(db_track, key)
+        if isinstance(value, datetime) and isinstance(current, datetime):
+            value, current = value.replace(tzinfo=None), current.replace(tzinfo=None)
+        if current != value:
+            return True
+    return False
 
-def write_scrape_status(status_text: str) -> None:
-    try:
-        status_dir = os.path.dirname(SCRAPE_STATUS_FILE)
-        if status_dir and not os.path.exists(status_dir):
-            try:
-                os.makedirs(status_dir, exist_ok=True)
-            except OSError:
-                pass
-
-        with open(SCRAPE_STATUS_FILE, "w", encoding="utf-8") as file_handle:
-            file_handle.write(status_text)
-    except Exception as exc:
-        logging.debug("Could not write scrape status to file: %s", exc)
 
+def _status_text(job: models.ScrapeJob) -> str:
+    # Keeps the "in_progress:<page>/<total>" strings the frontend polls for.
+    if job.status == "in_progress" and job.page:
+        return f"in_progress:{job.page}/{job.total_pages}"
+    if job.status in crud.SCRAPE_JOB_ACTIVE_STATUSES:
+        return "in_progress"
+    return job.status
 
-def read_scrape_status() -> str:
-    if not os.path.exists(SCRAPE_STATUS_FILE):
-        return "idle"
-    try:
-        with open(SCRAPE_STATUS_FILE, "r", encoding="utf-8") as file_handle:
-            return file_handle.read().strip()
-    except Exception:
-        return "error"
 
+def read_scrape_status(db: Session) -> dict:
+    job = crud.get_latest_scrape_job(db)
+    if job is None:
+        return {"status": "idle", "job": None}
+    return {"status": _status_text(job), "job": job.to_dict()}
 
-def _get_db_session() -> Session:
-    return SessionLocal()
+
+def is_initial_scrape_in_progress(db: Session) -> bool:
+    return crud.get_active_scrape_job(db, kind="initial") is not None
+
+
+def enqueue_initial_scrape() -> None:
+    db = _get_db_session()
+    try:
+        crud.enqueue_scrape_job(db, "initial")
+    finally:
+        db.close()
 
 
-def initial_scrape_task() -> None:
+def initial_scrape_task(job_id: Optional[int] = None) -> str:
     db = _get_db_session()
+    final_status = "completed"
     try:
         logging.info("Initial Scrape: Starting full scrape.")
-        final_status = "completed"
+        error = None
+        stats: dict = {}
         try:
             new_tracks_count = 0
             all_scraped_tracks = []
-            for page in range(1, 7):
-                write_scrape_status(f"in_progress:{page}/6")
+            fetch_started = time.monotonic()
+            for page in range(1, CHART_PAGE_COUNT + 1):
+                report_scrape_progress(job_id, phase="fetching", page=page)
                 all_scraped_tracks.extend(scraper._scrape_single_page(page))
+            stats["fetch_seconds"] = round(time.monotonic() - fetch_started, 2)
+            stats["scraped_tracks"] = len(all_scraped_tracks)
 
             logging.info(
                 "Full scrape finished. Found %s tracks. Adding to database...",
                 len(all_scraped_tracks),
             )
+            report_scrape_progress(job_id, phase="saving", stats=stats)
+            save_started = time.monotonic()
             for track_data in all_scraped_tracks:
                 existing_track = crud.get_track_by_link(db, track_data["link"])
                 if existing_track:
@@ -71,26 +98,33 @@ def initial_scrape_task() -> None:
                 else:
                     crud.create_track(db, track_data)
                     new_tracks_count += 1
+            stats["new_tracks"] = new_tracks_count
+            stats["save_seconds"] = round(time.monotonic() - save_started, 2)
             logging.info("Processed all tracks. Added %s new tracks.", new_tracks_count)
             crud.create_update_log(db)
             logging.info("Update time logged.")
         except Exception as exc:
             final_status = "error"
+            error = str(exc)
             logging.error(
                 "An error occurred in the initial scrape task: %s", exc, exc_info=True
             )
             db.rollback()
         finally:
-            write_scrape_status(final_status)
-            set_initial_scrape_in_progress(False)
+            report_scrape_progress(
+                job_id, status=final_status, phase=None, stats=stats, error=error
+            )
     finally:
         db.close()
+    return final_status
 
 
-def scrape_and_populate_task() -> None:
+def scrape_and_populate_task(job_id: Optional[int] = None) -> str:
     db = _get_db_session()
+    final_status = "completed"
     try:
         logging.info("Smart Scrape: Checking page 1 for changes...")
+        report_scrape_progress(job_id, phase="checking", page=1)
         scraped_page_1 = scraper._scrape_single_page(1)
         if not scraped_page_1:
             raise Exception("Failed to scrape page 1.")
@@ -108,46 +142,48 @@ def scrape_and_populate_task() -> None:
             logging.info(
                 "Smart Scrape: No changes found on page 1. The ranking is already up-to-date."
             )
-            write_scrape_status("no_changes")
-            return
+            final_status = "no_changes"
+            report_scrape_progress(job_id, status=final_status, phase=None)
+            return final_status
 
         logging.info("Smart Scrape: Changes detected! Proceeding with full scrape.")
         # Take a snapshot of current ranks before updating
         logging.info("Taking rank snapshot...")
-        current_top_tracks = (
-            db.query(models.Track).filter(models.Track.rank.isnot(None)).all()
-        )
-        for track in current_top_tracks:
-            db.add(models.RankHistory(track_id=track.id, rank=track.rank))
+        snapshot_count = crud.snapshot_current_ranks(db)
         db.commit()
+        crud.invalidate_rank_snapshot_caches()
+        logging.info("Recorded %s ranks in the snapshot.", snapshot_count)
 
-        write_scrape_status("in_progress:1/6")
-
-        final_status = "completed"
+        error = None
+        stats: dict = {}
         try:
             remaining_pages_tracks = []
-            for page in range(2, 7):
-                write_scrape_status(f"in_progress:{page}/6")
+            fetch_started = time.monotonic()
+            for page in range(2, CHART_PAGE_COUNT + 1):
+                report_scrape_progress(job_id, phase="fetching", page=page)
                 remaining_pages_tracks.extend(scraper._scrape_single_page(page))
             all_scraped_tracks = scraped_page_1 + remaining_pages_tracks
+            stats["fetch_seconds"] = round(time.monotonic() - fetch_started, 2)
+            stats["scraped_tracks"] = len(all_scraped_tracks)
 
             # VALIDATION: Only update DB if we got all 300 tracks (6 pages)
-            if len(all_scraped_tracks) < 300:
+            if len(all_scraped_tracks) < FULL_CHART_SIZE:
                 logging.error(
                     "Scrape validation failed: Only got %s tracks (expected 300). "
                     "Not updating database to avoid partial data.",
                     len(all_scraped_tracks),
                 )
-                write_scrape_status("error:incomplete_data")
-                return
+                final_status = "error"
+                error = "incomplete_data"
+                return final_status
 
             logging.info(
                 "Full scrape finished. Found %s tracks. Processing database...",
                 len(all_scraped_tracks),
             )
+            report_scrape_progress(job_id, phase="saving", stats=stats)
+            save_started = time.monotonic()
 
-            logging.info("Resetting all track ranks to NULL...")
-            db.query(models.Track).update({"rank": None})
             scraped_links = [track["link"] for track in all_scraped_tracks]
             existing_tracks_map = {
                 track.link: track
@@ -155,36 +191,73 @@ def scrape_and_populate_task() -> None:
                 .filter(models.Track.link.in_(scraped_links))
                 .all()
             }
+            previous_ranks = crud.get_current_ranks(db)
 
-            new_tracks_count = 0
+            new_tracks: dict[str, dict] = {}
             updated_tracks_count = 0
+            diff = {"entered": 0, "left": 0, "moved": 0}
+            rank_changes: dict[int, Optional[int]] = {}
 
+            # Nothing below commits until the whole diff is applied, so readers
+            # never see a half-updated chart.
             for track_data in all_scraped_tracks:
-                link = track_data["link"]
-                db_track = existing_tracks_map.get(link)
-                if db_track:
-                    crud.update_track(db, db_track, track_data)
+                db_track = existing_tracks_map.get(track_data["link"])
+                if db_track is None:
+                    if track_data["link"] not in new_tracks:
+                        diff["entered"] += 1
+                    new_tracks[track_data["link"]] = track_data
+                    continue
+
+                previous_rank = previous_ranks.pop(db_track.id, None)
+                if previous_rank is None:
+                    diff["entered"] += 1
+                elif previous_rank != track_data["rank"]:
+                    diff["moved"] += 1
+
+                if _metadata_changed(db_track, track_data):
+                    crud.apply_track_update(db, db_track, track_data)
                     updated_tracks_count += 1
-                else:
-                    crud.create_track(db, track_data)
-                    new_tracks_count += 1
+                elif previous_rank != track_data["rank"]:
+                    rank_changes[db_track.id] = track_data["rank"]
+
+            # Whatever is left of the previous chart dropped off it.
+            diff["left"] = len(previous_ranks)
+            rank_changes.update(dict.fromkeys(previous_ranks))
+            crud.create_tracks(db, list(new_tracks.values()))
+            crud.apply_rank_changes(db, rank_changes)
+            db.commit()
+            new_tracks_count = len(new_tracks)
 
             logging.info("--- Scrape Summary ---")
             logging.info("New tracks added: %s", new_tracks_count)
-            logging.info("Existing tracks updated: %s", updated_tracks_count)
+            logging.info("Existing tracks with new metadata: %s", updated_tracks_count)
+            logging.info(
+                "Rank diff: %s entered, %s left, %s moved.",
+                diff["entered"],
+                diff["left"],
+                diff["moved"],
+            )
+            stats["new_tracks"] = new_tracks_count
+            stats["updated_tracks"] = updated_tracks_count
+            stats.update(diff)
+            stats["save_seconds"] = round(time.monotonic() - save_started, 2)
 
             crud.create_update_log(db)
             logging.info("Update time logged.")
         except Exception as exc:
             final_status = "error"
+            error = str(exc)
             logging.error(
                 "An error occurred in the scrape task: %s", exc, exc_info=True
             )
             db.rollback()
         finally:
-            write_scrape_status(final_status)
+            report_scrape_progress(
+                job_id, status=final_status, phase=None, stats=stats, error=error
+            )
     finally:
         db.close()
+    return final_status
 
 
 def historical_scrape_task(date: str) -> None:
@@ -193,44 +266,5 @@ def historical_scrape_task(date: str) -> None:
     Args:
         date: Date string in YYYY-MM-DD format (e.g., "2026-07-23")
     """
-    db = _get_db_session()
-    try:
-        logging.info(f"Historical Scrape: Starting scrape for date {date}.")
-        all_scraped_tracks = []
-
-        # Scrape all 6 pages for the historical date
-        for page in range(1, 7):
-            logging.info(f"Fetching historical page {page} for date {date}...")
-            page_tracks = scraper._scrape_single_page(page, date=date)
-            all_scraped_tracks.extend(page_tracks)
-
-        logging.info(
-            f"Historical scrape for {date} finished. Found %s tracks.",
-            len(all_scraped_tracks),
-        )
-
-        # Store historical ranks in RankHistory
-        for track_data in all_scraped_tracks:
-            existing_track = crud.get_track_by_link(db, track_data["link"])
-            if existing_track:
-                # Add to rank history with historical date
-                historical_date = datetime.strptime(date, "%Y-%m-%d")
-                db.add(
-                    models.RankHistory(
-                        track_id=existing_track.id,
-                        rank=track_data["rank"],
-                        recorded_at=historical_date,
-                    )
-                )
-
-        db.commit()
-        logging.info(f"Historical data for {date} saved to RankHistory.")
-    except Exception as exc:
-        logging.error(
-            f"An error occurred in the historical scrape task for {date}: %s",
-            exc,
-            exc_info=True,
-        )
-        db.rollback()
-    finally:
-        db.close()
+    chart_date = datetime.strptime(date, "%Y-%m-%d").date()
+    run_backfill(chart_date, chart_date, concurrency=1, force=True)
@@ -0,0 +1,104 @@
+import heapq
+import logging
+from math import sqrt
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.constants import TRACK_NEIGHBOR_COUNT, TRACK_NEIGHBOR_MIN_CO_RATINGS
+from app.database import SessionLocal
+
+
+def _get_db_session() -> Session:
+    return SessionLocal()
+
+
+def compute_track_neighbors(
+    ratings_by_user: dict[int, list[tuple[int, float]]],
+    top_n: int = TRACK_NEIGHBOR_COUNT,
+    min_co_ratings: int = TRACK_NEIGHBOR_MIN_CO_RATINGS,
+) -> list[tuple[int, int, float, int]]:
+    """Computes the top ``top_n`` neighbours of every rated track.
+
+    Similarity is the adjusted cosine between tracks' rating columns (each
+    user's ratings centred on their own mean), summed only over users who
+    rated both. The sparse user x track matrix is walked one track row at a
+    time, so memory holds the ratings plus one accumulator row. Only positive
+    similarities backed by ``min_co_ratings`` users are kept.
+
+    Returns (track_id, neighbor_id, similarity, co_ratings) rows.
+    """
+    centred_by_user: dict[int, list[tuple[int, float]]] = {}
+    raters_by_track: dict[int, list[tuple[int, float]]] = {}
+    squared_norms: dict[int, float] = {}
+    for user_id, ratings in ratings_by_user.items():
+        mean_rating = sum(rating for _, rating in ratings) / len(ratings)
+        centred = [(track_id, rating - mean_rating) for track_id, rating in ratings]
+        centred_by_user[user_id] = centred
+        for track_id, deviation in centred:
+            raters_by_track.setdefault(track_id, []).append((user_id, deviation))
+            squared_norms[track_id] = squared_norms.get(track_id, 0.0) + deviation**2
+    norms = {track_id: sqrt(value) for track_id, value in squared_norms.items()}
+
+    neighbors: list[tuple[int, int, float, int]] = []
+    for track_id, raters in raters_by_track.items():
+        track_norm = norms[track_id]
+        if not track_norm:
+            continue
+        dots: dict[int, float] = {}
+        counts: dict[int, int] = {}
+        for user_id, deviation in raters:
+            for other_id, other_deviation in centred_by_user[user_id]:
+                if other_id == track_id:
+                    continue
+                # A rating at the user's mean adds nothing to the dot product
+                # but still counts as a co-rating.
+                counts[other_id] = counts.get(other_id, 0) + 1
+                if deviation:
+                    dots[other_id] = (
+                        dots.get(other_id, 0.0) + deviation * other_deviation
+                    )
+        scored = []
+        for other_id, dot in dots.items():
+            if dot <= 0 or counts[other_id] < min_co_ratings:
+                continue
+            scored.append((dot / (track_norm * norms[other_id]), other_id))
+        for similarity, other_id in heapq.nlargest(top_n, scored):
+            neighbors.append((track_id, other_id, similarity, counts[other_id]))
+    return neighbors
+
+
+def build_track_neighbors(
+    top_n: Optional[int] = None, min_co_ratings: Optional[int] = None
+) -> dict:
+    """Recomputes and stores the item-item neighbour table from all ratings."""
+    db = _get_db_session()
+    try:
+        ratings_by_user = crud.get_ratings_by_user(db)
+        neighbors = compute_track_neighbors(
+            ratings_by_user,
+            top_n=TRACK_NEIGHBOR_COUNT if top_n is None else top_n,
+            min_co_ratings=(
+                TRACK_NEIGHBOR_MIN_CO_RATINGS
+                if min_co_ratings is None
+                else min_co_ratings
+            ),
+        )
+        stored = crud.replace_track_neighbors(db, neighbors)
+        db.commit()
+    finally:
+        db.close()
+
+    summary = {
+        "users": len(ratings_by_user),
+        "tracks": len({track_id for track_id, *_ in neighbors}),
+        "neighbors": stored,
+    }
+    logging.info(
+        "Track neighbours: %s rows for %s tracks from %s users.",
+        summary["neighbors"],
+        summary["tracks"],
+        summary["users"],
+    )
+    return summary
@@ -661,13 +661,50 @@ const closePlaylistModals = () => {
     .forEach((backdrop) => backdrop.remove());
 };
 
+// Playlist membership of every visible track, fetched in one request when the
+// first menu opens and reused until a playlist changes.
+const PLAYLIST_MEMBERSHIP_BATCH_LIMIT = 300;
+let playlistMembership = null;
+
+const getPlaylistMembership = async (trackId) => {
+  trackId = String(trackId);
+  if (!playlistMembership || !playlistMembership.trackIds.has(trackId)) {
+    const visibleIds = Array.from(
+      document.querySelectorAll("[data-add-to-playlist-button]"),
+      (button) => button.dataset.trackId,
+    ).filter((id) => id !== trackId);
+    const trackIds = [trackId, ...new Set(visibleIds)].slice(
+      0,
+      PLAYLIST_MEMBERSHIP_BATCH_LIMIT,
+    );
+    const response = await fetch(
+      `/api/tracks/playlist-membership?ids=${trackIds.join(",")}`,
+    );
+    if (!response.ok) throw new Error("Failed to fetch playlist status.");
+    const { playlists, membership } = await response.json();
+    playlistMembership = { playlists, membership, trackIds: new Set(trackIds) };
+  }
+
+  // Bit i of the track's hex bitmap marks membership of playlists[i].
+  const { playlists, membership } = playlistMembership;
+  const bitmap = BigInt(`0x${membership[trackId] || "0"}`);
+  const member_of = [];
+  const not_member_of = [];
+  playlists.forEach((playlist, index) => {
+    if ((bitmap >> BigInt(index)) & 1n) {
+      member_of.push(playlist);
+    } else {
+      not_member_of.push(playlist);
+    }
+  });
+  return { member_of, not_member_of };
+};
+
 const openPlaylistModal = async (trackId, buttonElement) => {
   closePlaylistModals();
 
   try {
-    const response = await fetch(`/api/tracks/${trackId}/playlist-status`);
-    if (!response.ok) throw new Error("Failed to fetch playlist status.");
-    const { member_of, not_member_of } = await response.json();
+    const { member_of, not_member_of } = await getPlaylistMembership(trackId);
 
     const modal = document.createElement("div");
     modal.className =
@@ -2595,6 +2632,7 @@ document.addEventListener("DOMContentLoaded", async () => {
         })
           .then((res) => {
             if (!res.ok) throw new Error(window._("Failed to add track."));
+            playlistMembership = null;
             showToast(window._("Track added!"));
             closePlaylistModals();
             showSkeleton();
@@ -2612,6 +2650,7 @@ document.addEventListener("DOMContentLoaded", async () => {
         })
           .then((res) => {
             if (!res.ok) throw new Error(window._("Failed to remove track."));
+            playlistMembership = null;
             showToast(window._("Track removed."));
             closePlaylistModals();
             showSkeleton();
@@ -2642,6 +2681,7 @@ document.addEventListener("DOMContentLoaded", async () => {
                 throw new Error(
                   window._("Failed to add track to new playlist."),
                 );
+              playlistMembership = null;
               showToast(
                 window._(`Track added to new playlist: %s!`, playlistName),
               );
@@ -22,6 +22,13 @@ document.addEventListener("DOMContentLoaded", () => {
   const playlistTracksList = document.getElementById("playlist-tracks-list");
   const trackSearch = document.getElementById("track-search");
   const playlistPublicInput = document.getElementById("playlist-public-input");
+  const searchStatus = document.getElementById("track-search-status");
+
+  const SEARCH_DEBOUNCE_MS = 250;
+  const SEARCH_PREFETCH_PX = 200;
+  let searchQuery = "";
+  let nextCursor = null;
+  let searchController = null;
 
   // --- HELPER FUNCTIONS ---
 
@@ -40,12 +47,12 @@ document.addEventListener("DOMContentLoaded", () => {
     }, 2500);
   };
 
-  const debounce = (func, delay) => {
-    let timeout;
-    return function (...args) {
-      clearTimeout(timeout);
-      timeout = setTimeout(() => func.apply(this, args), delay);
-    };
+  // Playlist writes are applied one at a time so a move never overtakes the
+  // add it depends on.
+  let pendingWrites = Promise.resolve();
+  const enqueueWrite = (write) => {
+    pendingWrites = pendingWrites.then(write);
+    return pendingWrites;
   };
 
   const createPlaylistItemElement = (sourceItem) => {
@@ -84,43 +91,142 @@ document.addEventListener("DOMContentLoaded", () => {
     return newPlaylistItem;
   };
 
+  const debounce = (fn, delay) => {
+    let timeoutId;
+    return (...args) => {
+      clearTimeout(timeoutId);
+      timeoutId = setTimeout(() => fn(...args), delay);
+    };
+  };
+
+  const createSearchResultElement = (track) => {
+    const item = document.createElement("div");
+    item.className =
+      "track-item flex cursor-grab items-center gap-3 rounded hover:bg-gray-hover";
+    Object.assign(item.dataset, {
+      trackId: track.id,
+      trackLink: track.link,
+      trackImageUrl: track.image_url || "",
+      trackTitle: track.title,
+      trackTitleJp: track.title_jp || "",
+      trackProducer: track.producer,
+      trackProducerJp: track.producer_jp || "",
+    });
+
+    item.innerHTML = `
+        <div data-add-indicator class="p-2 text-gray-text"></div>
+        <button data-play-button class="p-2 text-gray-text hover:text-sky-text">
+            <span class="inline-block h-6 w-6">${getIconSVG("play")}</span>
+        </button>
+        <a target="_blank" rel="noopener noreferrer" class="flex items-center gap-3">
+            <img class="h-10 w-10 rounded object-cover">
+            <div>
+                <div class="font-semibold"></div>
+                <div class="text-sm"></div>
+            </div>
+        </a>
+    `;
+
+    // Track text comes from the scraped catalog, so it is set as text rather
+    // than interpolated into the markup above.
+    const playButton = item.querySelector("[data-play-button]");
+    playButton.dataset.trackId = track.id;
+    playButton.title = searchStatus.dataset.playTitle;
+    const link = item.querySelector("a");
+    link.href = track.link;
+    const image = item.querySelector("img");
+    if (track.image_url) image.src = track.image_url;
+    image.alt = track.title;
+    link.querySelector(".font-semibold").textContent = track.title;
+    link.querySelector(".text-sm").textContent = track.producer;
+
+    return item;
+  };
+
+  const setSearchStatus = (state) => {
+    searchStatus.textContent = state
+      ? searchStatus.dataset[`${state}Text`]
+      : "";
+  };
+
   // --- API FUNCTIONS ---
 
-  const debouncedSaveOrder = debounce(async (trackIds) => {
-    if (!trackIds) return;
-    try {
-      const response = await fetch(`/api/playlists/${playlistId}/reorder`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(trackIds),
-      });
-      if (!response.ok) throw new Error("Server error on save.");
-      showToast("Playlist order saved!");
-    } catch {
-      showToast("Failed to save order.", "error");
+  // Loads the first page for the current query (reset) or the page after the
+  // last result. A new query cancels the request it replaces; scrolling waits
+  // for the request already in flight.
+  const loadSearchPage = async ({ reset }) => {
+    if (reset) {
+      searchController?.abort();
+    } else if (searchController || nextCursor === null) {
+      return;
     }
-  }, 500);
+    const controller = new AbortController();
+    searchController = controller;
 
-  const addTrack = async (trackId) => {
-    try {
-      await fetch(`/api/playlists/${playlistId}/tracks/${trackId}`, {
-        method: "POST",
-      });
-    } catch {
-      showToast("Failed to add track.", "error");
-    }
-  };
+    const params = new URLSearchParams({ q: searchQuery });
+    if (!reset) params.set("after", nextCursor);
+    setSearchStatus("loading");
 
-  const removeTrack = async (trackId) => {
     try {
-      await fetch(`/api/playlists/${playlistId}/tracks/${trackId}`, {
-        method: "DELETE",
+      const response = await fetch(`/api/tracks/search?${params}`, {
+        signal: controller.signal,
       });
-    } catch {
-      showToast("Failed to remove track.", "error");
+      if (!response.ok) throw new Error("Server error on search.");
+      const data = await response.json();
+
+      if (reset) {
+        allTracksList.replaceChildren();
+        allTracksList.scrollTop = 0;
+      }
+      allTracksList.append(...data.tracks.map(createSearchResultElement));
+      nextCursor = data.next_cursor;
+      updateInPlaylistIndicators();
+      setSearchStatus(allTracksList.children.length ? "" : "empty");
+    } catch (error) {
+      if (error.name !== "AbortError") setSearchStatus("error");
+    } finally {
+      if (searchController === controller) searchController = null;
     }
   };
 
+  // Sends only the dragged track and its new index, not the whole order.
+  const saveMove = (trackId, index) =>
+    enqueueWrite(async () => {
+      try {
+        const response = await fetch(`/api/playlists/${playlistId}/reorder`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ track_id: Number(trackId), index }),
+        });
+        if (!response.ok) throw new Error("Server error on save.");
+        showToast("Playlist order saved!");
+      } catch {
+        showToast("Failed to save order.", "error");
+      }
+    });
+
+  const addTrack = (trackId) =>
+    enqueueWrite(async () => {
+      try {
+        await fetch(`/api/playlists/${playlistId}/tracks/${trackId}`, {
+          method: "POST",
+        });
+      } catch {
+        showToast("Failed to add track.", "error");
+      }
+    });
+
+  const removeTrack = (trackId) =>
+    enqueueWrite(async () => {
+      try {
+        await fetch(`/api/playlists/${playlistId}/tracks/${trackId}`, {
+          method: "DELETE",
+        });
+      } catch {
+        showToast("Failed to remove track.", "error");
+      }
+    });
+
   // --- INLINE EDITING FOR PLAYLIST DETAILS ---
 
   document.querySelectorAll("[data-edit-field]").forEach((button) => {
@@ -213,7 +319,7 @@ document.addEventListener("DOMContentLoaded", () => {
     // No 'handle' property means the whole item is draggable
     onAdd: function (evt) {
       const trackId = evt.item.dataset.trackId;
-      addTrack(trackId); // API call
+      addTrack(trackId); // API call, appends to the end
 
       // Create the new, correctly styled item using our helper
       const newPlaylistItem = createPlaylistItemElement(evt.item);
@@ -223,27 +329,35 @@ document.addEventListener("DOMContentLoaded", () => {
 
       updateInPlaylistIndicators(); // Update the left side
 
-      const trackIds = Array.from(playlistTracksList.children).map(
-        (item) => item.dataset.trackId,
-      );
-      debouncedSaveOrder(trackIds);
+      if (evt.newIndex !== playlistTracksList.children.length - 1) {
+        saveMove(trackId, evt.newIndex);
+      }
     },
-    onEnd: function () {
-      const trackIds = Array.from(playlistTracksList.children).map(
-        (item) => item.dataset.trackId,
-      );
-      debouncedSaveOrder(trackIds);
+    onEnd: function (evt) {
+      if (evt.oldIndex !== evt.newIndex) {
+        saveMove(evt.item.dataset.trackId, evt.newIndex);
+      }
     },
   });
 
   // --- GENERAL EVENT LISTENERS ---
 
-  trackSearch.addEventListener("input", () => {
-    const searchTerm = trackSearch.value.toLowerCase();
-    allTracksList.querySelectorAll(".track-item").forEach((item) => {
-      const itemText = item.textContent.toLowerCase();
-      item.style.display = itemText.includes(searchTerm) ? "flex" : "none";
-    });
+  trackSearch.addEventListener(
+    "input",
+    debounce(() => {
+      searchQuery = trackSearch.value.trim();
+      loadSearchPage({ reset: true });
+    }, SEARCH_DEBOUNCE_MS),
+  );
+
+  allTracksList.addEventListener("scroll", () => {
+    const remaining =
+      allTracksList.scrollHeight -
+      allTracksList.scrollTop -
+      allTracksList.clientHeight;
+    if (remaining < SEARCH_PREFETCH_PX) {
+      loadSearchPage({ reset: false });
+    }
   });
 
   allTracksList.addEventListener("click", (e) => {
@@ -278,12 +392,6 @@ document.addEventListener("DOMContentLoaded", () => {
 
     // Update the visual indicators
     updateInPlaylistIndicators();
-
-    // Save the new order
-    const trackIds = Array.from(playlistTracksList.children).map(
-      (item) => item.dataset.trackId,
-    );
-    debouncedSaveOrder(trackIds);
   });
 
   playlistTracksList.addEventListener("click", (e) => {
@@ -295,10 +403,6 @@ document.addEventListener("DOMContentLoaded", () => {
       removeTrack(trackId);
       trackItem.remove();
 
-      const trackIds = Array.from(playlistTracksList.children).map(
-        (item) => item.dataset.trackId,
-      );
-      debouncedSaveOrder(trackIds);
       updateInPlaylistIndicators();
       showToast("Track removed.");
     }
@@ -375,4 +479,5 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   };
   updateInPlaylistIndicators();
+  loadSearchPage({ reset: true });
 });
@@ -0,0 +1,17 @@
+import struct
+
+# Each entry is a little-endian (track_id, rank) pair of unsigned 32-bit ints.
+_PAIR = struct.Struct("<II")
+
+
+def pack_ranks(ranks) -> bytes:
+    """Packs ``(track_id, rank)`` pairs into a compact blob, ordered by rank."""
+    ordered = sorted(ranks, key=lambda pair: pair[1])
+    return struct.pack(
+        f"<{2 * len(ordered)}I", *(value for pair in ordered for value in pair)
+    )
+
+
+def unpack_ranks(blob: bytes) -> list[tuple[int, int]]:
+    """Returns the ``(track_id, rank)`` pairs stored by :func:`pack_ranks`."""
+    return list(_PAIR.iter_unpack(blob))
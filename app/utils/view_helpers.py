@@ -15,34 +15,6 @@ def serialize_tracks(tracks) -> str:
     return json.dumps([track.to_dict() for track in tracks])
 
 
-def collect_producers_and_voicebanks(
-    tracks, locale: str
-) -> tuple[list[str], list[str]]:
-    producers_flat: list[str] = []
-    voicebanks_flat: list[str] = []
-
-    for track in tracks:
-        if locale == "ja" and track.producer_jp:
-            producers_flat.extend(
-                [producer.strip() for producer in track.producer_jp.split(",")]
-            )
-        else:
-            producers_flat.extend(
-                [producer.strip() for producer in track.producer.split(",")]
-            )
-
-        if locale == "ja" and track.voicebank_jp:
-            voicebanks_flat.extend(
-                [voicebank.strip() for voicebank in track.voicebank_jp.split(",")]
-            )
-        else:
-            voicebanks_flat.extend(
-                [voicebank.strip() for voicebank in track.voicebank.split(",")]
-            )
-
-    return sorted(set(producers_flat)), sorted(set(voicebanks_flat))
-
-
 def get_user_filter_options(
     db: Session, user_id: int, locale: str
 ) -> tuple[list[str], list[str]]:
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Backfill historical rank snapshots for a date range.
+
+Progress is checkpointed in the database, so re-running the same range
+resumes after an interruption and skips dates that are already complete.
+
+Usage:
+    python -m scripts.backfill_history 2026-07-01 2026-07-31 --concurrency 2
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+
+sys.path.insert(0, ".")
+
+from app.services.backfill import (  # noqa: E402
+    DEFAULT_CONCURRENCY,
+    DEFAULT_REQUEST_INTERVAL_SECONDS,
+    run_backfill,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical rankings")
+    parser.add_argument("start", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument(
+        "end",
+        type=date.fromisoformat,
+        nargs="?",
+        help="YYYY-MM-DD (defaults to start)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of dates fetched at the same time",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_REQUEST_INTERVAL_SECONDS,
+        help="Minimum seconds between page requests",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-fetch dates that already have a complete snapshot",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    summary = run_backfill(
+        args.start,
+        args.end or args.start,
+        concurrency=args.concurrency,
+        request_interval=args.delay,
+        force=args.force,
+    )
+    print(
+        f"Completed: {summary['completed']}, partial: {summary['partial']}, "
+        f"failed: {summary['failed']}, skipped: {summary['skipped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Time restoring a ratings backup, per entry versus in bulk.
+
+Builds a scratch SQLite database holding half of the backup's tracks (some
+already rated), then restores the same backup twice on fresh copies: once
+entry by entry through get_track_by_link/create_track/create_rating, as the
+restore endpoint used to, and once through crud.import_ratings.
+
+Usage:
+    python -m scripts.benchmark_import --entries 10000
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models  # noqa: E402
+from app.database import Base  # noqa: E402
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def _chunked_insert(db, table, rows):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(table), rows[start : start + INSERT_CHUNK_SIZE])
+
+
+def synthetic_backup(entry_count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [
+        {
+            "link": f"https://example.com/bench/{i}",
+            "title": f"Track {i}",
+            "producer": f"Producer {rng.randint(1, entry_count // 20 + 1)}",
+            "voicebank": f"Voicebank {rng.randint(1, 60)}",
+            "published_date": (now - timedelta(days=rng.randint(0, 5000))).isoformat(),
+            "title_jp": None,
+            "producer_jp": None,
+            "voicebank_jp": None,
+            "image_url": None,
+            "rating": float(rng.randint(1, 10)),
+            "notes": None,
+        }
+        for i in range(1, entry_count + 1)
+    ]
+
+
+def build_database(path: Path, backup: list[dict]) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        existing = backup[: len(backup) // 2]
+        crud.create_tracks(
+            db,
+            [
+                {
+                    **{
+                        key: item[key] for key in item if key not in ("rating", "notes")
+                    },
+                    "published_date": datetime.fromisoformat(item["published_date"]),
+                }
+                for item in existing
+            ],
+        )
+        user = models.User(email="bench@example.com", hashed_password="x", username="b")
+        db.add(user)
+        db.flush()
+        track_ids = crud.get_track_ids_by_links(db, [item["link"] for item in existing])
+        _chunked_insert(
+            db,
+            models.Rating,
+            [
+                {"track_id": track_ids[item["link"]], "user_id": user.id, "rating": 5}
+                for item in existing[::2]
+            ],
+        )
+        crud.rebuild_user_entity_affinity(db, [user.id])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def restore_per_entry(db, user_id: int, backup: list[dict]) -> None:
+    for item in backup:
+        track = crud.get_track_by_link(db, item["link"])
+        if not track:
+            track = crud.create_track(
+                db,
+                {
+                    **{
+                        key: item[key] for key in item if key not in ("rating", "notes")
+                    },
+                    "published_date": datetime.fromisoformat(item["published_date"]),
+                    "rank": None,
+                },
+            )
+        crud.create_rating(db, track.id, user_id, item["rating"], item["notes"])
+
+
+def timed_restore(template: Path, user_id: int, backup: list[dict], bulk: bool):
+    copy = template.with_name(f"{'bulk' if bulk else 'per-entry'}.db")
+    shutil.copyfile(template, copy)
+    engine = create_engine(f"sqlite:///{copy}")
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        if bulk:
+            crud.import_ratings(db, user_id, backup)
+        else:
+            restore_per_entry(db, user_id, backup)
+        return time.perf_counter() - started
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ratings restore")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument(
+        "--skip-per-entry", action="store_true", help="Only time the bulk path"
+    )
+    args = parser.parse_args()
+
+    backup = synthetic_backup(args.entries)
+    template = Path(tempfile.mkdtemp(prefix="import-bench-")) / "template.db"
+    user_id = build_database(template, backup)
+
+    print(f"[{args.entries} entries, {args.entries // 2} new tracks]")
+    if not args.skip_per_entry:
+        seconds = timed_restore(template, user_id, backup, bulk=False)
+        print(f"  per_entry_seconds: {seconds:.2f}")
+    seconds = timed_restore(template, user_id, backup, bulk=True)
+    print(f"  bulk_seconds: {seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
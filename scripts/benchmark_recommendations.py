@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Time recommendation scoring on a synthetic catalog.
+
+Builds a scratch SQLite database per catalog size with random producers,
+voicebanks and one user's ratings, then times the first request (which builds
+the catalog index) and the average of warm requests.
+
+Usage:
+    python -m scripts.benchmark_recommendations --tracks 10000 --tracks 100000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models  # noqa: E402
+from app.database import Base  # noqa: E402
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def _chunked_insert(db, table, rows):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(table), rows[start : start + INSERT_CHUNK_SIZE])
+
+
+def build_catalog(db, track_count: int, rated_count: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    producer_count = max(track_count // 20, 10)
+    voicebank_count = 60
+    now = datetime.now()
+
+    _chunked_insert(
+        db,
+        models.Producer,
+        [{"id": i, "name": f"Producer {i}"} for i in range(1, producer_count + 1)],
+    )
+    _chunked_insert(
+        db,
+        models.Voicebank,
+        [{"id": i, "name": f"Voicebank {i}"} for i in range(1, voicebank_count + 1)],
+    )
+    _chunked_insert(
+        db,
+        models.Track,
+        [
+            {
+                "id": i,
+                "title": f"Track {i}",
+                "producer": "",
+                "voicebank": "",
+                "published_date": now - timedelta(days=rng.randint(0, 5000)),
+                "link": f"https://example.com/bench/{i}",
+            }
+            for i in range(1, track_count + 1)
+        ],
+    )
+    producer_links, voicebank_links = [], []
+    for track_id in range(1, track_count + 1):
+        for producer_id in rng.sample(range(1, producer_count + 1), rng.randint(1, 2)):
+            producer_links.append({"track_id": track_id, "producer_id": producer_id})
+        for voicebank_id in rng.sample(
+            range(1, voicebank_count + 1), rng.randint(1, 3)
+        ):
+            voicebank_links.append({"track_id": track_id, "voicebank_id": voicebank_id})
+    _chunked_insert(db, models.track_producers, producer_links)
+    _chunked_insert(db, models.track_voicebanks, voicebank_links)
+
+    user = models.User(email="bench@example.com", hashed_password="x", username="b")
+    db.add(user)
+    db.flush()
+    _chunked_insert(
+        db,
+        models.Rating,
+        [
+            {"track_id": track_id, "user_id": user.id, "rating": rng.randint(1, 10)}
+            for track_id in rng.sample(range(1, track_count + 1), rated_count)
+        ],
+    )
+    db.commit()
+    return user.id
+
+
+def benchmark(track_count: int, rated_count: int, repeats: int) -> dict:
+    tmp_dir = tempfile.mkdtemp(prefix="reco-bench-")
+    engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        user_id = build_catalog(db, track_count, rated_count)
+        crud.invalidate_recommendation_index()
+
+        started = time.perf_counter()
+        crud.get_recommended_tracks(db, user_id, recent_bias="light")
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            crud.get_recommended_tracks(db, user_id, recent_bias="light")
+        warm = (time.perf_counter() - started) / repeats
+    finally:
+        db.close()
+        engine.dispose()
+    return {"cold_seconds": round(cold, 4), "warm_seconds": round(warm, 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendations")
+    parser.add_argument(
+        "--tracks",
+        type=int,
+        action="append",
+        default=[],
+        help="Catalog size; repeatable (default: 10000 and 100000)",
+    )
+    parser.add_argument("--rated", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    for track_count in args.tracks or [10000, 100000]:
+        results = benchmark(track_count, min(args.rated, track_count), args.repeats)
+        print(f"[{track_count} tracks]")
+        for key, value in results.items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Time the scrape -> database pipeline against recorded fixtures.
+
+Starts the fixture stub from ``scripts.scrape_fixtures`` and runs, per
+database: an initial scrape, an update scrape (the current chart is swapped
+for a recorded historical chart so the full update path runs) and a backfill
+of every recorded historical date. Use scratch databases: the app tables are
+dropped and recreated for each one.
+
+Usage:
+    python -m scripts.benchmark_scrape fixtures/ \\
+        --database-url sqlite:////tmp/bench.db \\
+        --database-url postgresql://localhost/vocaloid_bench --latency 0.05
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import create_engine, func  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.services import backfill, scraping  # noqa: E402
+from scripts.scrape_fixtures import recorded_dates, start_fixture_server  # noqa: E402
+
+
+def _timed(label: str, results: dict, fn, *args, **kwargs):
+    started = time.perf_counter()
+    outcome = fn(*args, **kwargs)
+    results[label] = round(time.perf_counter() - started, 3)
+    return outcome
+
+
+def benchmark_database(database_url: str, server) -> dict:
+    connect_args = (
+        {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    )
+    engine = create_engine(database_url, connect_args=connect_args)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    results: dict = {}
+    with ExitStack() as stack:
+        # Route the services' sessions to the scratch database for this run.
+        for module in (scraping, backfill):
+            stack.enter_context(
+                patch.object(module, "_get_db_session", session_factory)
+            )
+        stack.callback(engine.dispose)
+
+        server.current_date = None
+        results["initial_status"] = _timed(
+            "initial_seconds", results, scraping.initial_scrape_task
+        )
+
+        dates = recorded_dates(server.fixture_dir)
+        if dates:
+            server.current_date = dates[-1]
+            results["update_status"] = _timed(
+                "update_seconds", results, scraping.scrape_and_populate_task
+            )
+            server.current_date = None
+            summary = _timed(
+                "backfill_seconds",
+                results,
+                backfill.run_backfill,
+                date.fromisoformat(dates[0]),
+                date.fromisoformat(dates[-1]),
+                request_interval=0,
+                force=True,
+            )
+            results["backfill_completed"] = summary["completed"]
+
+        db = session_factory()
+        try:
+            results["tracks"] = db.query(func.count(models.Track.id)).scalar()
+            results["rank_history_rows"] = db.query(
+                func.count(models.RankHistory.id)
+            ).scalar()
+        finally:
+            db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scrape ingestion")
+    parser.add_argument("fixture_dir", type=Path)
+    parser.add_argument(
+        "--database-url",
+        action="append",
+        default=[],
+        help="Scratch database to benchmark; repeatable (default: temp SQLite)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s:%(message)s")
+    database_urls = args.database_url
+    if not database_urls:
+        tmp_dir = tempfile.mkdtemp(prefix="scrape-bench-")
+        database_urls = [f"sqlite:///{Path(tmp_dir) / 'bench.db'}"]
+
+    server = start_fixture_server(
+        args.fixture_dir, latency=args.latency, error_rate=args.error_rate
+    )
+    os.environ["VOCALOARD_BASE_URL"] = server.base_url
+    try:
+        for database_url in database_urls:
+            dialect = database_url.split(":", 1)[0]
+            results = benchmark_database(database_url, server)
+            print(f"[{dialect}]")
+            for key, value in results.items():
+                print(f"  {key}: {value}")
+        print(
+            f"Fixture server: {server.request_count} requests, "
+            f"{server.error_count} errors"
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
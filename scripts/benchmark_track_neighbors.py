@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Time and measure the item-item neighbour build on synthetic ratings.
+
+Ratings follow a skewed popularity curve, so a few tracks are rated by most
+users, like the real chart. Reports build time and the number of neighbour
+rows for each user count, plus peak traced memory with ``--memory``.
+
+Usage:
+    python -m scripts.benchmark_track_neighbors --users 500 --users 2000 \\
+        --tracks 20000 --ratings-per-user 300 --memory
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from app.services.track_neighbors import compute_track_neighbors  # noqa: E402
+
+
+def synthetic_ratings(
+    user_count: int, track_count: int, ratings_per_user: int, seed: int = 0
+) -> dict[int, list[tuple[int, float]]]:
+    rng = random.Random(seed)
+    weights = [1 / (rank**0.8) for rank in range(1, track_count + 1)]
+    ratings_by_user = {}
+    for user_id in range(1, user_count + 1):
+        count = max(1, int(rng.expovariate(1 / ratings_per_user)))
+        track_ids = set(
+            rng.choices(range(1, track_count + 1), weights=weights, k=count)
+        )
+        ratings_by_user[user_id] = [
+            (track_id, float(rng.randint(1, 10))) for track_id in track_ids
+        ]
+    return ratings_by_user
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark track neighbours")
+    parser.add_argument(
+        "--users",
+        type=int,
+        action="append",
+        default=[],
+        help="User count; repeatable (default: 200 and 1000)",
+    )
+    parser.add_argument("--tracks", type=int, default=20000)
+    parser.add_argument("--ratings-per-user", type=int, default=200)
+    parser.add_argument(
+        "--memory", action="store_true", help="Also measure peak traced memory"
+    )
+    args = parser.parse_args()
+
+    for user_count in args.users or [200, 1000]:
+        ratings_by_user = synthetic_ratings(
+            user_count, args.tracks, args.ratings_per_user
+        )
+        rating_count = sum(len(ratings) for ratings in ratings_by_user.values())
+
+        started = time.perf_counter()
+        neighbors = compute_track_neighbors(ratings_by_user)
+        elapsed = time.perf_counter() - started
+
+        print(f"[{user_count} users, {rating_count} ratings]")
+        print(f"  build_seconds: {elapsed:.2f}")
+        print(f"  neighbor_rows: {len(neighbors)}")
+        if args.memory:
+            # Tracing slows the build down, so memory is measured in a second run.
+            del neighbors
+            tracemalloc.start()
+            compute_track_neighbors(ratings_by_user)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  peak_memory_mb: {peak / 1024 / 1024:.1f}")
+
+
+if __name__ == "__main__":
+    main()
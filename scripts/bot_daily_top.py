@@ -6,10 +6,9 @@ import httpx
 from atproto import Client, client_utils
 from atproto import models as at_models
 from dotenv import load_dotenv
-from sqlalchemy import desc
-
 from app import models as db_models
 from app.database import SessionLocal
+from app.services.charts import chart_diff
 
 load_dotenv()
 
@@ -258,26 +257,17 @@ def run_rank_analysis(args):
     try:
         print(f"--- Analyzing Charts ({datetime.now().strftime('%Y-%m-%d %H:%M')}) ---")
 
-        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-
-        last_snapshot = (
-            db.query(db_models.RankHistory.recorded_at)
-            .filter(db_models.RankHistory.recorded_at <= yesterday)
-            .order_by(desc(db_models.RankHistory.recorded_at))
-            .first()
-        )
+        yesterday = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
+        diff = chart_diff(db, yesterday, include_unchanged=True)
 
         old_ranks = {}
 
-        if last_snapshot:
-            snapshot_time = last_snapshot[0]
-            print(f"Comparing against snapshot from {snapshot_time}")
-
+        if diff:
+            print(f"Comparing against snapshot from {diff['from']}")
             old_ranks = {
-                h.track_id: h.rank
-                for h in db.query(db_models.RankHistory)
-                .filter(db_models.RankHistory.recorded_at == snapshot_time)
-                .all()
+                item["track_id"]: item["old_rank"]
+                for group in ("moved", "unchanged", "dropped")
+                for item in diff[group]
             }
 
         top_10_objs = (
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Recompute the item-item neighbour table behind collaborative recommendations.
+
+Run periodically (e.g. nightly); /recommendations?mode=collaborative reads
+whatever the last run stored.
+
+Usage:
+    python -m scripts.build_track_neighbors --top-n 50 --min-co-ratings 2
+"""
+
+import argparse
+import logging
+import sys
+
+sys.path.insert(0, ".")
+
+from app.services.track_neighbors import build_track_neighbors  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build track neighbours")
+    parser.add_argument(
+        "--top-n", type=int, default=None, help="Neighbours kept per track"
+    )
+    parser.add_argument(
+        "--min-co-ratings",
+        type=int,
+        default=None,
+        help="Users who must have rated both tracks",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    summary = build_track_neighbors(
+        top_n=args.top_n, min_co_ratings=args.min_co_ratings
+    )
+    print(
+        f"Stored {summary['neighbors']} neighbours for {summary['tracks']} tracks "
+        f"from {summary['users']} users"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Downsample old rank history to one snapshot per week.
+
+Snapshots newer than the retention window are kept in full; older weeks keep
+only their first snapshot. Defaults to RANK_HISTORY_RETENTION_DAYS.
+
+Usage:
+    python -m scripts.compact_rank_history --keep-days 180 --dry-run
+"""
+
+import argparse
+import logging
+import sys
+
+sys.path.insert(0, ".")
+
+from app.services.rank_retention import compact_rank_history  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact old rank history")
+    parser.add_argument(
+        "--keep-days",
+        type=int,
+        default=None,
+        help="Days kept at full resolution (default: RANK_HISTORY_RETENTION_DAYS)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be removed without deleting anything",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    summary = compact_rank_history(keep_days=args.keep_days, dry_run=args.dry_run)
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(
+        f"{verb} {summary['snapshots_removed']} snapshots and "
+        f"{summary['rows_removed']} rank history rows older than {summary['cutoff']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Export rank history, tracks and rating aggregates for offline analysis.
+
+Writes Parquet (default) or Arrow IPC files into an output directory. Rank
+history is exported incrementally: each run appends a part with the rows
+recorded since the watermark stored in ``manifest.json``. Requires pyarrow.
+
+Usage:
+    python -m scripts.export_analytics exports/
+    python -m scripts.export_analytics exports/ --format arrow --full
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from app.services.analytics_export import (  # noqa: E402
+    EXPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    export_analytics,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export analytics data")
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument(
+        "--format", choices=sorted(EXPORT_FORMATS), default="parquet", dest="fmt"
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Export rank history recorded after this UTC timestamp",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the stored watermark and re-export all rank history",
+    )
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    try:
+        summary = export_analytics(
+            args.output_dir,
+            fmt=args.fmt,
+            since=args.since,
+            full=args.full,
+            batch_size=args.batch_size,
+        )
+    except RuntimeError as exc:
+        sys.exit(str(exc))
+    print(
+        f"Exported {summary['rank_history_rows']} rank history rows, "
+        f"{summary['tracks']} tracks and {summary['rating_summaries']} rating "
+        f"summaries to {args.output_dir} (watermark: {summary['watermark']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
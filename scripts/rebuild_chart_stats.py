@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Recompute the per-track chart statistics from rank history.
+
+Scrapes and backfills keep track_chart_stats up to date incrementally; run
+this after editing rank history by hand or restoring a backup. History
+already removed by compact_rank_history is counted from the baselines it
+leaves in track_chart_stats_baseline.
+
+Usage:
+    python -m scripts.rebuild_chart_stats
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+from app import crud  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+
+def main():
+    db = SessionLocal()
+    try:
+        rebuilt = crud.rebuild_track_chart_stats(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt chart statistics for {rebuilt} tracks")
+
+
+if __name__ == "__main__":
+    main()
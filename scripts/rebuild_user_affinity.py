@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Recompute per-user producer/voicebank affinity from ratings.
+
+Rating writes keep user_entity_affinity up to date; run this after importing
+ratings directly into the database or restoring a backup.
+
+Usage:
+    python -m scripts.rebuild_user_affinity
+    python -m scripts.rebuild_user_affinity --user-id 3 --user-id 7
+"""
+
+import argparse
+import sys
+
+sys.path.insert(0, ".")
+
+from app import crud  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild user entity affinity")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        action="append",
+        default=None,
+        help="Only rebuild this user; repeatable (default: all users)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = crud.rebuild_user_entity_affinity(db, args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Wrote {written} affinity rows")
+
+
+if __name__ == "__main__":
+    main()
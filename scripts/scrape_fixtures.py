@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Record Vocaloard ranking pages and replay them from a local stub server.
+
+Fixtures are stored as ``<dir>/<en|jp>/<key>.html`` where the key is ``g<page>``
+for the current chart or ``d<date>_g<page>`` for a historical chart. Point the
+app at the stub with ``VOCALOARD_BASE_URL=http://127.0.0.1:<port>``.
+
+Usage:
+    python -m scripts.scrape_fixtures record fixtures/ --date 2026-07-01
+    python -m scripts.scrape_fixtures serve fixtures/ --latency 0.2 --error-rate 0.05
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, ".")
+
+from app import scraper  # noqa: E402
+from app.constants import CHART_PAGE_COUNT  # noqa: E402
+
+DEFAULT_PORT = 8765
+
+
+def fixture_path(
+    fixture_dir: Path, lang: str, page: int, date: Optional[str] = None
+) -> Path:
+    key = f"d{date}_g{page}" if date else f"g{page}"
+    return Path(fixture_dir) / lang / f"{key}.html"
+
+
+def recorded_dates(fixture_dir: Path) -> list[str]:
+    """Returns the historical dates with a recorded first page, oldest first."""
+    return sorted(
+        path.stem[1:].split("_g")[0]
+        for path in (Path(fixture_dir) / "en").glob("d*_g1.html")
+    )
+
+
+def record_fixtures(fixture_dir: Path, dates: list[str], delay: float = 1.0) -> int:
+    """Downloads the current chart and each historical date into ``fixture_dir``."""
+    base_url_en, base_url_jp = scraper.get_base_urls()
+    saved = 0
+    for date in [None, *dates]:
+        for page in range(1, CHART_PAGE_COUNT + 1):
+            query = f"?d={date}&g={page}" if date else f"?g={page}"
+            for lang, base_url in (("en", base_url_en), ("jp", base_url_jp)):
+                path = fixture_path(fixture_dir, lang, page, date)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(scraper._fetch_page(base_url + query).content)
+                saved += 1
+            time.sleep(delay)
+    return saved
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Serves recorded ranking pages with optional latency and error injection.
+
+    ``current_date`` makes current-chart requests answer with a recorded
+    historical chart, which lets a benchmark simulate the chart moving on.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        fixture_dir: Path,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        super().__init__(address, _FixtureHandler)
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.current_date: Optional[str] = None
+        self.request_count = 0
+        self.error_count = 0
+        self._counter_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, failed: bool) -> None:
+        with self._counter_lock:
+            self.request_count += 1
+            if failed:
+                self.error_count += 1
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        lang = "en" if url.path.startswith("/en") else "jp"
+        date = params.get("d", [self.server.current_date])[0]
+        try:
+            page = int(params.get("g", ["1"])[0])
+        except ValueError:
+            page = 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            self.server._count(failed=True)
+            self.send_error(503, "Injected failure")
+            return
+
+        path = fixture_path(self.server.fixture_dir, lang, page, date)
+        if not path.exists():
+            self.server._count(failed=True)
+            self.send_error(404, "No fixture recorded")
+            return
+
+        body = path.read_bytes()
+        self.server._count(failed=False)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(
+    fixture_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+) -> FixtureServer:
+    """Starts a fixture server on a background thread; port 0 picks a free port."""
+    server = FixtureServer((host, port), fixture_dir, latency, error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay ranking pages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Download fixtures")
+    record_parser.add_argument("fixture_dir", type=Path)
+    record_parser.add_argument(
+        "--date",
+        action="append",
+        default=[],
+        help="Historical date to record (YYYY-MM-DD); repeatable",
+    )
+    record_parser.add_argument(
+        "--delay", type=float, default=1.0, help="Seconds between pages"
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="Serve recorded fixtures")
+    serve_parser.add_argument("fixture_dir", type=Path)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response"
+    )
+    serve_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 503",
+    )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        saved = record_fixtures(args.fixture_dir, args.date, delay=args.delay)
+        print(f"Saved {saved} pages to {args.fixture_dir}")
+        return
+
+    server = FixtureServer(
+        (args.host, args.port), args.fixture_dir, args.latency, args.error_rate
+    )
+    print(f"Serving {args.fixture_dir} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,16 @@ def stable_test_environment(monkeypatch):
     monkeypatch.setattr(main, "is_local_auth_mode", lambda: False)
     monkeypatch.setattr(app_auth, "is_local_auth_mode", lambda: False)
 
+    # In-process caches must not leak between per-test databases.
+    from app import crud
+
+    crud.invalidate_rank_snapshot_caches()
+    crud.invalidate_recommendation_index()
+    crud.invalidate_rating_statistics()
+    crud.invalidate_profile_view()
+    crud.invalidate_user_playlists()
+    crud.invalidate_public_playlists()
+
 
 @pytest.fixture
 def session_factory() -> Iterator[sessionmaker]:
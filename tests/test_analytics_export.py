@@ -0,0 +1,70 @@
+from datetime import date, datetime
+
+import pyarrow.parquet as pq
+
+from app import crud, models
+from app.services import analytics_export
+
+
+def _record_history(db_session, sample_tracks):
+    first, second, _ = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(first.id, 1), (second.id, 2)]
+    )
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 2), [(second.id, 1), (first.id, 2)]
+    )
+    db_session.commit()
+
+
+def test_iter_rank_history_batches_streams_after_watermark(db_session, sample_tracks):
+    first, second, _ = sample_tracks
+    _record_history(db_session, sample_tracks)
+
+    batches = list(crud.iter_rank_history_batches(db_session, batch_size=3))
+    incremental = list(
+        crud.iter_rank_history_batches(db_session, since=datetime(2026, 7, 1))
+    )
+
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert batches[-1][-1][2] == datetime(2026, 7, 2)
+    assert sorted(incremental[0]) == [
+        (first.id, 2, datetime(2026, 7, 2)),
+        (second.id, 1, datetime(2026, 7, 2)),
+    ]
+
+
+def test_iter_rating_summary_batches_aggregates_per_track(
+    db_session, user, admin_user, sample_tracks
+):
+    first = sample_tracks[0]
+    db_session.add_all(
+        [
+            models.Rating(track_id=first.id, user_id=user.id, rating=6),
+            models.Rating(track_id=first.id, user_id=admin_user.id, rating=10),
+        ]
+    )
+    db_session.commit()
+
+    rows = [
+        row for batch in crud.iter_rating_summary_batches(db_session) for row in batch
+    ]
+
+    assert rows == [(first.id, 2, 8.0, 6.0, 10.0)]
+
+
+def test_export_analytics_appends_incremental_parts(
+    monkeypatch, tmp_path, session_factory, db_session, sample_tracks
+):
+    _record_history(db_session, sample_tracks)
+    monkeypatch.setattr(analytics_export, "_get_db_session", session_factory)
+
+    first_run = analytics_export.export_analytics(tmp_path)
+    second_run = analytics_export.export_analytics(tmp_path)
+
+    assert first_run["rank_history_rows"] == 4
+    assert first_run["watermark"] == "2026-07-02T00:00:00"
+    assert second_run["rank_history_rows"] == 0
+    assert pq.read_table(tmp_path / "tracks.parquet").num_rows == 3
+    parts = list((tmp_path / "rank_history").glob("part-*.parquet"))
+    assert [pq.read_table(part).num_rows for part in parts] == [4]
@@ -0,0 +1,166 @@
+from datetime import date, datetime, timezone
+
+from app import crud, models
+from app.services import backfill as backfill_service
+
+
+def _fake_page(page: int, date: str | None = None) -> list[dict]:
+    return [
+        {
+            "title": f"Track {rank}",
+            "producer": "Producer A",
+            "voicebank": "Miku",
+            "published_date": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "link": f"https://example.com/history/{rank}",
+            "title_jp": "",
+            "producer_jp": "",
+            "voicebank_jp": "",
+            "image_url": None,
+            "rank": rank,
+        }
+        for rank in range((page - 1) * 50 + 1, page * 50 + 1)
+    ]
+
+
+def test_run_backfill_stores_range_and_checkpoints(monkeypatch, session_factory):
+    fetched = []
+
+    def fake_scrape(page, date=None):
+        fetched.append((date, page))
+        return _fake_page(page, date)
+
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(backfill_service.scraper, "_scrape_single_page", fake_scrape)
+
+    summary = backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 2), request_interval=0
+    )
+
+    assert summary == {"completed": 2, "partial": 0, "failed": 0, "skipped": 0}
+    assert len(fetched) == 12
+    db = session_factory()
+    try:
+        assert db.query(models.RankHistory).count() == 600
+        # Unknown tracks are created off-chart so the current ranking is untouched.
+        assert db.query(models.Track).filter(models.Track.rank.isnot(None)).count() == 0
+        checkpoints = crud.get_backfill_checkpoints(
+            db, date(2026, 7, 1), date(2026, 7, 2)
+        )
+        assert {c.status for c in checkpoints.values()} == {"completed"}
+        snapshots = db.query(models.RankSnapshot).all()
+        assert [s.track_count for s in snapshots] == [300, 300]
+    finally:
+        db.close()
+
+
+def test_run_backfill_skips_complete_dates_and_resumes(monkeypatch, session_factory):
+    fetched = []
+
+    def fake_scrape(page, date=None):
+        fetched.append(date)
+        return _fake_page(page, date)
+
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(backfill_service.scraper, "_scrape_single_page", fake_scrape)
+
+    backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 1), request_interval=0
+    )
+    fetched.clear()
+
+    summary = backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 2), request_interval=0
+    )
+
+    assert summary["skipped"] == 1
+    assert summary["completed"] == 1
+    assert set(fetched) == {"2026-07-02"}
+
+
+def test_run_backfill_force_replaces_rows_without_duplicates(
+    monkeypatch, session_factory
+):
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(backfill_service.scraper, "_scrape_single_page", _fake_page)
+
+    for _ in range(2):
+        backfill_service.run_backfill(
+            date(2026, 7, 1), date(2026, 7, 1), request_interval=0, force=True
+        )
+
+    db = session_factory()
+    try:
+        assert crud.count_rank_history_on_date(db, date(2026, 7, 1)) == 300
+    finally:
+        db.close()
+
+
+def test_run_backfill_force_keeps_live_scrapes_of_the_day(monkeypatch, session_factory):
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(backfill_service.scraper, "_scrape_single_page", _fake_page)
+    db = session_factory()
+    try:
+        track = crud.create_track(db, {**_fake_page(1)[0], "link": "https://live"})
+        db.add(
+            models.RankHistory(
+                track_id=track.id, rank=1, recorded_at=datetime(2026, 7, 1, 14)
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 1), request_interval=0, force=True
+    )
+
+    db = session_factory()
+    try:
+        live = db.query(models.RankHistory).filter(
+            models.RankHistory.recorded_at == datetime(2026, 7, 1, 14)
+        )
+        assert live.count() == 1
+        assert crud.count_rank_history_on_date(db, date(2026, 7, 1)) == 301
+    finally:
+        db.close()
+
+
+def test_run_backfill_failed_write_leaves_no_tracks(monkeypatch, session_factory):
+    def failing_write(db, chart_date, ranks):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(backfill_service.scraper, "_scrape_single_page", _fake_page)
+    monkeypatch.setattr(crud, "replace_rank_history_for_date", failing_write)
+
+    summary = backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 1), request_interval=0
+    )
+
+    assert summary["failed"] == 1
+    db = session_factory()
+    try:
+        assert db.query(models.Track).count() == 0
+    finally:
+        db.close()
+
+
+def test_run_backfill_records_failed_dates(monkeypatch, session_factory):
+    monkeypatch.setattr(backfill_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(
+        backfill_service.scraper, "_scrape_single_page", lambda page, date=None: []
+    )
+
+    summary = backfill_service.run_backfill(
+        date(2026, 7, 1), date(2026, 7, 1), request_interval=0
+    )
+
+    assert summary["failed"] == 1
+    db = session_factory()
+    try:
+        checkpoint = crud.get_backfill_checkpoints(
+            db, date(2026, 7, 1), date(2026, 7, 1)
+        )[date(2026, 7, 1)]
+        assert checkpoint.status == "error"
+    finally:
+        db.close()
@@ -0,0 +1,85 @@
+from datetime import date, datetime
+
+from sqlalchemy import event
+
+from app import crud
+from app.services.charts import chart_diff
+
+
+def _record_charts(db_session, sample_tracks):
+    first, second, old = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(first.id, 1), (second.id, 2), (old.id, 3)]
+    )
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 2), [(second.id, 1), (first.id, 2)]
+    )
+    db_session.commit()
+
+
+def test_chart_diff_between_two_dates(db_session, sample_tracks):
+    first, second, old = sample_tracks
+    _record_charts(db_session, sample_tracks)
+
+    diff = chart_diff(db_session, datetime(2026, 7, 1), datetime(2026, 7, 2))
+
+    assert diff is not None
+    assert diff["from"] == "2026-07-01T00:00:00"
+    assert diff["entered"] == []
+    assert [item["track_id"] for item in diff["dropped"]] == [old.id]
+    assert [(item["track_id"], item["change"]) for item in diff["moved"]] == [
+        (second.id, 1),
+        (first.id, -1),
+    ]
+    assert diff["unchanged_count"] == 0
+    assert "unchanged" not in diff
+
+
+def test_chart_diff_against_current_chart(db_session, sample_tracks):
+    first, second, old = sample_tracks
+    _record_charts(db_session, sample_tracks)
+    # Current chart from the fixture: first=1, second=2, old unranked.
+
+    diff = chart_diff(db_session, datetime(2026, 7, 2), include_unchanged=True)
+
+    assert diff is not None
+    assert diff["to"] is None
+    assert [item["track_id"] for item in diff["moved"]] == [first.id, second.id]
+    assert diff["unchanged"] == []
+    assert diff["unchanged_count"] == 0
+
+
+def test_chart_diff_reports_entries_and_missing_snapshots(db_session, sample_tracks):
+    first, second, _ = sample_tracks
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 1), [(first.id, 1)])
+    db_session.commit()
+
+    diff = chart_diff(db_session, datetime(2026, 7, 1))
+
+    assert diff is not None
+    assert [item["track_id"] for item in diff["entered"]] == [second.id]
+    assert diff["unchanged_count"] == 1
+    assert chart_diff(db_session, datetime(2026, 6, 30)) is None
+
+
+def test_chart_diff_runs_one_query(db_session, sample_tracks):
+    _record_charts(db_session, sample_tracks)
+    statements = []
+    engine = db_session.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        diff = chart_diff(db_session, datetime(2026, 7, 1, 12), datetime(2026, 7, 3))
+        missing_until = chart_diff(
+            db_session, datetime(2026, 7, 1), datetime(2026, 6, 30)
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 2
+    assert diff is not None
+    assert (diff["from"], diff["to"]) == ("2026-07-01T00:00:00", "2026-07-02T00:00:00")
+    assert missing_until is None
@@ -0,0 +1,99 @@
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+
+from app import crud, models
+
+
+def _stats_by_track(db_session):
+    return {
+        stats.track_id: (
+            stats.peak_rank,
+            stats.debut_at,
+            stats.last_seen_at,
+            stats.days_on_chart,
+            stats.current_streak,
+            stats.longest_streak,
+        )
+        for stats in db_session.query(models.TrackChartStats)
+    }
+
+
+def test_incremental_chart_stats_match_rebuild(db_session, sample_tracks):
+    first, second, old = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(first.id, 3), (old.id, 1)]
+    )
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 2), [(first.id, 2), (old.id, 2)]
+    )
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 4), [(old.id, 4)])
+    # Current chart from the fixture: first=1, second=2.
+    crud.snapshot_current_ranks(db_session, datetime(2026, 7, 5, 12, 0))
+    db_session.commit()
+
+    incremental = _stats_by_track(db_session)
+    assert incremental[first.id][0] == 1
+    assert incremental[first.id][3] == 3
+    assert incremental[old.id][3:] == (3, 1, 2)
+    assert incremental[second.id][1] == datetime(2026, 7, 5, 12, 0)
+
+    assert crud.rebuild_track_chart_stats(db_session) == 3
+    db_session.commit()
+    assert _stats_by_track(db_session) == incremental
+
+
+def test_backfilled_day_recounts_streaks(db_session, sample_tracks):
+    first = sample_tracks[0]
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 1), [(first.id, 5)])
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 3), [(first.id, 4)])
+    # Backfilling the gap arrives out of order and joins the two runs.
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [(first.id, 2)])
+    db_session.commit()
+
+    stats = db_session.get(models.TrackChartStats, first.id)
+    assert stats.debut_at == datetime(2026, 7, 1)
+    assert stats.peak_rank == 2
+    assert (stats.days_on_chart, stats.current_streak, stats.longest_streak) == (
+        3,
+        3,
+        3,
+    )
+
+    # Re-fetching a day without the track removes that appearance again.
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [])
+    db_session.commit()
+    stats = db_session.get(models.TrackChartStats, first.id)
+    assert (stats.peak_rank, stats.days_on_chart, stats.longest_streak) == (4, 2, 1)
+
+
+def test_get_tracks_sorts_by_chart_stats(db_session, sample_tracks):
+    first, second, old = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(second.id, 1), (first.id, 2)]
+    )
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [(first.id, 1)])
+    db_session.commit()
+
+    by_days = crud.get_tracks(
+        db_session, sort_by="days_on_chart", sort_dir="desc", rank_filter="all"
+    )
+    by_debut = crud.get_tracks(db_session, sort_by="debut_date", rank_filter="all")
+
+    assert [track.id for track in by_days] == [first.id, second.id, old.id]
+    assert [track.id for track in by_debut][-1] == old.id
+    assert by_days[0].to_dict()["days_on_chart"] == 2
+    assert by_days[0].to_dict()["debut_date"] == "2026-07-01"
+    assert by_days[0].to_dict()["peak_rank"] == 1
+    assert by_days[2].to_dict()["peak_rank"] is None
+
+
+def test_chart_stats_load_only_where_tracks_are_serialized(db_session, sample_tracks):
+    db_session.expunge_all()
+
+    plain = db_session.query(models.Track).first()
+    assert "chart_stats" in inspect(plain).unloaded
+
+    db_session.expunge_all()
+    listed = crud.get_tracks(db_session, rank_filter="all")
+    assert all("chart_stats" not in inspect(track).unloaded for track in listed)
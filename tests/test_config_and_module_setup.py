@@ -8,6 +8,8 @@ def test_config_helpers_cover_environment_branches(monkeypatch, tmp_path: Path):
     monkeypatch.delenv("DATABASE_URL", raising=False)
     monkeypatch.delenv("RUN_MIGRATIONS_ON_STARTUP", raising=False)
     monkeypatch.delenv("SECRET_KEY", raising=False)
+    monkeypatch.delenv("VOCALOARD_BASE_URL", raising=False)
+    monkeypatch.delenv("RANK_HISTORY_RETENTION_DAYS", raising=False)
     monkeypatch.setenv("DATA_DIR", str(tmp_path))
 
     assert config.is_frozen_build() is False
@@ -18,6 +20,8 @@ def test_config_helpers_cover_environment_branches(monkeypatch, tmp_path: Path):
     assert config.should_use_secure_cookies() is False
     assert config.should_run_migrations_on_startup() is True
     assert config.get_secret_key() is None
+    assert config.get_vocaloard_base_url() == "https://vocaloard.injpok.tokyo"
+    assert config.get_rank_history_retention_days() == 180
 
     monkeypatch.setattr(config.sys, "frozen", True, raising=False)
     assert config.get_database_url() is None
@@ -26,12 +30,16 @@ def test_config_helpers_cover_environment_branches(monkeypatch, tmp_path: Path):
     monkeypatch.setenv("DATABASE_URL", "postgres://example")
     monkeypatch.setenv("RUN_MIGRATIONS_ON_STARTUP", "false")
     monkeypatch.setenv("SECRET_KEY", "secret")
+    monkeypatch.setenv("VOCALOARD_BASE_URL", "http://127.0.0.1:8765/")
+    monkeypatch.setenv("RANK_HISTORY_RETENTION_DAYS", "30")
 
     assert config.get_database_url() == "postgres://example"
     assert config.is_local_mode() is False
     assert config.should_use_secure_cookies() is True
     assert config.should_run_migrations_on_startup() is False
     assert config.get_secret_key() == "secret"
+    assert config.get_vocaloard_base_url() == "http://127.0.0.1:8765"
+    assert config.get_rank_history_retention_days() == 30
 
 
 def test_constants_and_database_modules_cover_fallback_paths(
@@ -51,8 +59,7 @@ def test_constants_and_database_modules_cover_fallback_paths(
     constants = importlib.reload(constants_module)
     database = importlib.reload(database_module)
     try:
-        assert constants.SCRAPE_STATUS_FILE.endswith("scrape_status.txt")
-        assert "/tmp" in constants.SCRAPE_STATUS_FILE.replace("\\", "/")
+        assert constants.DATA_DIR == str(tmp_path)
         assert database.SQLALCHEMY_DATABASE_URL.startswith("sqlite:///")
         assert database.connect_args["check_same_thread"] is False
         assert Path(constants.get_resource_base_path()).exists()
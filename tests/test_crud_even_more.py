@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 import pytest
 from sqlalchemy.exc import IntegrityError
 
-from app import crud, models
+from app import crud, models, schemas
 
 
 def test_create_rating_rejects_invalid_score(db_session, user, sample_tracks):
@@ -42,6 +42,30 @@ def test_create_rating_recovers_from_integrity_error(
     assert rating.rating == 8
 
 
+def test_create_rating_recovers_from_concurrent_insert(
+    monkeypatch, session_factory, db_session, user, sample_tracks
+):
+    track_id = sample_tracks[0].id
+    real_entity_keys = crud._track_entity_keys
+
+    def entity_keys_after_concurrent_insert(db, track_id):
+        # Another request inserts the same rating between the lookup and ours.
+        monkeypatch.setattr(crud, "_track_entity_keys", real_entity_keys)
+        with session_factory() as other:
+            crud.create_rating(other, track_id, user.id, 6)
+        return real_entity_keys(db, track_id)
+
+    monkeypatch.setattr(crud, "_track_entity_keys", entity_keys_after_concurrent_insert)
+
+    rating = crud.create_rating(db_session, track_id, user.id, 8)
+
+    assert rating.rating == 8
+    assert db_session.query(models.Rating).count() == 1
+    assert crud.get_user_entity_averages(db_session, user.id, "producer") == {
+        producer.id: 8.0 for producer in sample_tracks[0].producers
+    }
+
+
 def test_get_rating_statistics_returns_empty_defaults(db_session, user):
     stats = crud.get_rating_statistics(db_session, user.id)
 
@@ -83,6 +107,67 @@ def test_playlist_mutation_helpers_return_none_or_noop_when_missing(db_session,
     crud.reorder_playlist(db_session, 999, [1, 2], user.id)
 
 
+def test_playlist_moves_write_one_row_until_a_gap_runs_out(
+    db_session, user, sample_tracks
+):
+    playlist = crud.create_playlist(
+        db_session, user.id, schemas.PlaylistCreate(name="Gaps", is_public=True)
+    )
+    first, second, third = (track.id for track in sample_tracks)
+    for track_id in (first, second, third):
+        crud.add_track_to_playlist(db_session, playlist.id, track_id, user.id)
+
+    def positions():
+        db_session.expire_all()
+        return {
+            item.track_id: item.position
+            for item in db_session.query(models.PlaylistTrack).filter_by(
+                playlist_id=playlist.id
+            )
+        }
+
+    gap = crud.PLAYLIST_POSITION_GAP
+    assert positions() == {first: 0, second: gap, third: 2 * gap}
+
+    assert crud.move_playlist_track(db_session, playlist.id, third, 1, user.id)
+    assert positions() == {first: 0, second: gap, third: gap // 2}
+
+    crud.remove_track_from_playlist(db_session, playlist.id, first, user.id)
+    assert positions() == {second: gap, third: gap // 2}
+
+    # Squeeze the gap shut, then move into it: the playlist is renumbered.
+    db_session.query(models.PlaylistTrack).filter_by(
+        playlist_id=playlist.id, track_id=third
+    ).update({"position": gap - 1})
+    db_session.add(
+        models.PlaylistTrack(playlist_id=playlist.id, track_id=first, position=0)
+    )
+    db_session.commit()
+    assert crud.move_playlist_track(db_session, playlist.id, first, 1, user.id)
+    assert positions() == {third: gap, first: gap + gap // 2, second: 2 * gap}
+
+
+def test_playlist_move_past_the_end_appends(db_session, user, sample_tracks):
+    playlist = crud.create_playlist(
+        db_session, user.id, schemas.PlaylistCreate(name="Tail", is_public=False)
+    )
+    first, second, third = (track.id for track in sample_tracks)
+    for track_id in (first, second, third):
+        crud.add_track_to_playlist(db_session, playlist.id, track_id, user.id)
+
+    assert crud.move_playlist_track(db_session, playlist.id, first, 10, user.id)
+    assert crud.move_playlist_track(db_session, playlist.id, first, 10, user.id)
+
+    db_session.expire_all()
+    order = [
+        item.track_id
+        for item in db_session.query(models.PlaylistTrack)
+        .filter_by(playlist_id=playlist.id)
+        .order_by(models.PlaylistTrack.position)
+    ]
+    assert order == [second, third, first]
+
+
 def test_track_playlist_membership_handles_non_member_lists(
     db_session, user, playlist, sample_tracks
 ):
@@ -1,3 +1,5 @@
+import pytest
+
 from app import crud, models
 
 
@@ -56,6 +58,55 @@ def test_import_playlists_updates_existing_playlist_contents(
     }
 
 
+def test_import_ratings_upserts_and_creates_tracks_in_bulk(
+    db_session, user, sample_tracks
+):
+    crud.create_rating(db_session, sample_tracks[0].id, user.id, 4.0, notes="old")
+    backup = [
+        {"link": sample_tracks[0].link, "rating": 9.0, "notes": "new"},
+        {
+            "link": "https://example.com/restored",
+            "title": "Restored",
+            "producer": "Producer A, Producer C",
+            "voicebank": "Miku",
+            "published_date": "2026-01-01T00:00:00+00:00",
+            "producer_jp": ", C",
+            "rating": 7.0,
+        },
+        {"link": sample_tracks[1].link, "rating": None},
+    ]
+
+    created, updated = crud.import_ratings(db_session, user.id, backup)
+
+    assert (created, updated) == (1, 2)
+    restored = crud.get_track_by_link(db_session, "https://example.com/restored")
+    assert [p.name for p in restored.producers] == ["Producer A", "Producer C"]
+    assert restored.producers[1].name_jp == "C"
+    ratings = {
+        rating.track_id: (rating.rating, rating.notes)
+        for rating in db_session.query(models.Rating).filter_by(user_id=user.id)
+    }
+    assert ratings == {sample_tracks[0].id: (9.0, "new"), restored.id: (7.0, None)}
+    producer_a = db_session.query(models.Producer).filter_by(name="Producer A").one()
+    assert crud.get_user_entity_averages(db_session, user.id, "producer")[
+        producer_a.id
+    ] == pytest.approx(8.0)
+
+
+def test_import_ratings_rejects_invalid_rating_without_writing(
+    db_session, user, sample_tracks
+):
+    backup = [
+        {"link": sample_tracks[0].link, "rating": 8.0},
+        {"link": sample_tracks[1].link, "rating": 11.0},
+    ]
+
+    with pytest.raises(ValueError):
+        crud.import_ratings(db_session, user.id, backup)
+
+    assert db_session.query(models.Rating).count() == 0
+
+
 def test_rating_statistics_returns_distribution_and_top_entities(
     db_session,
     user,
@@ -74,7 +125,7 @@ def test_rating_statistics_returns_distribution_and_top_entities(
             "rank": idx,
         }
         track = crud.create_track(db_session, track_data)
-        db_session.add(models.Rating(track_id=track.id, user_id=user.id, rating=rating))
+        crud.create_rating(db_session, track.id, user.id, rating)
     db_session.commit()
 
     stats = crud.get_rating_statistics(db_session, user.id)
@@ -87,6 +138,31 @@ def test_rating_statistics_returns_distribution_and_top_entities(
     assert stats["rating_distribution"] == {9.0: 1, 8.0: 1, 7.0: 1}
 
 
+def test_rating_statistics_median_from_histogram_and_cache_invalidation(
+    db_session, user, sample_tracks
+):
+    first, second, old = sample_tracks
+    crud.create_rating(db_session, first.id, user.id, 9)
+    crud.create_rating(db_session, second.id, user.id, 4)
+
+    stats = crud.get_rating_statistics(db_session, user.id)
+    assert stats["median_rating"] == 6.5
+    assert crud.get_rating_statistics(db_session, user.id) is stats
+
+    crud.create_rating(db_session, old.id, user.id, 4)
+    stats = crud.get_rating_statistics(db_session, user.id)
+
+    assert stats["total_ratings"] == 3
+    assert stats["median_rating"] == 4
+    assert stats["rating_distribution"] == {9.0: 1, 4.0: 2}
+
+
+def test_histogram_median_handles_empty_and_even_histograms():
+    assert crud._histogram_median([]) == 0.0
+    assert crud._histogram_median([(3.0, 2), (8.0, 2)]) == 5.5
+    assert crud._histogram_median([(3.0, 1), (8.0, 3)]) == 8.0
+
+
 def test_recommendations_prefer_matching_highly_rated_producer(
     db_session,
     user,
@@ -111,7 +187,7 @@ def test_recommendations_prefer_matching_highly_rated_producer(
             "rank": idx,
         }
         track = crud.create_track(db_session, track_data)
-        db_session.add(models.Rating(track_id=track.id, user_id=user.id, rating=rating))
+        crud.create_rating(db_session, track.id, user.id, rating)
 
     recommended_data = {
         "title": "Should Recommend",
@@ -148,6 +224,73 @@ def test_recommendations_prefer_matching_highly_rated_producer(
     assert all(track.title != "Should Not Recommend" for track in recommendations)
 
 
+def test_recommendation_index_rebuilds_on_writes_from_other_processes(
+    db_session, sample_tracks
+):
+    index = crud.get_recommendation_index(db_session)
+    assert crud.get_recommendation_index(db_session) is index
+
+    # Writes that bypass crud (another process) bump the catalog version.
+    db_session.add(models.UpdateLog())
+    db_session.commit()
+    rebuilt = crud.get_recommendation_index(db_session)
+
+    assert rebuilt is not index
+    assert crud.get_recommendation_index(db_session) is rebuilt
+
+
+def test_recommendations_recency_bias_and_index_refresh(
+    db_session, user, sample_tracks
+):
+    from datetime import datetime, timedelta
+
+    first, second, old = sample_tracks
+    crud.create_rating(db_session, first.id, user.id, 9)
+    crud.create_rating(db_session, old.id, user.id, 3)
+    db_session.commit()
+
+    # Only "Second Track" is unrated; it shares no rated producer or voicebank.
+    assert crud.get_recommended_tracks(db_session, user.id) == []
+    boosted = crud.get_recommended_tracks(db_session, user.id, recent_bias="strong")
+    assert [track.id for track in boosted] == [second.id]
+
+    stale = crud.create_track(
+        db_session,
+        {
+            "title": "Years Old",
+            "producer": "Producer Z",
+            "voicebank": "Gumi",
+            "published_date": datetime.now() - timedelta(days=3000),
+            "link": "https://example.com/reco/old",
+            "title_jp": "",
+            "producer_jp": "",
+            "voicebank_jp": "",
+            "image_url": None,
+            "rank": None,
+        },
+    )
+    same_producer = crud.create_track(
+        db_session,
+        {
+            "title": "Same Producer",
+            "producer": "Producer A",
+            "voicebank": "Miku",
+            "published_date": datetime.now() - timedelta(days=3000),
+            "link": "https://example.com/reco/same",
+            "title_jp": "",
+            "producer_jp": "",
+            "voicebank_jp": "",
+            "image_url": None,
+            "rank": None,
+        },
+    )
+
+    boosted = crud.get_recommended_tracks(db_session, user.id, recent_bias="strong")
+    ids = [track.id for track in boosted]
+    assert same_producer.id in ids
+    assert stale.id not in ids
+
+
 def test_playlist_snapshot_filters_unrated_tracks(db_session, user, sample_tracks):
     db_session.add(
         models.Rating(track_id=sample_tracks[0].id, user_id=user.id, rating=8)
@@ -27,9 +27,11 @@ async def test_app_lifespan_skips_migrations_and_scrape_when_tracks_exist(monkey
     )
     monkeypatch.setattr(
         main,
-        "set_initial_scrape_in_progress",
-        lambda value: (_ for _ in ()).throw(AssertionError("should not scrape")),
+        "enqueue_initial_scrape",
+        lambda: (_ for _ in ()).throw(AssertionError("should not scrape")),
     )
+    monkeypatch.setattr(main, "start_scrape_worker", lambda: None)
+    monkeypatch.setattr(main, "stop_scrape_worker", lambda: None)
 
     async with main.app_lifespan(main.app):
         pass
@@ -50,27 +52,26 @@ async def test_app_lifespan_runs_migrations_and_initial_scrape_when_empty(monkey
         def close(self):
             pass
 
-    seen = {"upgrade": False, "scrape_started": False, "thread_started": False}
-
-    class FakeThread:
-        def __init__(self, target):
-            seen["scrape_started"] = target is main.initial_scrape_task
-
-        def start(self):
-            seen["thread_started"] = True
+    seen = {"upgrade": False, "scrape_queued": False}
+    worker_calls: list[str] = []
 
     monkeypatch.setattr(main, "should_run_migrations_on_startup", lambda: True)
     monkeypatch.setattr(main, "SessionLocal", lambda: FakeSession())
     monkeypatch.setattr(
         main.command, "upgrade", lambda cfg, head: seen.update(upgrade=True)
     )
-    monkeypatch.setattr(main.threading, "Thread", FakeThread)
-    monkeypatch.setattr(main, "set_initial_scrape_in_progress", lambda value: None)
-    monkeypatch.setattr(main, "write_scrape_status", lambda value: None)
+    monkeypatch.setattr(
+        main, "enqueue_initial_scrape", lambda: seen.update(scrape_queued=True)
+    )
+    monkeypatch.setattr(main, "is_vercel", lambda: False)
+    monkeypatch.setattr(
+        main, "start_scrape_worker", lambda: worker_calls.append("start")
+    )
+    monkeypatch.setattr(main, "stop_scrape_worker", lambda: worker_calls.append("stop"))
 
     async with main.app_lifespan(main.app):
         pass
 
     assert seen["upgrade"] is True
-    assert seen["scrape_started"] is True
-    assert seen["thread_started"] is True
+    assert seen["scrape_queued"] is True
+    assert worker_calls == ["start", "stop"]
@@ -1,4 +1,4 @@
-from app.services import scraping as scraping_service
+from app import crud
 
 
 def test_root_loads_when_unauthenticated(client_factory):
@@ -25,11 +25,11 @@ def test_root_renders_track_listing_for_authenticated_user(
 
 def test_root_shows_scraping_page_when_initial_scrape_is_running(
     client_factory,
-    monkeypatch,
+    db_session,
     user,
 ):
     client = client_factory(optional_user=user)
-    monkeypatch.setattr(scraping_service, "initial_scrape_in_progress", True)
+    crud.enqueue_scrape_job(db_session, "initial")
 
     response = client.get("/")
 
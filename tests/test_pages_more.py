@@ -24,6 +24,9 @@ def test_playlist_edit_page_renders_for_owner(client_factory, user, playlist):
 
     assert response.status_code == 200
     assert "Favorites" in response.text
+    assert "First Track" in response.text
+    # Tracks outside the playlist come from the search API, not the page.
+    assert "Old Track" not in response.text
 
 
 def test_playlist_edit_page_reflects_private_visibility(
@@ -123,3 +126,93 @@ def test_login_and_register_pages_render_when_not_local(client_factory, monkeypa
 
     assert login_response.status_code == 200
     assert register_response.status_code == 200
+
+
+def test_history_page_renders_snapshot_chart_with_cache_headers(
+    client_factory, db_session, sample_tracks
+):
+    from datetime import date
+
+    from app import crud
+
+    first, second, old = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(old.id, 1), (first.id, 2)]
+    )
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [(second.id, 1)])
+    db_session.commit()
+
+    response = client_factory().get("/history/2026-07-01")
+
+    assert response.status_code == 200
+    assert "Old Track" in response.text
+    assert "First Track" in response.text
+    assert "Second Track" not in response.text
+    assert response.headers["Cache-Control"] == "public, max-age=86400"
+
+    next_day = client_factory().get("/history/2026-07-02")
+
+    assert "Second Track" in next_day.text
+    assert "(new)" in next_day.text
+
+
+def test_history_page_is_privately_cached_for_signed_in_users(
+    client_factory, db_session, user, sample_tracks
+):
+    from datetime import date
+
+    from app import crud
+
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(sample_tracks[0].id, 1)]
+    )
+    db_session.commit()
+
+    response = client_factory(optional_user=user).get("/history/2026-07-01")
+
+    assert response.headers["Cache-Control"] == "private, max-age=86400"
+
+
+def test_history_date_picker_lists_snapshot_dates_newest_first(
+    client_factory, db_session, sample_tracks
+):
+    from datetime import date, datetime
+
+    from app import crud
+
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(sample_tracks[0].id, 1)]
+    )
+    crud.snapshot_current_ranks(db_session, datetime(2026, 7, 2, 9, 30))
+    crud.snapshot_current_ranks(db_session, datetime(2026, 7, 2, 21, 0))
+    db_session.commit()
+
+    assert crud.get_available_dates(db_session) == ["2026-07-02", "2026-07-01"]
+
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 3), [(sample_tracks[0].id, 1)]
+    )
+    db_session.commit()
+    crud.invalidate_rank_snapshot_caches()
+
+    response = client_factory().get("/history/2026-07-01")
+
+    assert response.status_code == 200
+    assert crud.get_available_dates(db_session)[0] == "2026-07-03"
+    assert 'value="2026-07-03"' in response.text
+
+
+def test_playlists_page_lists_public_directory_for_guests(
+    client_factory, db_session, user, playlist
+):
+    user.username = "miku_fan"
+    user.is_profile_public = True
+    db_session.commit()
+    client = client_factory()
+
+    response = client.get("/playlists")
+
+    assert response.status_code == 200
+    assert "Favorites" in response.text
+    assert "2 tracks" in response.text
+    assert 'href="/user/miku_fan"' in response.text
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from app import crud
+from app.services.playlist_view import playlist_view
+
+
+def test_playlist_view_pages_and_counts_in_one_pass(db_session, playlist):
+    first_page = playlist_view(db_session, playlist, page=1, limit="1")
+    second_page = playlist_view(
+        db_session, playlist, page=2, limit="1", include_facets=False
+    )
+    past_end = playlist_view(
+        db_session, playlist, page=5, limit="1", include_facets=False
+    )
+
+    assert [track.title for track in first_page["tracks"]] == ["First Track"]
+    assert [track.title for track in second_page["tracks"]] == ["Second Track"]
+    assert first_page["pagination"]["total_tracks"] == 2
+    assert first_page["pagination"]["total_pages"] == 2
+    assert past_end["tracks"] == []
+    assert past_end["pagination"]["total_tracks"] == 2
+    assert "all_producers" not in second_page
+    assert first_page["all_producers"] == ["Producer A", "Producer B"]
+    assert first_page["all_voicebanks"] == ["Luka", "Miku"]
+
+
+def test_playlist_view_filters_and_localizes_facets(db_session, playlist):
+    track = crud.create_track(
+        db_session,
+        {
+            "title": "Third Track",
+            "producer": "Producer C",
+            "voicebank": "GUMI",
+            "published_date": datetime(2026, 1, 1),
+            "link": "https://example.com/gumi",
+            "voicebank_jp": "グミ",
+        },
+    )
+    crud.add_track_to_playlist(db_session, playlist.id, track.id, playlist.user_id)
+
+    view = playlist_view(
+        db_session, playlist, producer_filter="Producer B", locale="ja"
+    )
+
+    assert [track.title for track in view["tracks"]] == ["Second Track"]
+    assert view["pagination"]["total_tracks"] == 1
+    assert view["all_voicebanks"] == ["Luka", "Miku", "グミ"]
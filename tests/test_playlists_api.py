@@ -71,6 +71,37 @@ def test_add_remove_and_reorder_playlist_tracks(
     ]
 
 
+def test_reorder_accepts_single_track_move(
+    client_factory, db_session, user, playlist, sample_tracks
+):
+    client = client_factory(current_user=user)
+    client.post(f"/api/playlists/{playlist.id}/tracks/{sample_tracks[2].id}")
+
+    move_response = client.post(
+        f"/api/playlists/{playlist.id}/reorder",
+        json={"track_id": sample_tracks[2].id, "index": 0},
+    )
+    missing_response = client.post(
+        f"/api/playlists/{playlist.id}/reorder",
+        json={"track_id": 999, "index": 0},
+    )
+
+    assert move_response.status_code == 200
+    assert missing_response.status_code == 404
+    db_session.expire_all()
+    associations = (
+        db_session.query(models.PlaylistTrack)
+        .filter(models.PlaylistTrack.playlist_id == playlist.id)
+        .order_by(models.PlaylistTrack.position.asc())
+        .all()
+    )
+    assert [item.track_id for item in associations] == [
+        sample_tracks[2].id,
+        sample_tracks[0].id,
+        sample_tracks[1].id,
+    ]
+
+
 def test_export_single_playlist_returns_tracks(client_factory, user, playlist):
     client = client_factory(current_user=user)
 
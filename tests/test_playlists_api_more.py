@@ -1,3 +1,6 @@
+from app import crud, schemas
+
+
 def test_get_user_playlists_endpoint_returns_list(client_factory, user, playlist):
     client = client_factory(current_user=user)
 
@@ -81,3 +84,38 @@ def test_delete_playlist_returns_404_when_missing(client_factory, user):
     response = client.delete("/api/playlists/999")
 
     assert response.status_code == 404
+
+
+def test_public_playlists_page_by_cursor_with_aggregates(
+    client_factory, db_session, user, playlist, monkeypatch
+):
+    hidden = crud.create_playlist(
+        db_session, user.id, schemas.PlaylistCreate(name="Hidden", is_public=False)
+    )
+    newer = crud.create_playlist(
+        db_session, user.id, schemas.PlaylistCreate(name="Newer")
+    )
+    monkeypatch.setattr(
+        "app.routers.playlists.PUBLIC_PLAYLIST_PAGE_SIZE", 1, raising=True
+    )
+    client = client_factory()
+
+    first = client.get("/api/playlists/public").json()
+    second = client.get(
+        "/api/playlists/public", params={"after": first["next_cursor"]}
+    ).json()
+
+    assert [entry["name"] for entry in first["playlists"]] == ["Newer"]
+    assert first["playlists"][0]["track_count"] == 0
+    assert second["next_cursor"] is None
+    favorites = second["playlists"][0]
+    assert favorites["name"] == "Favorites"
+    assert favorites["track_count"] == 2
+    assert favorites["owner_username"] == user.username
+    listed = first["playlists"] + second["playlists"]
+    assert hidden.id not in {entry["id"] for entry in listed}
+
+    # The cached first page is dropped when a public playlist changes.
+    crud.delete_playlist(db_session, newer.id, user.id)
+    refreshed = client.get("/api/playlists/public").json()
+    assert [entry["name"] for entry in refreshed["playlists"]] == ["Favorites"]
@@ -1,6 +1,6 @@
 import re
 
-from app import auth, main, models
+from app import auth, crud, main, models, schemas
 
 
 def test_registration_assigns_unique_username(client_factory, db_session, monkeypatch):
@@ -98,3 +98,54 @@ def test_profile_formats_whole_number_track_ratings_without_decimal(
     assert response.status_code == 200
     assert re.search(r"10\s+★", response.text)
     assert "10.0 ★" not in response.text
+
+
+def test_public_profile_is_cached_until_owner_writes(
+    client_factory, db_session, user, sample_tracks
+):
+    user.username = "cached_profile"
+    user.is_profile_public = True
+    db_session.commit()
+    crud.create_rating(db_session, sample_tracks[0].id, user.id, 9.0)
+    client = client_factory()
+
+    response = client.get("/user/cached_profile")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "First" in response.text
+
+    # Writes that bypass crud are not seen until the cache is invalidated.
+    db_session.add(
+        models.Rating(track_id=sample_tracks[1].id, user_id=user.id, rating=8.0)
+    )
+    db_session.commit()
+    response = client.get("/user/CACHED_PROFILE", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    crud.create_playlist(
+        db_session,
+        user.id,
+        schemas.PlaylistCreate(name="Cached Mix", description=None, is_public=True),
+    )
+    response = client.get("/user/cached_profile", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Cached Mix" in response.text
+    assert "Second" in response.text
+
+
+def test_cached_profile_view_rechecks_privacy(
+    client_factory, db_session, user, sample_tracks
+):
+    user.username = "going_private"
+    user.is_profile_public = True
+    db_session.commit()
+    client = client_factory()
+    assert client.get("/user/going_private").status_code == 200
+
+    # Another worker makes the profile private; this process's cache is stale.
+    user.is_profile_public = False
+    db_session.commit()
+
+    assert client.get("/user/going_private").status_code == 403
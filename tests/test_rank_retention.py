@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import crud, models
+from app.services import rank_retention
+
+
+def _seed_daily_charts(session_factory, days: int) -> list[int]:
+    db = session_factory()
+    try:
+        track_ids = []
+        for number in range(1, 4):
+            track = models.Track(
+                title=f"Track {number}",
+                producer="Producer A",
+                voicebank="Miku",
+                published_date=datetime(2026, 1, 1),
+                link=f"https://example.com/retention/{number}",
+            )
+            db.add(track)
+            db.flush()
+            track_ids.append(track.id)
+        for offset in range(days):
+            # Rotate the chart so every day differs.
+            ranked = track_ids[offset % 3 :] + track_ids[: offset % 3]
+            crud.replace_rank_history_for_date(
+                db,
+                date(2026, 6, 1) + timedelta(days=offset),
+                [(track_id, rank) for rank, track_id in enumerate(ranked, start=1)],
+            )
+        db.commit()
+        return track_ids
+    finally:
+        db.close()
+
+
+def test_compact_rank_history_keeps_recent_days_and_weekly_older(
+    monkeypatch, session_factory
+):
+    _seed_daily_charts(session_factory, days=20)
+    monkeypatch.setattr(rank_retention, "_get_db_session", session_factory)
+
+    summary = rank_retention.compact_rank_history(
+        keep_days=7, now=datetime(2026, 6, 21)
+    )
+
+    # 06-01..06-13 are older than the cutoff; weeks open on 06-01 and 06-08.
+    assert summary["snapshots_removed"] == 11
+    assert summary["rows_removed"] == 33
+    db = session_factory()
+    try:
+        kept = [ts.date() for ts in crud.get_rank_snapshot_timestamps(db)]
+        assert kept[:2] == [date(2026, 6, 1), date(2026, 6, 8)]
+        assert kept[2:] == [date(2026, 6, 14) + timedelta(days=i) for i in range(7)]
+        assert db.query(models.RankHistory).count() == 27
+        # Mid-week lookups resolve to the week's opening chart.
+        as_of = crud.get_tracks_as_of(db, datetime(2026, 6, 10))
+        assert [t["rank"] for t in as_of] == [1, 2, 3]
+        assert as_of == crud.get_tracks_as_of(db, datetime(2026, 6, 8))
+        history = crud.get_track_rank_history(db, as_of[0]["id"])
+        assert len(history) == 9
+    finally:
+        db.close()
+
+
+def test_compact_rank_history_dry_run_reports_without_deleting(
+    monkeypatch, session_factory
+):
+    _seed_daily_charts(session_factory, days=10)
+    monkeypatch.setattr(rank_retention, "_get_db_session", session_factory)
+
+    summary = rank_retention.compact_rank_history(
+        keep_days=2, now=datetime(2026, 6, 11), dry_run=True
+    )
+
+    assert summary["snapshots_removed"] == 6
+    assert summary["rows_removed"] == 18
+    db = session_factory()
+    try:
+        assert db.query(models.RankSnapshot).count() == 10
+    finally:
+        db.close()
+
+
+def test_compact_rank_history_rejects_empty_window():
+    with pytest.raises(ValueError):
+        rank_retention.compact_rank_history(keep_days=0)
+
+
+def test_chart_stats_survive_compaction_and_rebuild(monkeypatch, session_factory):
+    track_ids = _seed_daily_charts(session_factory, days=20)
+    monkeypatch.setattr(rank_retention, "_get_db_session", session_factory)
+
+    def chart_stats(db):
+        return {
+            stats.track_id: (
+                stats.peak_rank,
+                stats.debut_at,
+                stats.last_seen_at,
+                stats.days_on_chart,
+                stats.current_streak,
+                stats.longest_streak,
+            )
+            for stats in db.query(models.TrackChartStats)
+        }
+
+    db = session_factory()
+    try:
+        expected = chart_stats(db)
+    finally:
+        db.close()
+    assert {stats[3] for stats in expected.values()} == {20}
+
+    # A second, later compaction folds onto the first one's baselines.
+    for now, keep_days in ((datetime(2026, 6, 21), 7), (datetime(2026, 6, 24), 3)):
+        rank_retention.compact_rank_history(keep_days=keep_days, now=now)
+        db = session_factory()
+        try:
+            assert crud.rebuild_track_chart_stats(db) == 3
+            db.commit()
+            assert chart_stats(db) == expected
+            # Re-fetching a kept day rebuilds the replaced tracks only.
+            crud.replace_rank_history_for_date(
+                db,
+                date(2026, 6, 20),
+                [
+                    (track_id, rank)
+                    for rank, track_id in enumerate(
+                        track_ids[1:] + track_ids[:1], start=1
+                    )
+                ],
+            )
+            db.commit()
+            db.expire_all()
+            assert chart_stats(db) == expected
+        finally:
+            db.close()
@@ -0,0 +1,147 @@
+from app import crud, models
+from app.services import scrape_worker
+from app.services import scraping as scraping_service
+
+
+def test_enqueue_scrape_job_reuses_active_job(db_session):
+    first, created = crud.enqueue_scrape_job(db_session, "update")
+    second, created_again = crud.enqueue_scrape_job(db_session, "initial")
+
+    assert created is True
+    assert created_again is False
+    assert second.id == first.id
+
+
+def test_enqueue_scrape_job_rejects_concurrent_duplicate(monkeypatch, session_factory):
+    first_db, second_db = session_factory(), session_factory()
+    real_get_active = crud.get_active_scrape_job
+    concurrent = {}
+
+    def get_active_then_race(db, kind=None):
+        # Another caller enqueues between our check and our commit.
+        monkeypatch.setattr(crud, "get_active_scrape_job", real_get_active)
+        concurrent["job"], concurrent["created"] = crud.enqueue_scrape_job(
+            second_db, "update"
+        )
+        return None
+
+    monkeypatch.setattr(crud, "get_active_scrape_job", get_active_then_race)
+    try:
+        job, created = crud.enqueue_scrape_job(first_db, "update")
+
+        assert concurrent["created"] is True
+        assert created is False
+        assert job.id == concurrent["job"].id
+        assert first_db.query(models.ScrapeJob).count() == 1
+    finally:
+        first_db.close()
+        second_db.close()
+
+
+def test_scrape_lease_is_exclusive_until_released(db_session):
+    assert crud.acquire_scrape_lease(db_session, "worker-a") is True
+    assert crud.acquire_scrape_lease(db_session, "worker-b") is False
+    # The holder may renew its own lease.
+    assert crud.acquire_scrape_lease(db_session, "worker-a") is True
+
+    crud.release_scrape_lease(db_session, "worker-a")
+
+    assert crud.acquire_scrape_lease(db_session, "worker-b") is True
+
+
+def test_process_pending_jobs_runs_queued_job(monkeypatch, session_factory):
+    db = session_factory()
+    job, _ = crud.enqueue_scrape_job(db, "update")
+    db.close()
+    ran = []
+
+    def fake_update(job_id):
+        ran.append(job_id)
+        scraping_service.report_scrape_progress(job_id, status="completed")
+        return "completed"
+
+    monkeypatch.setattr(scrape_worker, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "scrape_and_populate_task", fake_update)
+
+    assert scrape_worker.process_pending_jobs() == 1
+
+    db = session_factory()
+    try:
+        stored = db.get(models.ScrapeJob, job.id)
+        assert ran == [job.id]
+        assert stored.status == "completed"
+        assert stored.locked_by == scrape_worker.WORKER_ID
+        assert db.get(models.ScrapeLease, crud.SCRAPE_LEASE_NAME).holder is None
+    finally:
+        db.close()
+
+
+def test_process_pending_jobs_stops_when_lease_is_lost(monkeypatch, session_factory):
+    db = session_factory()
+    crud.enqueue_scrape_job(db, "update")
+    db.close()
+    queued_next = []
+
+    def fake_update(job_id):
+        scraping_service.report_scrape_progress(job_id, status="completed")
+        db = session_factory()
+        try:
+            # The lease expires mid-job and another worker takes it over.
+            lease = db.get(models.ScrapeLease, crud.SCRAPE_LEASE_NAME)
+            lease.expires_at = crud._utcnow()
+            db.commit()
+            crud.acquire_scrape_lease(db, "other-worker")
+            queued_next.append(crud.enqueue_scrape_job(db, "update")[0].id)
+        finally:
+            db.close()
+        return "completed"
+
+    monkeypatch.setattr(scrape_worker, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "scrape_and_populate_task", fake_update)
+
+    assert scrape_worker.process_pending_jobs() == 1
+
+    db = session_factory()
+    try:
+        assert db.get(models.ScrapeJob, queued_next[0]).status == "queued"
+        assert db.get(models.ScrapeLease, crud.SCRAPE_LEASE_NAME).holder == (
+            "other-worker"
+        )
+    finally:
+        db.close()
+
+
+def test_process_pending_jobs_skips_when_lease_is_held(monkeypatch, session_factory):
+    db = session_factory()
+    crud.enqueue_scrape_job(db, "update")
+    crud.acquire_scrape_lease(db, "other-worker")
+    db.close()
+    monkeypatch.setattr(scrape_worker, "_get_db_session", session_factory)
+
+    assert scrape_worker.process_pending_jobs() == 0
+
+
+def test_process_pending_jobs_records_handler_failure(monkeypatch, session_factory):
+    db = session_factory()
+    job, _ = crud.enqueue_scrape_job(db, "update")
+    db.close()
+
+    def failing_update(job_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(scrape_worker, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service, "scrape_and_populate_task", failing_update)
+
+    scrape_worker.process_pending_jobs()
+
+    db = session_factory()
+    try:
+        stored = db.get(models.ScrapeJob, job.id)
+        assert stored.status == "error"
+        assert stored.error == "boom"
+        assert stored.finished_at is not None
+    finally:
+        db.close()
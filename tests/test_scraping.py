@@ -1,3 +1,4 @@
+from app import crud, models
 from app.routers import scraping as scraping_router
 
 
@@ -13,28 +14,47 @@ def test_scrape_requires_admin_when_not_local(client_factory, monkeypatch, user)
     )
 
 
-def test_scrape_starts_for_admin_and_resets_status(
+def test_scrape_queues_job_for_admin_and_dispatches(
     client_factory,
     monkeypatch,
+    db_session,
     admin_user,
 ):
     client = client_factory(current_user=admin_user)
-    seen = {"status": None, "called": False}
+    seen = {"called": False}
 
-    monkeypatch.setattr(
-        scraping_router, "write_scrape_status", lambda value: seen.update(status=value)
-    )
     monkeypatch.setattr(
         scraping_router,
-        "scrape_and_populate_task",
-        lambda: seen.update(called=True),
+        "dispatch_scrape_jobs",
+        lambda background_tasks: seen.update(called=True),
     )
 
     response = client.post("/scrape")
 
     assert response.status_code == 200
-    assert seen["status"] == "idle"
     assert seen["called"] is True
+    job = db_session.query(models.ScrapeJob).one()
+    assert (job.kind, job.status) == ("update", "queued")
+    assert response.json()["job_id"] == job.id
+
+
+def test_scrape_does_not_queue_overlapping_jobs(
+    client_factory,
+    monkeypatch,
+    db_session,
+    admin_user,
+):
+    client = client_factory(current_user=admin_user)
+    monkeypatch.setattr(
+        scraping_router, "dispatch_scrape_jobs", lambda background_tasks: None
+    )
+
+    first = client.post("/scrape")
+    second = client.post("/scrape")
+
+    assert first.json()["job_id"] == second.json()["job_id"]
+    assert second.json()["message"] == "A scrape is already in progress."
+    assert db_session.query(models.ScrapeJob).count() == 1
 
 
 def test_cron_scrape_requires_secret(client_factory, monkeypatch):
@@ -52,8 +72,8 @@ def test_cron_scrape_requires_valid_bearer_token(client_factory, monkeypatch):
     seen = {"called": False}
     monkeypatch.setattr(
         scraping_router,
-        "scrape_and_populate_task",
-        lambda: seen.update(called=True),
+        "dispatch_scrape_jobs",
+        lambda background_tasks: seen.update(called=True),
     )
 
     bad_response = client.get("/api/cron/scrape")
@@ -67,13 +87,30 @@ def test_cron_scrape_requires_valid_bearer_token(client_factory, monkeypatch):
     assert seen["called"] is True
 
 
-def test_scrape_status_endpoint_uses_service_read(client_factory, monkeypatch):
+def test_scrape_status_endpoint_reports_idle_without_jobs(client_factory):
     client = client_factory()
-    monkeypatch.setattr(
-        scraping_router, "read_scrape_status", lambda: "in_progress:2/6"
-    )
 
     response = client.get("/api/scrape-status")
 
     assert response.status_code == 200
-    assert response.json() == {"status": "in_progress:2/6"}
+    assert response.json() == {"status": "idle", "job": None}
+
+
+def test_scrape_status_endpoint_reads_job_progress(client_factory, db_session):
+    client = client_factory()
+    job, _ = crud.enqueue_scrape_job(db_session, "update")
+    crud.update_scrape_job(
+        db_session,
+        job.id,
+        status="in_progress",
+        phase="fetching",
+        page=2,
+        stats={"scraped_tracks": 50},
+    )
+
+    response = client.get("/api/scrape-status")
+
+    payload = response.json()
+    assert payload["status"] == "in_progress:2/6"
+    assert payload["job"]["phase"] == "fetching"
+    assert payload["job"]["stats"] == {"scraped_tracks": 50}
@@ -1,17 +1,42 @@
-from pathlib import Path
 from datetime import datetime, timezone
 
+from sqlalchemy import event
+
 from app import models
 from app.services import scraping as scraping_service
+from app.utils.rank_snapshots import pack_ranks, unpack_ranks
+
+
+def _capture_statuses(monkeypatch, statuses: list) -> None:
+    def fake_report(job_id, **fields):
+        if "status" in fields:
+            statuses.append(fields["status"])
 
+    monkeypatch.setattr(scraping_service, "report_scrape_progress", fake_report)
 
-def test_write_and_read_scrape_status(monkeypatch, tmp_path: Path):
-    status_file = tmp_path / "scrape_status.txt"
-    monkeypatch.setattr(scraping_service, "SCRAPE_STATUS_FILE", str(status_file))
 
-    scraping_service.write_scrape_status("completed")
+def test_report_scrape_progress_updates_job(monkeypatch, session_factory):
+    from app import crud
 
-    assert scraping_service.read_scrape_status() == "completed"
+    db = session_factory()
+    job, _ = crud.enqueue_scrape_job(db, "update")
+    db.close()
+    monkeypatch.setattr(scraping_service, "_get_db_session", session_factory)
+
+    scraping_service.report_scrape_progress(job.id, status="in_progress", page=3)
+    scraping_service.report_scrape_progress(
+        job.id, status="completed", stats={"new_tracks": 4}
+    )
+
+    db = session_factory()
+    try:
+        status = scraping_service.read_scrape_status(db)
+        assert status["status"] == "completed"
+        assert status["job"]["page"] == 3
+        assert status["job"]["stats"] == {"new_tracks": 4}
+        assert status["job"]["finished_at"] is not None
+    finally:
+        db.close()
 
 
 def test_scrape_and_populate_task_marks_no_changes(
@@ -56,11 +81,7 @@ def test_scrape_and_populate_task_marks_no_changes(
             }
         ],
     )
-    monkeypatch.setattr(
-        scraping_service,
-        "write_scrape_status",
-        lambda status: statuses.append(status),
-    )
+    _capture_statuses(monkeypatch, statuses)
 
     scraping_service.scrape_and_populate_task()
 
@@ -88,16 +109,7 @@ def test_initial_scrape_task_adds_tracks_and_resets_state(monkeypatch, session_f
             }
         ],
     )
-    monkeypatch.setattr(
-        scraping_service,
-        "write_scrape_status",
-        lambda status: statuses.append(status),
-    )
-    monkeypatch.setattr(
-        scraping_service,
-        "set_initial_scrape_in_progress",
-        lambda value: statuses.append(f"state:{value}"),
-    )
+    _capture_statuses(monkeypatch, statuses)
 
     scraping_service.initial_scrape_task()
 
@@ -107,7 +119,7 @@ def test_initial_scrape_task_adds_tracks_and_resets_state(monkeypatch, session_f
         assert db.query(models.UpdateLog).count() == 1
     finally:
         db.close()
-    assert statuses[-2:] == ["completed", "state:False"]
+    assert statuses[-1] == "completed"
 
 
 def test_scrape_and_populate_task_updates_and_adds_tracks(monkeypatch, session_factory):
@@ -207,11 +219,7 @@ def test_scrape_and_populate_task_updates_and_adds_tracks(monkeypatch, session_f
         return tracks
 
     monkeypatch.setattr(scraping_service.scraper, "_scrape_single_page", fake_scrape)
-    monkeypatch.setattr(
-        scraping_service,
-        "write_scrape_status",
-        lambda status: statuses.append(status),
-    )
+    _capture_statuses(monkeypatch, statuses)
 
     scraping_service.scrape_and_populate_task()
 
@@ -230,6 +238,150 @@ def test_scrape_and_populate_task_updates_and_adds_tracks(monkeypatch, session_f
         assert added is not None
         assert dropped.rank is None
         assert db.query(models.UpdateLog).count() == 1
+        # The pre-update chart is snapshotted both row-wise and packed.
+        history = db.query(models.RankHistory).order_by(models.RankHistory.rank).all()
+        assert [(h.track_id, h.rank) for h in history] == [
+            (updated.id, 1),
+            (dropped.id, 2),
+        ]
+        snapshot = db.query(models.RankSnapshot).one()
+        assert snapshot.recorded_at == history[0].recorded_at
+        assert unpack_ranks(snapshot.ranks) == [(updated.id, 1), (dropped.id, 2)]
     finally:
         db.close()
     assert statuses[-1] == "completed"
+
+
+def test_pack_ranks_round_trips_in_rank_order():
+    blob = pack_ranks([(7, 3), (42, 1), (9, 2)])
+
+    assert len(blob) == 24
+    assert unpack_ranks(blob) == [(42, 1), (9, 2), (7, 3)]
+
+
+def test_scrape_and_populate_task_only_touches_changed_ranks(
+    monkeypatch, session_factory
+):
+    def track_data(number: int, rank: int) -> dict:
+        return {
+            "title": f"Track {number}",
+            "producer": "Producer A",
+            "voicebank": "Miku",
+            "published_date": datetime(2026, 1, 1),
+            "link": f"https://example.com/diff/{number}",
+            "title_jp": None,
+            "producer_jp": None,
+            "voicebank_jp": None,
+            "image_url": None,
+            "rank": rank,
+        }
+
+    db = session_factory()
+    # Tracks 1..300 are charted; track 1 drops off and track 301 enters at 300.
+    for number in range(1, 301):
+        db.add(models.Track(**track_data(number, number)))
+    db.commit()
+    db.close()
+
+    def fake_scrape(page: int):
+        numbers = range((page - 1) * 50 + 2, page * 50 + 2)
+        ranks = {2: 2, 3: 1}  # track 2 keeps its rank
+        return [track_data(n, ranks.get(n, n - 1)) for n in numbers]
+
+    metadata_updates = []
+    monkeypatch.setattr(scraping_service, "_get_db_session", session_factory)
+    monkeypatch.setattr(scraping_service.scraper, "_scrape_single_page", fake_scrape)
+    monkeypatch.setattr(
+        scraping_service.crud,
+        "apply_track_update",
+        lambda db, track, data: metadata_updates.append(track.id),
+    )
+    seen_stats = {}
+    monkeypatch.setattr(
+        scraping_service,
+        "report_scrape_progress",
+        lambda job_id, **fields: seen_stats.update(fields.get("stats") or {}),
+    )
+
+    assert scraping_service.scrape_and_populate_task() == "completed"
+
+    assert metadata_updates == []
+    assert seen_stats["new_tracks"] == 1
+    assert (seen_stats["entered"], seen_stats["left"]) == (1, 1)
+    assert seen_stats["moved"] == 298
+    db = session_factory()
+    try:
+        ranks = dict(db.query(models.Track.link, models.Track.rank).all())
+        assert ranks["https://example.com/diff/1"] is None
+        assert ranks["https://example.com/diff/2"] == 2
+        assert ranks["https://example.com/diff/3"] == 1
+        assert ranks["https://example.com/diff/301"] == 300
+        assert sorted(r for r in ranks.values() if r is not None) == list(range(1, 301))
+    finally:
+        db.close()
+
+
+def test_scrape_and_populate_task_writes_the_diff_in_one_commit(
+    monkeypatch, session_factory
+):
+    def track_data(number: int, rank: int, title: str = "") -> dict:
+        return {
+            "title": title or f"Track {number}",
+            "producer": "Producer A",
+            "voicebank": "Miku",
+            "published_date": datetime(2026, 1, 1),
+            "link": f"https://example.com/commit/{number}",
+            "title_jp": None,
+            "producer_jp": None,
+            "voicebank_jp": None,
+            "image_url": None,
+            "rank": rank,
+        }
+
+    db = session_factory()
+    for number in range(1, 151):
+        db.add(models.Track(**track_data(number, number)))
+    db.commit()
+    db.close()
+
+    def fake_scrape(page: int):
+        # New tracks 151..300 take the top half; 1..150 (1 renamed) move down.
+        ranks = range((page - 1) * 50 + 1, page * 50 + 1)
+        return [
+            track_data(rank + 150, rank)
+            if rank <= 150
+            else track_data(rank - 150, rank, "Renamed" if rank == 151 else "")
+            for rank in ranks
+        ]
+
+    phase = {"current": None}
+    saving_commits = []
+
+    def count_commit(session):
+        if phase["current"] == "saving":
+            saving_commits.append(session)
+
+    def counting_session():
+        session = session_factory()
+        event.listen(session, "after_commit", count_commit)
+        return session
+
+    def fake_report(job_id, **fields):
+        if "phase" in fields:
+            phase["current"] = fields["phase"]
+
+    monkeypatch.setattr(scraping_service, "_get_db_session", counting_session)
+    monkeypatch.setattr(scraping_service.scraper, "_scrape_single_page", fake_scrape)
+    monkeypatch.setattr(scraping_service, "report_scrape_progress", fake_report)
+
+    assert scraping_service.scrape_and_populate_task() == "completed"
+
+    # The chart diff, then the update log.
+    assert len(saving_commits) == 2
+    db = session_factory()
+    try:
+        assert db.query(models.Track).count() == 300
+        renamed = db.query(models.Track).filter_by(rank=151).one()
+        assert renamed.title == "Renamed"
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+from app import crud, models
+from app.services import track_neighbors
+
+
+def test_compute_track_neighbors_uses_mean_centred_co_ratings():
+    ratings_by_user = {
+        1: [(10, 9.0), (11, 9.0), (12, 3.0)],
+        2: [(10, 8.0), (11, 10.0), (12, 2.0)],
+        3: [(10, 2.0), (12, 9.0)],
+    }
+
+    neighbors = track_neighbors.compute_track_neighbors(
+        ratings_by_user, top_n=5, min_co_ratings=2
+    )
+    by_pair = {
+        (track, neighbor): (sim, count) for track, neighbor, sim, count in neighbors
+    }
+
+    assert (10, 11) in by_pair and (11, 10) in by_pair
+    assert by_pair[(10, 11)][1] == 2
+    assert 0 < by_pair[(10, 11)][0] <= 1
+    # Tracks rated in opposite directions are not neighbours.
+    assert (10, 12) not in by_pair
+
+
+def test_compute_track_neighbors_counts_co_raters_at_their_mean():
+    ratings_by_user = {
+        1: [(10, 9.0), (11, 9.0), (12, 3.0)],
+        2: [(10, 8.0), (11, 10.0), (12, 2.0)],
+        # Both ratings sit on this user's mean: no deviation, still a co-rater.
+        3: [(10, 6.0), (11, 6.0)],
+    }
+
+    neighbors = track_neighbors.compute_track_neighbors(
+        ratings_by_user, top_n=5, min_co_ratings=3
+    )
+    counts = {(track, neighbor): count for track, neighbor, _, count in neighbors}
+
+    assert counts == {(10, 11): 3, (11, 10): 3}
+
+
+def test_collaborative_recommendations_follow_neighbors(
+    monkeypatch, session_factory, db_session, user, admin_user, sample_tracks
+):
+    first, second, old = sample_tracks
+    crud.create_rating(db_session, first.id, admin_user.id, 10)
+    crud.create_rating(db_session, second.id, admin_user.id, 9)
+    crud.create_rating(db_session, old.id, admin_user.id, 2)
+    monkeypatch.setattr(track_neighbors, "_get_db_session", session_factory)
+
+    summary = track_neighbors.build_track_neighbors(min_co_ratings=1)
+    assert summary["neighbors"] == db_session.query(models.TrackNeighbor).count()
+
+    crud.create_rating(db_session, first.id, user.id, 9)
+    crud.create_rating(db_session, old.id, user.id, 3)
+
+    recommendations = crud.get_collaborative_recommendations(db_session, user.id)
+
+    assert [track.id for track in recommendations] == [second.id]
+
+
+def test_recommendations_page_collaborative_mode(
+    client_factory, db_session, user, sample_tracks
+):
+    crud.create_rating(db_session, sample_tracks[0].id, user.id, 9)
+    client = client_factory(optional_user=user)
+
+    response = client.get("/recommendations?mode=collaborative")
+
+    assert response.status_code == 200
+    assert "Similar Listeners" in response.text
+    assert "Recent Release Bias" not in response.text
@@ -1,4 +1,6 @@
-from app import models
+from datetime import date
+
+from app import crud, models, schemas
 
 
 def test_rate_and_delete_rating(client_factory, db_session, user, sample_tracks):
@@ -142,6 +144,38 @@ def test_track_playlist_status_partitions_membership(
     assert payload["member_of"][0]["id"] == playlist.id
 
 
+def test_batch_playlist_membership_returns_bitmaps(
+    client_factory,
+    db_session,
+    user,
+    playlist,
+    sample_tracks,
+):
+    other = crud.create_playlist(
+        db_session, user.id, schemas.PlaylistCreate(name="Another", is_public=True)
+    )
+    crud.add_track_to_playlist(db_session, other.id, sample_tracks[0].id, user.id)
+    client = client_factory(current_user=user)
+    ids = ",".join(str(track.id) for track in sample_tracks)
+
+    response = client.get(f"/api/tracks/playlist-membership?ids={ids}")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["playlists"] == [
+        {"id": other.id, "name": "Another"},
+        {"id": playlist.id, "name": "Favorites"},
+    ]
+    assert payload["membership"] == {
+        str(sample_tracks[0].id): "3",
+        str(sample_tracks[1].id): "2",
+    }
+    too_many = ",".join(str(i) for i in range(301))
+    assert (
+        client.get(f"/api/tracks/playlist-membership?ids={too_many}").status_code == 400
+    )
+
+
 def test_backup_and_restore_ratings_round_trip(
     client_factory, db_session, user, sample_tracks
 ):
@@ -205,13 +239,11 @@ def test_track_rank_history_returns_ordered_data(
     track = sample_tracks[0]
     now = datetime.now(timezone.utc)
     for i, rank in enumerate([3, 1, 2], start=1):
+        recorded_at = (now - timedelta(days=4 - i)).replace(tzinfo=None)
         db_session.add(
-            models.RankHistory(
-                track_id=track.id,
-                rank=rank,
-                recorded_at=now - timedelta(days=4 - i),
-            )
+            models.RankHistory(track_id=track.id, rank=rank, recorded_at=recorded_at)
         )
+        crud.save_rank_snapshot(db_session, recorded_at, [(track.id, rank)])
     db_session.commit()
 
     client = client_factory()
@@ -240,3 +272,106 @@ def test_track_rank_history_empty_when_no_data(client_factory, sample_tracks):
     response = client.get(f"/api/tracks/{sample_tracks[0].id}/rank-history")
     assert response.status_code == 200
     assert response.json()["history"] == []
+
+
+def test_track_rank_history_timeline_includes_off_chart_snapshots(
+    client_factory, db_session, sample_tracks
+):
+    """Snapshots the track missed still appear, with a null rank."""
+    first, second = sample_tracks[0], sample_tracks[1]
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(first.id, 1), (second.id, 2)]
+    )
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [(second.id, 1)])
+    db_session.commit()
+    crud.invalidate_rank_snapshot_caches()
+
+    client = client_factory()
+    response = client.get(f"/api/tracks/{first.id}/rank-history")
+
+    assert response.json()["history"] == [
+        {"date": "2026-07-01", "rank": 1},
+        {"date": "2026-07-02", "rank": None},
+    ]
+
+
+def test_batch_rank_history_returns_columnar_series(
+    client_factory, db_session, sample_tracks
+):
+    first, second, old = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(first.id, 1), (second.id, 2)]
+    )
+    crud.replace_rank_history_for_date(db_session, date(2026, 7, 2), [(second.id, 1)])
+    db_session.commit()
+
+    client = client_factory()
+    response = client.get(
+        f"/api/tracks/rank-history?ids={first.id},{second.id},{old.id}"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "dates": ["2026-07-01", "2026-07-02"],
+        "series": {
+            str(first.id): [1, None],
+            str(second.id): [2, 1],
+            str(old.id): [None, None],
+        },
+    }
+
+
+def test_batch_rank_history_rejects_invalid_ids(client_factory):
+    client = client_factory()
+
+    assert client.get("/api/tracks/rank-history?ids=1,abc").status_code == 400
+    too_many = ",".join(str(i) for i in range(301))
+    assert client.get(f"/api/tracks/rank-history?ids={too_many}").status_code == 400
+
+
+def test_track_search_pages_by_cursor(client_factory, sample_tracks):
+    client = client_factory()
+
+    first = client.get("/api/tracks/search", params={"limit": 2}).json()
+    second = client.get(
+        "/api/tracks/search", params={"limit": 2, "after": first["next_cursor"]}
+    ).json()
+    by_producer = client.get("/api/tracks/search", params={"q": "producer b"}).json()
+
+    assert [track["title"] for track in first["tracks"]] == [
+        "First Track",
+        "Old Track",
+    ]
+    assert [track["title"] for track in second["tracks"]] == ["Second Track"]
+    assert second["next_cursor"] is None
+    assert [track["title"] for track in by_producer["tracks"]] == ["Second Track"]
+    assert set(first["tracks"][0]) == {
+        "id",
+        "link",
+        "image_url",
+        "title",
+        "title_jp",
+        "producer",
+        "producer_jp",
+    }
+    assert client.get("/api/tracks/search", params={"limit": 0}).status_code == 400
+
+
+def test_chart_diff_endpoint(client_factory, db_session, sample_tracks):
+    first, second, _ = sample_tracks
+    crud.replace_rank_history_for_date(
+        db_session, date(2026, 7, 1), [(second.id, 1), (first.id, 2)]
+    )
+    db_session.commit()
+    client = client_factory()
+
+    response = client.get("/api/charts/diff?from=2026-07-01")
+
+    assert response.status_code == 200
+    moved = response.json()["moved"]
+    assert [(item["track_id"], item["status"]) for item in moved] == [
+        (first.id, "up"),
+        (second.id, "down"),
+    ]
+    assert client.get("/api/charts/diff?from=2026-06-01").status_code == 404
+    assert client.get("/api/charts/diff?from=July").status_code == 400
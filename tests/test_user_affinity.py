@@ -0,0 +1,61 @@
+from app import crud, models
+
+
+def _affinity_rows(db_session, user_id):
+    return {
+        (row.entity_type, row.entity_id): (row.rating_sum, row.rating_count)
+        for row in db_session.query(models.UserEntityAffinity).filter(
+            models.UserEntityAffinity.user_id == user_id
+        )
+    }
+
+
+def _entity_id(db_session, model_class, name):
+    return db_session.query(model_class.id).filter(model_class.name == name).scalar()
+
+
+def test_rating_writes_maintain_affinity(db_session, user, sample_tracks):
+    first, second, old = sample_tracks
+    producer_a = _entity_id(db_session, models.Producer, "Producer A")
+    miku = _entity_id(db_session, models.Voicebank, "Miku")
+
+    crud.create_rating(db_session, first.id, user.id, 8)
+    crud.create_rating(db_session, old.id, user.id, 4)
+    crud.create_rating(db_session, second.id, user.id, 6)
+    crud.create_rating(db_session, first.id, user.id, 10)
+    crud.delete_rating(db_session, second.id, user.id)
+
+    incremental = _affinity_rows(db_session, user.id)
+    assert incremental[("producer", producer_a)] == (14.0, 2)
+    assert incremental[("voicebank", miku)] == (10.0, 1)
+    assert ("voicebank", _entity_id(db_session, models.Voicebank, "Luka")) not in (
+        incremental
+    )
+    assert crud.get_user_entity_averages(db_session, user.id, "producer") == {
+        producer_a: 7.0
+    }
+
+    crud.rebuild_user_entity_affinity(db_session)
+    db_session.commit()
+    assert _affinity_rows(db_session, user.id) == incremental
+
+
+def test_changing_track_credits_moves_affinity(db_session, user, sample_tracks):
+    first = sample_tracks[0]
+    crud.create_rating(db_session, first.id, user.id, 9)
+
+    crud.update_track(db_session, first, {"producer": "Producer B"})
+
+    producer_a = _entity_id(db_session, models.Producer, "Producer A")
+    producer_b = _entity_id(db_session, models.Producer, "Producer B")
+    rows = _affinity_rows(db_session, user.id)
+    assert ("producer", producer_a) not in rows
+    assert rows[("producer", producer_b)] == (9.0, 1)
+
+
+def test_delete_user_removes_affinity(db_session, user, sample_tracks):
+    crud.create_rating(db_session, sample_tracks[0].id, user.id, 7)
+
+    crud.delete_user(db_session, user.id)
+
+    assert db_session.query(models.UserEntityAffinity).count() == 0